@@ -1,12 +1,20 @@
 import importlib
 import re
 from collections.abc import AsyncGenerator, Callable
-from datetime import timezone
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 from mcp.server.auth.provider import AccessToken
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from mcp_agentskills.core.metrics.token_usage import record_token_use
+from mcp_agentskills.core.security.token import hash_token
+from mcp_agentskills.core.utils.principal_cache import (
+    CachedPrincipal,
+    cache_principal,
+    get_cached_principal,
+    invalidate_token_principal,
+)
 from mcp_agentskills.core.utils.user_context import set_current_user_id
 from mcp_agentskills.db.session import get_async_session
 from mcp_agentskills.repositories.token import TokenRepository
@@ -67,6 +75,13 @@ class ApiTokenVerifier(TokenVerifier):
     async def verify_token_with_error(self, token: str) -> tuple[AccessToken | None, tuple[str, str] | None]:
         if not _token_pattern.match(token):
             return None, ("INVALID_TOKEN_FORMAT", "Invalid token format")
+        token_hash = hash_token(token)
+        principal = get_cached_principal(token_hash)
+        if principal is not None:
+            access_token, error = self._principal_result(token, token_hash, principal)
+            if access_token is not None:
+                record_token_use(principal.token_id)
+            return access_token, error
         async for session in _session_provider():
             token_repo = TokenRepository(session)
             user_repo = UserRepository(session)
@@ -77,11 +92,29 @@ class ApiTokenVerifier(TokenVerifier):
                 code = _map_token_error(str(exc))
                 return None, (code, str(exc))
             user = await user_repo.get_by_id(api_token.user_id)
-            if not user or not user.is_active:
-                return None, ("TOKEN_REVOKED", "Token revoked")
-            set_current_user_id(str(user.id))
-            expires_at = None
-            if api_token.expires_at:
-                expires_at = int(api_token.expires_at.replace(tzinfo=timezone.utc).timestamp())
-            return AccessToken(token=token, client_id=str(user.id), scopes=[], expires_at=expires_at), None
+            principal = cache_principal(
+                token_hash,
+                token_id=api_token.id,
+                user_id=api_token.user_id,
+                user_active=bool(user and user.is_active),
+                expires_at=api_token.expires_at,
+            )
+            return self._principal_result(token, token_hash, principal)
         return None, ("TOKEN_NOT_FOUND", "Token not found")
+
+    @staticmethod
+    def _principal_result(
+        token: str,
+        token_hash: str,
+        principal: CachedPrincipal,
+    ) -> tuple[AccessToken | None, tuple[str, str] | None]:
+        if not principal.user_active:
+            return None, ("TOKEN_REVOKED", "Token revoked")
+        if principal.is_expired(datetime.now(timezone.utc)):
+            invalidate_token_principal(token_hash)
+            return None, ("TOKEN_EXPIRED", "Token expired")
+        set_current_user_id(principal.user_id)
+        expires_at = None
+        if principal.expires_at:
+            expires_at = int(principal.expires_at.timestamp())
+        return AccessToken(token=token, client_id=principal.user_id, scopes=[], expires_at=expires_at), None
@@ -1,14 +1,21 @@
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from mcp_agentskills.config.settings import settings
 from mcp_agentskills.core.middleware.auth import get_current_active_user
 from mcp_agentskills.core.security.rbac import has_permission
+from mcp_agentskills.core.utils.archive_crypto import STREAM_SCHEME
+from mcp_agentskills.core.utils.skill_archive import iter_archive_range
 from mcp_agentskills.db.session import get_async_session
 from mcp_agentskills.repositories.audit_log import AuditLogRepository
 from mcp_agentskills.repositories.skill import SkillRepository
 from mcp_agentskills.repositories.skill_version import SkillVersionRepository
 from mcp_agentskills.schemas.skill_download import SkillDownloadRequest, SkillDownloadResponse
-from mcp_agentskills.schemas.skill_lifecycle import SkillInstallInstructionsResponse, SkillVersionDiffResponse
+from mcp_agentskills.schemas.skill_lifecycle import (
+    SkillInstallInstructionsResponse,
+    SkillVersionDiffFile,
+    SkillVersionDiffResponse,
+)
 from mcp_agentskills.schemas.skill import (
     SkillCachePolicyResponse,
     SkillCreate,
@@ -24,6 +31,37 @@ from mcp_agentskills.services.skill import SkillService
 router = APIRouter()
 
 
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    if not header or size <= 0:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError("Range not satisfiable")
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError as exc:
+        raise ValueError("Range not satisfiable") from exc
+    if start < 0 or start >= size or end < start:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [item.strip() for item in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
 @router.get("", response_model=SkillListResponse)
 @router.get("/", response_model=SkillListResponse)
 async def list_skills(
@@ -187,11 +225,10 @@ async def upload_skill_file(
     if not has_permission(current_user, "skill.upload"):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
     service = SkillService(SkillRepository(session), SkillVersionRepository(session))
-    content = await file.read()
     try:
         filename = file.filename or ""
         if filename.lower().endswith(".zip"):
-            payload = await service.upload_zip(current_user, skill_uuid, filename, content, metadata)
+            payload = await service.upload_zip(current_user, skill_uuid, filename, file.file, metadata)
             if settings.ENABLE_AUDIT_LOG:
                 audit_service = AuditService(AuditLogRepository(session))
                 await audit_service.create_event(
@@ -203,6 +240,7 @@ async def upload_skill_file(
                     metadata={"filename": filename, "archive": True, "version": payload.get("version")},
                 )
             return payload
+        content = await file.read()
         filename = await service.upload_file(current_user, skill_uuid, filename, content)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -246,6 +284,74 @@ async def download_skill(
     return response_payload
 
 
+@router.get("/{skill_uuid}/archive")
+async def stream_skill_archive(
+    request: Request,
+    skill_uuid: str,
+    version: str | None = Query(None),
+    current_user=Depends(get_current_active_user),
+    session=Depends(get_async_session),
+):
+    if not has_permission(current_user, "skill.download"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
+    service = SkillService(SkillRepository(session), SkillVersionRepository(session))
+    try:
+        result = await service.open_download_archive(current_user, skill_uuid, version)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    source = result["source"]
+    encrypted = result["encrypted"]
+    etag = f'"{source.checksum}.{STREAM_SCHEME}"' if encrypted else f'"{source.checksum}"'
+    size = source.stream_size(encrypted)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"private, max-age={max(0, int(settings.SKILL_CACHE_TTL_SECONDS or 0))}",
+        "X-Skill-Version": result["version"],
+        "X-Skill-Checksum": source.checksum,
+        "X-Skill-Encryption": STREAM_SCHEME if encrypted else "none",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        range_header = None
+    try:
+        byte_range = _parse_range(range_header, size)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=str(exc),
+            headers={"Content-Range": f"bytes */{size}"},
+        ) from exc
+    status_code = status.HTTP_200_OK
+    start, end = 0, size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    extension = "zip.enc" if encrypted else "zip"
+    headers["Content-Disposition"] = f'attachment; filename="{result["skill_name"]}-{result["version"]}.{extension}"'
+    if settings.ENABLE_AUDIT_LOG:
+        audit_service = AuditService(AuditLogRepository(session))
+        await audit_service.create_event(
+            actor_id=current_user.id,
+            action="skill.download",
+            target=skill_uuid,
+            ip=request.client.host if request and request.client else "",
+            user_agent=request.headers.get("user-agent", ""),
+            metadata={"version": result["version"], "streamed": True},
+        )
+    return StreamingResponse(
+        iter_archive_range(source, start, end, encrypted),
+        status_code=status_code,
+        media_type="application/octet-stream" if encrypted else "application/zip",
+        headers=headers,
+    )
+
+
 @router.post("/{skill_uuid}/deactivate", response_model=SkillResponse)
 async def deactivate_skill(
     request: Request,
@@ -333,12 +439,13 @@ async def diff_skill_versions(
     skill_uuid: str,
     from_version: str = Query(..., alias="from"),
     to_version: str = Query(..., alias="to"),
+    include_diff: bool = Query(True),
     current_user=Depends(get_current_active_user),
     session=Depends(get_async_session),
 ):
     service = SkillService(SkillRepository(session), SkillVersionRepository(session))
     try:
-        payload = await service.diff_versions(current_user, skill_uuid, from_version, to_version)
+        payload = await service.diff_versions(current_user, skill_uuid, from_version, to_version, include_diff)
     except ValueError as exc:
         if str(exc) == "SKILL_DEACTIVATED":
             raise HTTPException(
@@ -349,6 +456,28 @@ async def diff_skill_versions(
     return SkillVersionDiffResponse.model_validate(payload)
 
 
+@router.get("/{skill_uuid}/versions/diff/file", response_model=SkillVersionDiffFile)
+async def diff_skill_version_file(
+    skill_uuid: str,
+    from_version: str = Query(..., alias="from"),
+    to_version: str = Query(..., alias="to"),
+    path: str = Query(...),
+    current_user=Depends(get_current_active_user),
+    session=Depends(get_async_session),
+):
+    service = SkillService(SkillRepository(session), SkillVersionRepository(session))
+    try:
+        payload = await service.diff_version_file(current_user, skill_uuid, from_version, to_version, path)
+    except ValueError as exc:
+        if str(exc) == "SKILL_DEACTIVATED":
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail={"detail": "Skill deactivated", "code": "SKILL_DEACTIVATED"},
+            ) from exc
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return SkillVersionDiffFile.model_validate(payload)
+
+
 @router.post("/{skill_uuid}/versions/{version}/rollback", response_model=SkillVersionResponse)
 async def rollback_skill_version(
     request: Request,
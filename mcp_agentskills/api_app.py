@@ -18,9 +18,38 @@ from mcp_agentskills.api.mcp import (
 )
 from mcp_agentskills.api.router import api_router
 from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.metrics.token_usage import start_token_usage_flusher, stop_token_usage_flusher
+from mcp_agentskills.core.metrics.tool_call_metrics import (
+    get_tool_call_metrics_stats,
+    start_tool_call_metrics_flusher,
+    stop_tool_call_metrics_flusher,
+)
 from mcp_agentskills.core.middleware.deprecation import DeprecationMiddleware
 from mcp_agentskills.core.middleware.logging import RequestLoggingMiddleware, configure_loguru
 from mcp_agentskills.core.middleware.rate_limit import RateLimitMiddleware
+from mcp_agentskills.core.utils.archive_crypto import shutdown_crypto_pool
+from mcp_agentskills.core.utils.dependency_envs import get_dependency_env_stats
+from mcp_agentskills.core.utils.download_artifacts import get_download_artifact_stats
+from mcp_agentskills.core.utils.execution_control import close_execution_queue, get_execution_queue_stats
+from mcp_agentskills.core.utils.io_executor import get_io_executor_stats, shutdown_io_executor
+from mcp_agentskills.core.utils.local_archive_cache import (
+    get_local_cache_stats,
+    start_local_cache_janitor,
+    stop_local_cache_janitor,
+)
+from mcp_agentskills.core.utils.rate_limiter import get_rate_limiter_stats
+from mcp_agentskills.core.utils.shared_counters import start_shared_counter_janitor, stop_shared_counter_janitor
+from mcp_agentskills.core.utils.single_flight import get_single_flight_stats
+from mcp_agentskills.core.utils.warm_workers import (
+    get_warm_worker_stats,
+    start_warm_worker_janitor,
+    stop_warm_worker_janitor,
+)
+from mcp_agentskills.core.utils.workdir_usage import (
+    get_workdir_usage_stats,
+    start_workdir_usage_reconciler,
+    stop_workdir_usage_reconciler,
+)
 from mcp_agentskills.db.session import engine, get_async_session, init_db
 from mcp_agentskills.repositories.audit_log import AuditLogRepository
 from mcp_agentskills.services.deprecation_notification import DeprecationNotifier
@@ -46,6 +75,12 @@ class _SlashPathMiddleware:
 async def lifespan(_application: FastAPI):
     await init_db()
     await ensure_mcp_initialized()
+    start_token_usage_flusher()
+    start_tool_call_metrics_flusher()
+    start_local_cache_janitor()
+    start_shared_counter_janitor()
+    start_workdir_usage_reconciler()
+    start_warm_worker_janitor()
     if settings.ENABLE_DEPRECATION_NOTIFIER_ON_STARTUP:
         async for session in get_async_session():
             notifier = DeprecationNotifier(
@@ -61,7 +96,16 @@ async def lifespan(_application: FastAPI):
             if lifespan_context:
                 await stack.enter_async_context(lifespan_context(mcp_app))
         yield
+    await stop_token_usage_flusher()
+    await stop_tool_call_metrics_flusher()
+    await stop_local_cache_janitor()
+    await stop_shared_counter_janitor()
+    await stop_workdir_usage_reconciler()
+    await stop_warm_worker_janitor()
+    await close_execution_queue()
     await shutdown_mcp()
+    shutdown_io_executor(wait=False)
+    shutdown_crypto_pool()
 
 
 def create_application() -> FastAPI:
@@ -128,6 +172,16 @@ def create_application() -> FastAPI:
             "disk_usage_percent": disk_usage_percent,
             "memory_usage_percent": memory.percent,
             "cpu_usage_percent": psutil.cpu_percent(),
+            "tool_call_metrics": get_tool_call_metrics_stats(),
+            "io_executor": get_io_executor_stats(),
+            "download_artifacts": get_download_artifact_stats(),
+            "local_archive_cache": get_local_cache_stats(),
+            "single_flight": get_single_flight_stats(),
+            "rate_limiter": get_rate_limiter_stats(),
+            "execution_queue": get_execution_queue_stats(),
+            "workdir_usage": get_workdir_usage_stats(),
+            "warm_workers": get_warm_worker_stats(),
+            "dependency_envs": get_dependency_env_stats(),
         }
 
     def _error_payload(detail: object, code: str) -> dict:
@@ -160,6 +214,7 @@ def create_application() -> FastAPI:
         return JSONResponse(
             status_code=exc.status_code,
             content=_error_payload_from_exception(exc.detail, exc.status_code),
+            headers=getattr(exc, "headers", None),
         )
 
     @application.exception_handler(RequestValidationError)
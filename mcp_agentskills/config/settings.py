@@ -33,19 +33,68 @@ class Settings(BaseSettings):
     SKILL_ARCHIVE_S3_ACCESS_KEY_ID: str = ""
     SKILL_ARCHIVE_S3_SECRET_ACCESS_KEY: str = ""
     SKILL_ARCHIVE_S3_FORCE_PATH_STYLE: bool = True
+    SKILL_ARCHIVE_S3_MAX_POOL_CONNECTIONS: int = 16
+    SKILL_ARCHIVE_S3_MULTIPART_THRESHOLD_BYTES: int = 16777216
+    SKILL_ARCHIVE_S3_MULTIPART_PART_BYTES: int = 8388608
+    SKILL_ARCHIVE_S3_MULTIPART_CONCURRENCY: int = 4
     SKILL_DOWNLOAD_TTL_SECONDS: int = 3600
     SKILL_CACHE_TTL_SECONDS: int = 604800
+    SKILL_LOCAL_CACHE_MAX_BYTES: int = 1073741824
+    SKILL_LOCAL_CACHE_JANITOR_INTERVAL_SECONDS: int = 300
     SKILL_VERSION_BUMP_STRATEGY: str = "patch"
     SKILL_EXECUTION_TIMEOUT_SECONDS: int = 300
     SKILL_MAX_CONCURRENT_EXECUTIONS_PER_USER: int = 4
     SKILL_MAX_CONCURRENT_EXECUTIONS_PER_TEAM: int = 16
+    SKILL_EXECUTION_LEASE_SECONDS: int = 900
+    SKILL_MAX_CONCURRENT_EXECUTIONS_GLOBAL: int = 0
+    SKILL_EXECUTION_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    SKILL_EXECUTION_QUEUE_MAX_DEPTH: int = 1000
+    SKILL_EXECUTION_QUEUE_POLL_SECONDS: float = 0.5
+    SKILL_EXECUTION_TEAM_WEIGHTS: dict = {}
     SKILL_MAX_WORKDIR_BYTES: int = 1073741824
+    SKILL_WORKDIR_USAGE_MAX_ENTRIES: int = 1000
+    SKILL_WORKDIR_USAGE_RECONCILE_SECONDS: int = 600
     SKILL_MAX_OUTPUT_BYTES: int = 1048576
+    SKILL_OUTPUT_HARD_CAP_BYTES: int = 104857600
+    SKILL_PROGRESS_INTERVAL_SECONDS: float = 0.5
+    SKILL_PROGRESS_MAX_MESSAGE_BYTES: int = 8192
+    SKILL_WARM_WORKERS_MAX: int = 16
+    SKILL_WARM_WORKER_MAX_RUNS: int = 100
+    SKILL_WARM_WORKER_IDLE_SECONDS: int = 300
+    SKILL_WARM_WORKER_STARTUP_TIMEOUT_SECONDS: float = 30.0
+    SKILL_DEPENDENCY_ENV_PATH: str = ""
+    SKILL_DEPENDENCY_ENV_MAX_BYTES: int = 5368709120
+    SKILL_DEPENDENCY_WHEELHOUSE: str = ""
+    SKILL_DEPENDENCY_BUILD_TIMEOUT_SECONDS: int = 600
+    SKILL_METADATA_INDEX_TTL_SECONDS: int = 5
+    SKILL_DISCOVERY_MAX_DEPTH: int = 3
+    SKILL_STATUS_CACHE_TTL_SECONDS: int = 10
+    SKILL_STATUS_NEGATIVE_CACHE_TTL_SECONDS: int = 30
+    SKILL_STATUS_CACHE_MAX_ENTRIES: int = 10000
+    SKILL_UPLOAD_CHUNK_BYTES: int = 1048576
+    SKILL_DOWNLOAD_CHUNK_BYTES: int = 1048576
+    SKILL_DOWNLOAD_FRAME_BYTES: int = 65536
+    SKILL_IO_MAX_WORKERS: int = 8
+    # auto: reflink where the filesystem supports it, otherwise a full data copy.
+    # hardlink: no data copy on any filesystem; published files share inodes with the
+    # version snapshot (ignored while ENABLE_SKILL_BLOB_STORE is on). copy: always copy.
+    SKILL_PUBLISH_MODE: str = "auto"
+    SKILL_DIFF_MAX_FILE_BYTES: int = 1048576
+
+    MCP_PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    MCP_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_USAGE_FLUSH_INTERVAL_SECONDS: int = 30
 
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 60
+    RATE_LIMIT_KEY: str = "ip"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    SHARED_STATE_BACKEND: str = "memory"
+    SHARED_STATE_JANITOR_INTERVAL_SECONDS: int = 300
 
     METRICS_RETENTION_DAYS: int = 90
+    TOOL_CALL_METRICS_FLUSH_INTERVAL_SECONDS: int = 10
+    TOOL_CALL_METRICS_MAX_PENDING_BUCKETS: int = 10000
 
     FLOW_LLM_API_KEY: str = ""
     FLOW_LLM_BASE_URL: str = ""
@@ -73,9 +122,17 @@ class Settings(BaseSettings):
     ENABLE_AUDIT_LOG: bool = False
     ENABLE_AUDIT_EXPORT: bool = False
     ENABLE_SKILL_DOWNLOAD_ENCRYPTION: bool = True
+    SKILL_DOWNLOAD_ENCRYPTION_SCHEME: str = "aes-256-gcm"
+    SKILL_ENCRYPTION_WORKERS: int = 1
+    SKILL_DOWNLOAD_ARTIFACT_CACHE_MAX_BYTES: int = 268435456
+    SKILL_DOWNLOAD_ARTIFACT_WARM_ON_UPLOAD: bool = True
     ENABLE_LOCAL_CACHE_ENCRYPTION: bool = True
     ENABLE_CACHE_OFFLINE_FALLBACK: bool = True
+    ENABLE_SKILL_BLOB_STORE: bool = False
     ENABLE_SANDBOX_EXECUTION: bool = False
+    ENABLE_EXECUTION_PROGRESS: bool = True
+    ENABLE_WARM_WORKERS: bool = False
+    ENABLE_DEPENDENCY_ENVS: bool = False
     ENABLE_RESOURCE_QUOTA: bool = False
     ENABLE_NETWORK_EGRESS_CONTROL: bool = False
     ENABLE_RATE_LIMIT: bool = True
@@ -136,7 +193,7 @@ class Settings(BaseSettings):
             raise ValueError("生产环境 CORS_ORIGINS 必须显式配置且不能包含通配符 '*'")
         return self
 
-    @field_validator("RBAC_ROLE_PERMISSIONS", mode="before")
+    @field_validator("RBAC_ROLE_PERMISSIONS", "SKILL_EXECUTION_TEAM_WEIGHTS", mode="before")
     @classmethod
     def parse_role_permissions(cls, v):
         if isinstance(v, str):
@@ -235,6 +292,22 @@ class Settings(BaseSettings):
             raise ValueError("SKILL_VERSION_BUMP_STRATEGY 仅支持 patch 或 minor")
         return value
 
+    @field_validator("RATE_LIMIT_KEY")
+    @classmethod
+    def validate_rate_limit_key(cls, v):
+        value = str(v).strip().lower()
+        if value not in {"ip", "token", "user"}:
+            raise ValueError("RATE_LIMIT_KEY 仅支持 ip、token 或 user")
+        return value
+
+    @field_validator("SHARED_STATE_BACKEND")
+    @classmethod
+    def validate_shared_state_backend(cls, v):
+        value = str(v).strip().lower()
+        if value not in {"memory", "sql"}:
+            raise ValueError("SHARED_STATE_BACKEND 仅支持 memory 或 sql")
+        return value
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 
@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.periodic_task import PeriodicTask
+from mcp_agentskills.db.session import get_async_session
+from mcp_agentskills.repositories.token import TokenRepository
+
+SessionProvider = Callable[[], AsyncGenerator[AsyncSession, None]]
+
+
+async def _default_session_provider() -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_async_session():
+        yield session
+
+
+_session_provider: SessionProvider = _default_session_provider
+_pending: dict[str, datetime] = {}
+_flush_lock = asyncio.Lock()
+
+
+def set_session_provider(provider: SessionProvider) -> None:
+    global _session_provider
+    _session_provider = provider
+
+
+def reset_session_provider() -> None:
+    global _session_provider
+    _session_provider = _default_session_provider
+
+
+def record_token_use(token_id: str, used_at: datetime | None = None) -> None:
+    used_at = used_at or datetime.now(timezone.utc)
+    token_id = str(token_id)
+    previous = _pending.get(token_id)
+    if previous is None or previous < used_at:
+        _pending[token_id] = used_at
+
+
+def pending_token_usage() -> dict[str, datetime]:
+    return dict(_pending)
+
+
+def _requeue(batch: dict[str, datetime]) -> None:
+    for token_id, used_at in batch.items():
+        record_token_use(token_id, used_at)
+
+
+async def flush_token_usage() -> int:
+    async with _flush_lock:
+        if not _pending:
+            return 0
+        batch = dict(_pending)
+        _pending.clear()
+        try:
+            async for session in _session_provider():
+                await TokenRepository(session).bulk_mark_used(batch)
+                return len(batch)
+        except Exception as exc:
+            logger.warning(f"Failed to flush token usage: {exc}")
+        _requeue(batch)
+        return 0
+
+
+_flusher = PeriodicTask("token-usage-flush", flush_token_usage)
+
+
+def start_token_usage_flusher() -> None:
+    _flusher.start(max(1, int(settings.TOKEN_USAGE_FLUSH_INTERVAL_SECONDS)))
+
+
+async def stop_token_usage_flusher() -> None:
+    await _flusher.stop()
@@ -1,10 +1,13 @@
+import asyncio
 import json
 from collections.abc import AsyncGenerator, Callable
 from datetime import datetime, timezone
 
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.periodic_task import PeriodicTask
 from mcp_agentskills.core.utils.user_context import get_current_user_id
 from mcp_agentskills.db.session import get_async_session
 from mcp_agentskills.repositories.request_metric import RequestMetricRepository
@@ -19,6 +22,9 @@ async def _default_session_provider() -> AsyncGenerator[AsyncSession, None]:
 
 
 _session_provider: SessionProvider = _default_session_provider
+_pending: dict[tuple[str, datetime], list[int]] = {}
+_stats = {"recorded_deltas": 0, "flushed_deltas": 0, "dropped_deltas": 0, "failed_flushes": 0}
+_flush_lock = asyncio.Lock()
 
 
 def set_session_provider(provider: SessionProvider) -> None:
@@ -46,6 +52,66 @@ def _is_error_output(output: object) -> bool:
     return "code" in payload and "detail" in payload and "timestamp" in payload
 
 
+def _add_delta(user_id: str, bucket_start: datetime, total: int, success: int, failure: int) -> bool:
+    key = (user_id, bucket_start)
+    counts = _pending.get(key)
+    if counts is None:
+        if len(_pending) >= max(1, int(settings.TOOL_CALL_METRICS_MAX_PENDING_BUCKETS)):
+            _stats["dropped_deltas"] += total
+            return False
+        counts = [0, 0, 0]
+        _pending[key] = counts
+    counts[0] += total
+    counts[1] += success
+    counts[2] += failure
+    return True
+
+
+def get_tool_call_metrics_stats() -> dict[str, int]:
+    return {**_stats, "pending_buckets": len(_pending)}
+
+
+async def flush_tool_call_metrics() -> int:
+    async with _flush_lock:
+        if not _pending:
+            return 0
+        batch = dict(_pending)
+        _pending.clear()
+        rows = [
+            {
+                "user_id": user_id,
+                "bucket_start": bucket_start,
+                "total_count": counts[0],
+                "success_count": counts[1],
+                "failure_count": counts[2],
+            }
+            for (user_id, bucket_start), counts in batch.items()
+        ]
+        flushed = sum(counts[0] for counts in batch.values())
+        try:
+            async for session in _session_provider():
+                await RequestMetricRepository(session).upsert_hour_buckets(rows)
+                _stats["flushed_deltas"] += flushed
+                return flushed
+        except Exception as exc:
+            logger.warning(f"Failed to flush tool call metrics: {exc}")
+        _stats["failed_flushes"] += 1
+        for (user_id, bucket_start), counts in batch.items():
+            _add_delta(user_id, bucket_start, *counts)
+        return 0
+
+
+_flusher = PeriodicTask("tool-call-metrics-flush", flush_tool_call_metrics)
+
+
+def start_tool_call_metrics_flusher() -> None:
+    _flusher.start(max(1, int(settings.TOOL_CALL_METRICS_FLUSH_INTERVAL_SECONDS)))
+
+
+async def stop_tool_call_metrics_flusher() -> None:
+    await _flusher.stop()
+
+
 async def record_tool_call(tool_name: str, output: object = None, exception: Exception | None = None) -> None:
     if not settings.ENABLE_METRICS:
         return
@@ -54,10 +120,5 @@ async def record_tool_call(tool_name: str, output: object = None, exception: Exc
         return
     success = exception is None and not _is_error_output(output)
     bucket_start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
-    try:
-        async for session in _session_provider():
-            repo = RequestMetricRepository(session)
-            await repo.upsert_hour_bucket(str(user_id), bucket_start, success)
-            return
-    except Exception:
-        return
+    _stats["recorded_deltas"] += 1
+    _add_delta(str(user_id), bucket_start, 1, 1 if success else 0, 0 if success else 1)
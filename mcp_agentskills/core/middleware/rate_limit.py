@@ -1,5 +1,3 @@
-import asyncio
-import time
 from datetime import datetime, timezone
 
 from fastapi import Request
@@ -7,32 +5,68 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
 from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.security.jwt_utils import decode_token
+from mcp_agentskills.core.security.token import hash_token
+from mcp_agentskills.core.utils.principal_cache import get_cached_principal
+from mcp_agentskills.core.utils.rate_limiter import retry_after_header
+from mcp_agentskills.core.utils.shared_counters import get_counter_backend
+
+
+def _bearer_token(request: Request) -> str | None:
+    header = request.headers.get("authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+def _verified_subject(token: str) -> str | None:
+    try:
+        subject = decode_token(token).get("sub")
+    except ValueError:
+        subject = None
+    if subject:
+        return str(subject)
+    principal = get_cached_principal(hash_token(token))
+    if principal is None or not principal.user_active or principal.is_expired():
+        return None
+    return principal.user_id
+
+
+def resolve_rate_limit_key(request: Request, strategy: str) -> str:
+    token = _bearer_token(request) if strategy in {"token", "user"} else None
+    subject = _verified_subject(token) if token else None
+    if token and subject:
+        return f"user:{subject}" if strategy == "user" else f"token:{hash_token(token)}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
-        self._requests: dict[str, list[float]] = {}
-        self._lock = asyncio.Lock()
+        self._strategy = settings.RATE_LIMIT_KEY.lower()
         self._limit = settings.RATE_LIMIT_REQUESTS
         self._window = settings.RATE_LIMIT_WINDOW
+        self._backend = get_counter_backend()
 
     async def dispatch(self, request: Request, call_next):
         if not settings.ENABLE_RATE_LIMIT:
             return await call_next(request)
-        client = request.client.host if request.client else "unknown"
-        now = time.monotonic()
-        async with self._lock:
-            timestamps = self._requests.get(client, [])
-            cutoff = now - self._window
-            timestamps = [ts for ts in timestamps if ts >= cutoff]
-            if len(timestamps) >= self._limit:
-                payload = {
-                    "detail": "Rate limit exceeded",
-                    "code": "RATE_LIMIT_EXCEEDED",
-                    "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
-                }
-                return JSONResponse(status_code=429, content=payload)
-            timestamps.append(now)
-            self._requests[client] = timestamps
+        decision = await self._backend.consume(
+            "http",
+            resolve_rate_limit_key(request, self._strategy),
+            self._limit,
+            self._window,
+        )
+        if not decision.allowed:
+            payload = {
+                "detail": "Rate limit exceeded",
+                "code": "RATE_LIMIT_EXCEEDED",
+                "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+            }
+            return JSONResponse(
+                status_code=429,
+                content=payload,
+                headers={"Retry-After": retry_after_header(decision)},
+            )
         return await call_next(request)
@@ -12,7 +12,16 @@ from mcp_agentskills.config.settings import settings
 from mcp_agentskills.core.metrics.tool_call_metrics import record_tool_call
 from mcp_agentskills.core.security.rbac import has_permission, is_skill_visible
 from mcp_agentskills.core.utils.command_whitelist import validate_command
-from mcp_agentskills.core.utils.skill_storage import get_skill_versions_dir, tool_error_payload
+from mcp_agentskills.core.utils.dependency_envs import (
+    apply_dependency_env,
+    ensure_dependency_env,
+)
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.skill_blobs import ensure_execution_tree
+from mcp_agentskills.core.utils.skill_storage import (
+    get_skill_versions_dir,
+    tool_error_payload,
+)
 from mcp_agentskills.core.utils.user_context import get_current_user_id
 from mcp_agentskills.db import session as db_session
 from mcp_agentskills.repositories.audit_log import AuditLogRepository
@@ -47,6 +56,41 @@ def is_within_workdir_quota(path, max_bytes: int | None = None) -> bool:
     return _execution_control.is_within_workdir_quota(path, max_bytes=max_bytes)
 
 
+def refresh_workdir_quota(path) -> None:
+    if _execution_control is None:
+        return
+    _execution_control.refresh_workdir_quota(path)
+
+
+async def capture_output(proc, timeout_seconds: float) -> tuple[bytes, bytes, str | None]:
+    if _execution_control is None:
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            proc.kill()
+            stdout, stderr = await proc.communicate()
+            return stdout, stderr, "timeout"
+        return stdout, stderr, None
+    return await _execution_control.capture_output(proc, timeout_seconds)
+
+
+async def run_warm_entrypoint(
+    skill_id: str,
+    version: str,
+    version_dir,
+    entrypoint: str,
+    params: str,
+    env: dict[str, str],
+    timeout_seconds: float,
+    dependency_env: str = "",
+):
+    if _execution_control is None:
+        return None
+    return await _execution_control.run_warm_entrypoint(
+        skill_id, version, version_dir, entrypoint, params, env, timeout_seconds, dependency_env
+    )
+
+
 def truncate_output(output: str, max_bytes: int | None = None) -> str:
     if _execution_control is None:
         return output
@@ -126,7 +170,10 @@ class ExecuteSkillOp(BaseAsyncToolOp):
                     self._set_output(tool_error_payload("Version not found", "VERSION_NOT_FOUND"))
                     return
                 version_dir = get_skill_versions_dir(user_id, skill.name) / version
-                if settings.ENABLE_RESOURCE_QUOTA and not is_within_workdir_quota(version_dir):
+                run_dir = version_dir
+                if settings.ENABLE_SKILL_BLOB_STORE and version_dir.is_dir():
+                    run_dir = await run_io(ensure_execution_tree, version_dir)
+                if settings.ENABLE_RESOURCE_QUOTA and not is_within_workdir_quota(run_dir):
                     self._set_output(tool_error_payload("Work directory quota exceeded", "QUOTA_EXCEEDED"))
                     return
                 if settings.ENABLE_RESOURCE_QUOTA:
@@ -141,10 +188,13 @@ class ExecuteSkillOp(BaseAsyncToolOp):
                 content = skill_md_path.read_text(encoding="utf-8", errors="replace")
                 metadata = SkillService._parse_frontmatter(content)
                 command = metadata.get("command")
+                warm_entrypoint = None
                 if not command:
                     entrypoint = metadata.get("entrypoint")
                     if isinstance(entrypoint, str):
                         command = _entrypoint_to_command(entrypoint)
+                        if entrypoint.lower().endswith(".py"):
+                            warm_entrypoint = entrypoint
                 if not command or not isinstance(command, str):
                     self._set_output(
                         tool_error_payload("Skill entrypoint not configured", "SKILL_EXECUTION_NOT_CONFIGURED")
@@ -158,25 +208,44 @@ class ExecuteSkillOp(BaseAsyncToolOp):
                 if settings.ENABLE_SANDBOX_EXECUTION:
                     env = {"PATH": env.get("PATH", ""), "SKILL_PARAMS": ""}
                 env["SKILL_PARAMS"] = json.dumps(parameters, ensure_ascii=False)
+                dependency_env = None
+                if settings.ENABLE_DEPENDENCY_ENVS:
+                    dependency_env = await ensure_dependency_env(
+                        skill.id, record.version, record.dependency_spec, record.dependencies
+                    )
+                    env = apply_dependency_env(env, dependency_env)
                 start = perf_counter()
-                proc = await asyncio.subprocess.create_subprocess_shell(
-                    f"cd {version_dir} && {command}",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env=env,
-                )
-                status = "success"
                 timeout_seconds = max(1, int(settings.SKILL_EXECUTION_TIMEOUT_SECONDS))
-                try:
-                    stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_seconds)
-                except asyncio.TimeoutError:
-                    proc.kill()
-                    stdout, stderr = await proc.communicate()
-                    status = "timeout"
+                warm = None
+                if warm_entrypoint:
+                    warm = await run_warm_entrypoint(
+                        skill.id,
+                        version,
+                        version_dir,
+                        warm_entrypoint,
+                        env["SKILL_PARAMS"],
+                        env,
+                        timeout_seconds,
+                        str(dependency_env.path) if dependency_env is not None else "",
+                    )
+                if warm is not None:
+                    stdout, stderr, returncode = warm.stdout, warm.stderr, warm.returncode
+                    status = "timeout" if warm.timed_out else "output_limit" if warm.output_limited else None
+                else:
+                    proc = await asyncio.subprocess.create_subprocess_shell(
+                        f"cd {run_dir} && {command}",
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        env=env,
+                    )
+                    stdout, stderr, status = await capture_output(proc, timeout_seconds)
+                    returncode = proc.returncode
                 duration_ms = int((perf_counter() - start) * 1000)
+                if settings.ENABLE_RESOURCE_QUOTA:
+                    refresh_workdir_quota(run_dir)
                 output = truncate_output((stdout.decode(errors="replace") + stderr.decode(errors="replace")).strip())
-                if status != "timeout":
-                    status = "success" if proc.returncode == 0 else "error"
+                if status is None:
+                    status = "success" if returncode == 0 else "error"
                 if settings.ENABLE_AUDIT_LOG:
                     audit_service = AuditService(AuditLogRepository(session))
                     await audit_service.create_event(
@@ -23,6 +23,7 @@ from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 
 from mcp_agentskills.core.metrics.tool_call_metrics import record_tool_call
+from mcp_agentskills.core.utils import skill_metadata_index
 from mcp_agentskills.core.utils.user_context import get_current_user_id
 
 
@@ -133,6 +134,22 @@ class LoadSkillMetadataOp(BaseAsyncToolOp):
             "description": description,
         }
 
+    async def load_metadata_entries(self, search_dir: Path) -> list[tuple[Path, dict[str, str]]]:
+        """Collect (SKILL.md path, metadata) pairs for every skill under ``search_dir``.
+
+        Uses the shared per-directory metadata index, so only SKILL.md files
+        whose mtime, size or inode changed since the last call are re-read
+        and re-parsed.
+
+        Args:
+            search_dir: The directory to search for SKILL.md files.
+
+        Returns:
+            list[tuple[Path, dict[str, str]]]: Path and parsed metadata of
+                each discovered SKILL.md file with valid metadata.
+        """
+        return await skill_metadata_index.load_skill_metadata_entries(search_dir, self.parse_skill_metadata)
+
     async def async_execute(self):
         """Execute the load skill metadata operation.
 
@@ -142,8 +159,8 @@ class LoadSkillMetadataOp(BaseAsyncToolOp):
 
         The method:
         1. Gets the skills directory path from the service_config
-        2. Recursively searches for all SKILL.md files
-        3. Parses each file's frontmatter to extract metadata
+        2. Looks up all SKILL.md files through the metadata index
+        3. Re-parses the frontmatter of files changed since the last call
         4. Builds a string with skill names and their descriptions
         5. Sets the output with the complete metadata string
 
@@ -168,14 +185,11 @@ class LoadSkillMetadataOp(BaseAsyncToolOp):
             search_dir = skill_dir / user_id if user_id else skill_dir
             logger.info(f"🔧 Tool called: load_skill_metadata(path={search_dir})")
 
-            skill_files = list(search_dir.rglob("SKILL.md"))
+            entries = await self.load_metadata_entries(search_dir)
 
             skill_num = 0
             skill_metadata_context = 'Available skills (each line is "- <skill_name>: <skill_description>"):'
-            for skill_file in skill_files:
-                content = skill_file.read_text(encoding="utf-8")
-                metadata = await self.parse_skill_metadata(content, str(skill_file))
-
+            for skill_file, metadata in entries:
                 if metadata:
                     skill_num += 1
                     skill_dir = skill_file.parent.as_posix()
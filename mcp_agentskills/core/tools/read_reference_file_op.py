@@ -7,6 +7,7 @@ The skill directory is read from {service_config.metadata["skill_dir"]} /
 """
 
 from pathlib import Path
+from typing import Any
 
 from loguru import logger
 
@@ -19,7 +20,16 @@ from mcp_agentskills.core.utils.skill_storage import tool_error_payload, validat
 from mcp_agentskills.core.utils.user_context import get_current_user_id
 
 
+_skill_status_cache: Any = None
+try:
+    from mcp_agentskills.core.utils import skill_status_cache as _skill_status_cache
+except Exception:
+    pass
+
+
 async def _is_skill_active(skill_name: str, user_id: str | None) -> bool:
+    if _skill_status_cache is not None:
+        return await _skill_status_cache.is_skill_active(skill_name, user_id)
     if not user_id:
         return True
     try:
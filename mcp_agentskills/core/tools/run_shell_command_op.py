@@ -13,16 +13,18 @@ import shutil
 from pathlib import Path
 from typing import Any
 
-from loguru import logger
-
 from flowllm.core.context import C
 from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
+from loguru import logger
 
 from mcp_agentskills.config.settings import settings
 from mcp_agentskills.core.metrics.tool_call_metrics import record_tool_call
 from mcp_agentskills.core.utils.command_whitelist import validate_command
-from mcp_agentskills.core.utils.skill_storage import tool_error_payload, validate_skill_name
+from mcp_agentskills.core.utils.skill_storage import (
+    tool_error_payload,
+    validate_skill_name,
+)
 from mcp_agentskills.core.utils.user_context import get_current_user_id
 
 _execution_control: Any = None
@@ -50,13 +52,59 @@ def is_within_workdir_quota(path: Path, max_bytes: int | None = None) -> bool:
     return _execution_control.is_within_workdir_quota(path, max_bytes=max_bytes)
 
 
+def refresh_workdir_quota(path) -> None:
+    if _execution_control is None:
+        return
+    _execution_control.refresh_workdir_quota(path)
+
+
+async def capture_output(proc, timeout_seconds: float) -> tuple[bytes, bytes, str | None]:
+    if _execution_control is None:
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            proc.kill()
+            stdout, stderr = await proc.communicate()
+            return stdout, stderr, "timeout"
+        return stdout, stderr, None
+    return await _execution_control.capture_output(proc, timeout_seconds)
+
+
 def truncate_output(output: str, max_bytes: int | None = None) -> str:
     if _execution_control is None:
         return output
     return _execution_control.truncate_output(output, max_bytes=max_bytes)
 
 
+_skill_status_cache: Any = None
+try:
+    from mcp_agentskills.core.utils import skill_status_cache as _skill_status_cache
+except Exception:
+    pass
+
+
+_dependency_envs: Any = None
+try:
+    from mcp_agentskills.core.utils import dependency_envs as _dependency_envs
+except Exception:
+    pass
+
+
+async def _resolve_dependency_env(skill_name: str, user_id: str | None):
+    if _dependency_envs is None:
+        return None
+    return await _dependency_envs.resolve_skill_dependency_env(user_id, skill_name)
+
+
+def _apply_dependency_env(env: dict[str, str], dependency_env) -> dict[str, str]:
+    if _dependency_envs is None:
+        return env
+    return _dependency_envs.apply_dependency_env(env, dependency_env)
+
+
 async def _is_skill_active(skill_name: str, user_id: str | None) -> bool:
+    if _skill_status_cache is not None:
+        return await _skill_status_cache.is_skill_active(skill_name, user_id)
     if not user_id:
         return True
     try:
@@ -86,8 +134,10 @@ class RunShellCommandOp(BaseAsyncToolOp):
     1. Extract skill_name and command from input
     2. Get the skill directory from {service_config.metadata["skill_dir"]} / {skill_name}
     3. Change to the skill directory before executing the command
-    4. For Python commands, automatically detect and install dependencies
-       using pipreqs (if available and auto_install_deps parameter is enabled)
+    4. For Python commands with auto_install_deps enabled, use the cached
+       dependency environment of the skill's current version when
+       ENABLE_DEPENDENCY_ENVS is set, otherwise detect and install
+       dependencies using pipreqs (if available)
     5. Execute the command in a subprocess and capture stdout/stderr
     6. Return the combined output
 
@@ -104,6 +154,10 @@ class RunShellCommandOp(BaseAsyncToolOp):
           the auto_install_deps parameter is enabled
         - If pipreqs is not available or dependency installation fails, a warning
           is logged but the command execution continues
+        - With ENABLE_DEPENDENCY_ENVS, dependencies are installed once per
+          (skill_id, version, dependency_spec hash) into a cached environment
+          that is prepended to PYTHONPATH; pipreqs is only used when no such
+          environment can be resolved
         - The subprocess uses the current environment variables (os.environ.copy())
     """
 
@@ -167,7 +221,9 @@ class RunShellCommandOp(BaseAsyncToolOp):
         The method:
         1. Extracts skill_name and command from input_dict
         2. Looks up the skill directory from skill_metadata_dict
-        3. For Python commands (containing "py"), checks if pipreqs is available
+        3. For Python commands (containing "py"), resolves the cached dependency
+           environment when ENABLE_DEPENDENCY_ENVS is set, otherwise checks if
+           pipreqs is available
         4. If pipreqs is available, generates requirements.txt and installs dependencies
         5. Constructs the full command as `cd {skill_dir} && {command}`
         6. Executes the command in a subprocess with the current environment
@@ -234,8 +290,11 @@ class RunShellCommandOp(BaseAsyncToolOp):
                 self.set_output(tool_error_payload(error_msg, "COMMAND_BLOCKED"))
                 return
 
-            if self.auto_install_deps:
-                if "py" in command:
+            dependency_env = None
+            if self.auto_install_deps and "py" in command:
+                if settings.ENABLE_DEPENDENCY_ENVS:
+                    dependency_env = await _resolve_dependency_env(skill_name, user_id)
+                if dependency_env is None:
                     pipreqs_available = shutil.which("pipreqs") is not None
                     if pipreqs_available:
                         install_cmd = f"cd {work_dir} && pipreqs . --force && pip install -r requirements.txt"
@@ -252,20 +311,23 @@ class RunShellCommandOp(BaseAsyncToolOp):
                     else:
                         logger.info("❗️ pipreqs not found, skipping dependency auto-install.")
 
+            env = {"PATH": os.environ.get("PATH", "")} if settings.ENABLE_SANDBOX_EXECUTION else os.environ.copy()
             proc = await asyncio.create_subprocess_shell(
                 f"cd {work_dir} && {command}",
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env={"PATH": os.environ.get("PATH", "")} if settings.ENABLE_SANDBOX_EXECUTION else os.environ.copy(),
+                env=_apply_dependency_env(env, dependency_env),
             )
 
             timeout_seconds = max(1, int(settings.SKILL_EXECUTION_TIMEOUT_SECONDS))
-            try:
-                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_seconds)
-            except asyncio.TimeoutError:
-                proc.kill()
-                stdout, stderr = await proc.communicate()
-            output = truncate_output(stdout.decode().strip() + "\n" + stderr.decode().strip())
+            stdout, stderr, status = await capture_output(proc, timeout_seconds)
+            if settings.ENABLE_RESOURCE_QUOTA:
+                refresh_workdir_quota(work_dir)
+            output = truncate_output(
+                stdout.decode(errors="replace").strip() + "\n" + stderr.decode(errors="replace").strip()
+            )
+            if status == "output_limit":
+                output += "\n[output limit exceeded; process killed]"
             logger.info(f"✅ Command executed: skill_name={skill_name} output={output}")
             self.set_output(output)
             self._output = output
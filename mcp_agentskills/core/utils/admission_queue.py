@@ -0,0 +1,193 @@
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+
+Release = Callable[[], Awaitable[None]]
+Admit = Callable[[], Awaitable[Release | None]]
+
+WAIT_SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 5, 10, 50, 100, 500)
+
+
+class Histogram:
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = len(self.bounds)
+        for position, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = position
+                break
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {"buckets": buckets, "count": self.count, "sum": self.total}
+
+
+@dataclass(eq=False)
+class _Waiter:
+    tenant: str
+    admit: Admit
+    future: asyncio.Future
+    weight: float = 1.0
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class AdmissionQueue:
+    def __init__(self, poll_seconds: float = 0.5):
+        self.poll_seconds = poll_seconds
+        self._tenants: dict[str, deque[_Waiter]] = {}
+        self._tags: dict[str, float] = {}
+        self._vtime = 0.0
+        self._depth = 0
+        self._dispatching: asyncio.Lock | None = None
+        self._poller: asyncio.Task | None = None
+        self._background: set[asyncio.Task] = set()
+        self._stats = {"admitted": 0, "queued": 0, "admitted_after_wait": 0, "timed_out": 0, "rejected": 0}
+        self._wait_seconds = Histogram(WAIT_SECONDS_BUCKETS)
+        self._queue_depth = Histogram(QUEUE_DEPTH_BUCKETS)
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    async def acquire(
+        self,
+        tenant: str,
+        admit: Admit,
+        timeout: float,
+        weight: float = 1.0,
+        max_depth: int = 0,
+    ) -> Release | None:
+        if not self._depth:
+            admitted = await admit()
+            if admitted is not None:
+                self._stats["admitted"] += 1
+                self._wait_seconds.observe(0.0)
+                return admitted
+        if timeout <= 0 or (max_depth > 0 and self._depth >= max_depth):
+            self._stats["rejected"] += 1
+            return None
+        waiter = _Waiter(tenant, admit, asyncio.get_running_loop().create_future(), max(weight, 1e-6))
+        self._enqueue(waiter)
+        try:
+            await self._dispatch()
+            done, _ = await asyncio.wait({waiter.future}, timeout=timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not done:
+            self._abandon(waiter)
+            self._stats["timed_out"] += 1
+            return None
+        return waiter.future.result()
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        queue = self._tenants.get(waiter.tenant)
+        if queue is None:
+            queue = deque()
+            self._tenants[waiter.tenant] = queue
+            self._tags[waiter.tenant] = max(self._tags.get(waiter.tenant, 0.0), self._vtime)
+        queue.append(waiter)
+        self._depth += 1
+        self._stats["queued"] += 1
+        self._queue_depth.observe(self._depth)
+        self._ensure_poller()
+
+    def _remove(self, waiter: _Waiter) -> bool:
+        queue = self._tenants.get(waiter.tenant)
+        if queue is None or waiter not in queue:
+            return False
+        queue.remove(waiter)
+        self._depth -= 1
+        if not queue:
+            self._tenants.pop(waiter.tenant, None)
+        return True
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        if self._remove(waiter):
+            waiter.future.cancel()
+            return
+        if waiter.future.done() and not waiter.future.cancelled():
+            self._spawn(waiter.future.result()())
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _order(self) -> list[str]:
+        return sorted(
+            self._tenants,
+            key=lambda tenant: (self._tags.get(tenant, 0.0), self._tenants[tenant][0].enqueued_at),
+        )
+
+    async def _dispatch(self) -> None:
+        if self._dispatching is None:
+            self._dispatching = asyncio.Lock()
+        async with self._dispatching:
+            progressed = True
+            while progressed and self._depth:
+                progressed = False
+                for tenant in self._order():
+                    queue = self._tenants.get(tenant)
+                    if not queue:
+                        continue
+                    waiter = queue[0]
+                    admitted = await waiter.admit()
+                    if admitted is None:
+                        continue
+                    if not self._remove(waiter) or waiter.future.done():
+                        await admitted()
+                        continue
+                    waiter.future.set_result(admitted)
+                    self._vtime = self._tags.get(tenant, self._vtime)
+                    self._tags[tenant] = self._vtime + 1.0 / waiter.weight
+                    self._stats["admitted"] += 1
+                    self._stats["admitted_after_wait"] += 1
+                    self._wait_seconds.observe(time.monotonic() - waiter.enqueued_at)
+                    progressed = True
+                    break
+            idle = [tenant for tenant, tag in self._tags.items() if tenant not in self._tenants and tag <= self._vtime]
+            for tenant in idle:
+                self._tags.pop(tenant, None)
+
+    def notify(self) -> None:
+        if self._depth:
+            self._spawn(self._dispatch())
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self) -> None:
+        while self._depth:
+            await asyncio.sleep(self.poll_seconds)
+            await self._dispatch()
+
+    async def close(self) -> None:
+        poller = self._poller
+        self._poller = None
+        if poller is not None:
+            poller.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await poller
+
+    def stats(self) -> dict:
+        stats: dict = dict(self._stats)
+        stats["depth"] = self._depth
+        stats["tenants_waiting"] = len(self._tenants)
+        stats["wait_seconds"] = self._wait_seconds.snapshot()
+        stats["queue_depth"] = self._queue_depth.snapshot()
+        return stats
@@ -0,0 +1,208 @@
+import functools
+import hashlib
+import hmac
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+STREAM_MAGIC = b"SKS"
+STREAM_VERSION = 1
+STREAM_SCHEME = "aes-256-gcm-stream-v1"
+LEGACY_SCHEME = "aes-256-gcm"
+STREAM_HEADER_SIZE = 16
+STREAM_TAG_SIZE = 16
+_NONCE_PREFIX_SIZE = 7
+_PARALLEL_MIN_FRAMES = 8
+
+_pool: ThreadPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def derive_key(secret: str) -> bytes:
+    return hashlib.sha256(secret.encode("utf-8")).digest()
+
+
+@functools.lru_cache(maxsize=8)
+def get_aead(key: bytes) -> AESGCM:
+    return AESGCM(key)
+
+
+def frame_count(plain_size: int, frame_size: int) -> int:
+    return max(1, -(-plain_size // frame_size))
+
+
+def encrypted_size(plain_size: int, frame_size: int) -> int:
+    return STREAM_HEADER_SIZE + plain_size + STREAM_TAG_SIZE * frame_count(plain_size, frame_size)
+
+
+def derive_nonce_prefix(key: bytes, checksum: str) -> bytes:
+    return hmac.new(key, checksum.encode("utf-8"), hashlib.sha256).digest()[:_NONCE_PREFIX_SIZE]
+
+
+def build_stream_header(frame_size: int, prefix: bytes | None = None) -> bytes:
+    prefix = prefix if prefix is not None else os.urandom(_NONCE_PREFIX_SIZE)
+    if len(prefix) != _NONCE_PREFIX_SIZE:
+        raise ValueError("Invalid nonce prefix")
+    return STREAM_MAGIC + bytes([STREAM_VERSION]) + struct.pack(">I", frame_size) + prefix + b"\x00"
+
+
+def is_stream_payload(payload: bytes) -> bool:
+    return payload[:3] == STREAM_MAGIC and len(payload) > 3 and payload[3] == STREAM_VERSION
+
+
+def parse_stream_header(header: bytes) -> int:
+    if len(header) != STREAM_HEADER_SIZE or not is_stream_payload(header):
+        raise ValueError("Invalid encrypted stream header")
+    frame_size = struct.unpack(">I", header[4:8])[0]
+    if frame_size <= 0:
+        raise ValueError("Invalid encrypted stream header")
+    return frame_size
+
+
+def frame_nonce(header: bytes, index: int, final: bool) -> bytes:
+    prefix = header[8 : 8 + _NONCE_PREFIX_SIZE]
+    return prefix + struct.pack(">I", index) + (b"\x01" if final else b"\x00")
+
+
+def encrypt_frame(aead: AESGCM, header: bytes, index: int, chunk: bytes, final: bool) -> bytes:
+    return aead.encrypt(frame_nonce(header, index, final), chunk, header)
+
+
+def decrypt_frame(aead: AESGCM, header: bytes, index: int, frame: bytes, final: bool) -> bytes:
+    return aead.decrypt(frame_nonce(header, index, final), frame, header)
+
+
+def frame_offset(index: int, frame_size: int) -> int:
+    return STREAM_HEADER_SIZE + index * (frame_size + STREAM_TAG_SIZE)
+
+
+def _get_pool(workers: int) -> ThreadPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive-crypto")
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_crypto_pool() -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool = _pool
+        _pool = None
+        _pool_workers = 0
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def _map_frames(func, args: list[tuple], workers: int) -> list[bytes]:
+    if workers <= 1 or len(args) < _PARALLEL_MIN_FRAMES:
+        return [func(*item) for item in args]
+    return list(_get_pool(workers).map(lambda item: func(*item), args))
+
+
+def encrypt_bytes(
+    payload: bytes,
+    key: bytes,
+    frame_size: int,
+    prefix: bytes | None = None,
+    workers: int = 1,
+) -> bytes:
+    header = build_stream_header(frame_size, prefix)
+    aead = get_aead(key)
+    total = frame_count(len(payload), frame_size)
+    view = memoryview(payload)
+    args = [
+        (aead, header, index, bytes(view[index * frame_size : (index + 1) * frame_size]), index == total - 1)
+        for index in range(total)
+    ]
+    return header + b"".join(_map_frames(encrypt_frame, args, workers))
+
+
+def decrypt_bytes(payload: bytes, key: bytes, workers: int = 1) -> bytes:
+    header = payload[:STREAM_HEADER_SIZE]
+    frame_size = parse_stream_header(header)
+    aead = get_aead(key)
+    stride = frame_size + STREAM_TAG_SIZE
+    body = memoryview(payload)[STREAM_HEADER_SIZE:]
+    total = max(1, -(-len(body) // stride))
+    args = [
+        (aead, header, index, bytes(body[index * stride : (index + 1) * stride]), index == total - 1)
+        for index in range(total)
+    ]
+    return b"".join(_map_frames(decrypt_frame, args, workers))
+
+
+def encrypt_stream(
+    reader: BinaryIO,
+    writer: BinaryIO,
+    key: bytes,
+    frame_size: int,
+    prefix: bytes | None = None,
+) -> int:
+    header = build_stream_header(frame_size, prefix)
+    aead = get_aead(key)
+    writer.write(header)
+    written = len(header)
+    index = 0
+    chunk = reader.read(frame_size)
+    while True:
+        following = reader.read(frame_size) if len(chunk) == frame_size else b""
+        frame = encrypt_frame(aead, header, index, chunk, not following)
+        writer.write(frame)
+        written += len(frame)
+        if not following:
+            return written
+        chunk = following
+        index += 1
+
+
+def decrypt_stream(reader: BinaryIO, writer: BinaryIO, key: bytes) -> int:
+    header = reader.read(STREAM_HEADER_SIZE)
+    frame_size = parse_stream_header(header)
+    aead = get_aead(key)
+    stride = frame_size + STREAM_TAG_SIZE
+    written = 0
+    index = 0
+    frame = reader.read(stride)
+    while True:
+        following = reader.read(stride) if len(frame) == stride else b""
+        plain = decrypt_frame(aead, header, index, frame, not following)
+        writer.write(plain)
+        written += len(plain)
+        if not following:
+            return written
+        frame = following
+        index += 1
+
+
+def decrypt_range(reader: BinaryIO, key: bytes, start: int, length: int) -> bytes:
+    reader.seek(0, os.SEEK_END)
+    total_size = reader.tell()
+    reader.seek(0)
+    header = reader.read(STREAM_HEADER_SIZE)
+    frame_size = parse_stream_header(header)
+    stride = frame_size + STREAM_TAG_SIZE
+    total = max(1, -(-(total_size - STREAM_HEADER_SIZE) // stride))
+    if length <= 0 or start < 0:
+        return b""
+    first = start // frame_size
+    last = min(total - 1, (start + length - 1) // frame_size)
+    if first > last:
+        return b""
+    aead = get_aead(key)
+    reader.seek(frame_offset(first, frame_size))
+    parts = []
+    for index in range(first, last + 1):
+        parts.append(decrypt_frame(aead, header, index, reader.read(stride), index == total - 1))
+    plain = b"".join(parts)
+    offset = start - first * frame_size
+    return plain[offset : offset + length]
@@ -0,0 +1,307 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.single_flight import SingleFlight
+from mcp_agentskills.core.utils.skill_storage import SKILL_DEPENDENCY_ENVS_DIRNAME
+
+_MARKER_FILENAME = ".env.json"
+_BUILD_PREFIX = ".build-"
+_STALE_BUILD_SECONDS = 3600
+_FAILURE_BACKOFF_SECONDS = 300
+_PIP_MANAGERS = {"pip", "uv"}
+
+_builds: SingleFlight["DependencyEnv"] = SingleFlight("dependency_envs")
+_failures: dict[str, float] = {}
+_stats: dict[str, int] = {
+    "hits": 0,
+    "misses": 0,
+    "builds": 0,
+    "build_failures": 0,
+    "evictions": 0,
+    "unsupported": 0,
+}
+
+
+@dataclass(frozen=True)
+class DependencyEnv:
+    path: Path
+
+    @property
+    def site_packages(self) -> Path:
+        return self.path / "site-packages"
+
+    @property
+    def bin_dir(self) -> Path:
+        return self.site_packages / "bin"
+
+
+def get_dependency_env_root() -> Path:
+    if settings.SKILL_DEPENDENCY_ENV_PATH:
+        return Path(settings.SKILL_DEPENDENCY_ENV_PATH)
+    return Path(settings.SKILL_STORAGE_PATH) / SKILL_DEPENDENCY_ENVS_DIRNAME
+
+
+def dependency_spec_hash(spec: dict | None) -> str:
+    payload = json.dumps(spec or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def python_requirements(spec: dict | None, dependencies: list[str] | None = None) -> list[str] | None:
+    python_spec = (spec or {}).get("python")
+    if isinstance(python_spec, dict):
+        if str(python_spec.get("manager") or "pip") not in _PIP_MANAGERS:
+            return None
+        items = python_spec.get("requirements") or []
+    else:
+        items = dependencies or []
+    requirements = [str(item).strip() for item in items if str(item).strip()]
+    if any(item.startswith("-") for item in requirements):
+        return None
+    return requirements
+
+
+def apply_dependency_env(env: dict[str, str], dependency_env: DependencyEnv | None) -> dict[str, str]:
+    if dependency_env is None:
+        return env
+    updated = dict(env)
+    site_packages = str(dependency_env.site_packages)
+    existing = updated.get("PYTHONPATH")
+    updated["PYTHONPATH"] = f"{site_packages}{os.pathsep}{existing}" if existing else site_packages
+    updated["PATH"] = f"{dependency_env.bin_dir}{os.pathsep}{updated.get('PATH', '')}"
+    return updated
+
+
+def _env_path(skill_id: str, version: str, digest: str) -> Path:
+    return get_dependency_env_root() / skill_id / f"{version}-{digest}"
+
+
+def _touch_ready(path: Path) -> bool:
+    try:
+        os.utime(path / _MARKER_FILENAME)
+    except OSError:
+        return False
+    return True
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            with contextlib.suppress(OSError):
+                total += os.lstat(os.path.join(root, name)).st_size
+    return total
+
+
+def _pip_command(target: Path, requirements: list[str]) -> list[str]:
+    command = [
+        sys.executable,
+        "-m",
+        "pip",
+        "install",
+        "--disable-pip-version-check",
+        "--no-input",
+        "--no-warn-script-location",
+        "--target",
+        str(target),
+    ]
+    if settings.SKILL_DEPENDENCY_WHEELHOUSE:
+        command.extend(["--no-index", "--find-links", settings.SKILL_DEPENDENCY_WHEELHOUSE])
+    command.extend(requirements)
+    return command
+
+
+def _finalize_build(staging: Path, target: Path, requirements: list[str], spec_hash: str) -> None:
+    marker = {
+        "requirements": requirements,
+        "spec_hash": spec_hash,
+        "size_bytes": _tree_size(staging),
+        "built_at": time.time(),
+    }
+    (staging / _MARKER_FILENAME).write_text(json.dumps(marker), encoding="utf-8")
+    try:
+        os.rename(staging, target)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not (target / _MARKER_FILENAME).exists():
+            raise
+
+
+async def _build(target: Path, requirements: list[str], spec_hash: str) -> DependencyEnv:
+    await run_io(target.parent.mkdir, parents=True, exist_ok=True)
+    staging = target.parent / f"{_BUILD_PREFIX}{uuid.uuid4().hex}"
+    proc = await asyncio.create_subprocess_exec(
+        *_pip_command(staging / "site-packages", requirements),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    timeout_seconds = max(1, int(settings.SKILL_DEPENDENCY_BUILD_TIMEOUT_SECONDS))
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_seconds)
+    except BaseException:
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+        await proc.wait()
+        await run_io(shutil.rmtree, staging, ignore_errors=True)
+        raise
+    if proc.returncode != 0:
+        await run_io(shutil.rmtree, staging, ignore_errors=True)
+        detail = (stderr or stdout).decode(errors="replace").strip()[-2000:]
+        raise RuntimeError(f"pip install failed with exit code {proc.returncode}: {detail}")
+    await run_io(_finalize_build, staging, target, requirements, spec_hash)
+    return DependencyEnv(target)
+
+
+async def ensure_dependency_env(
+    skill_id: str,
+    version: str,
+    dependency_spec: dict | None,
+    dependencies: list[str] | None = None,
+) -> DependencyEnv | None:
+    requirements = python_requirements(dependency_spec, dependencies)
+    if requirements is None:
+        _stats["unsupported"] += 1
+        return None
+    if not requirements:
+        return None
+    spec_hash = dependency_spec_hash(dependency_spec or {"requirements": requirements})
+    target = _env_path(skill_id, version, spec_hash)
+    if await run_io(_touch_ready, target):
+        _stats["hits"] += 1
+        return DependencyEnv(target)
+    key = str(target)
+    failed_at = _failures.get(key)
+    if failed_at is not None and time.monotonic() - failed_at < _FAILURE_BACKOFF_SECONDS:
+        return None
+    _stats["misses"] += 1
+
+    async def build() -> DependencyEnv:
+        if await run_io(_touch_ready, target):
+            return DependencyEnv(target)
+        _stats["builds"] += 1
+        built = await _build(target, requirements, spec_hash)
+        await run_io(evict_dependency_envs, key)
+        return built
+
+    try:
+        dependency_env = await _builds.do(key, build)
+    except (OSError, RuntimeError, asyncio.TimeoutError) as exc:
+        _stats["build_failures"] += 1
+        _failures[key] = time.monotonic()
+        logger.warning(f"Failed to build dependency env for {skill_id}@{version}: {exc}")
+        return None
+    _failures.pop(key, None)
+    return dependency_env
+
+
+async def resolve_skill_dependency_env(user_id: str | None, skill_name: str) -> DependencyEnv | None:
+    if not user_id:
+        return None
+    try:
+        from mcp_agentskills.db.session import get_async_session
+        from mcp_agentskills.repositories.skill import SkillRepository
+        from mcp_agentskills.repositories.skill_version import SkillVersionRepository
+    except Exception:
+        return None
+    async for session in get_async_session():
+        skill = await SkillRepository(session).get_by_name(user_id, skill_name)
+        if not skill or not skill.current_version:
+            return None
+        record = await SkillVersionRepository(session).get_by_version(skill.id, skill.current_version)
+        if not record:
+            return None
+        return await ensure_dependency_env(
+            skill.id,
+            record.version,
+            record.dependency_spec,
+            record.dependencies,
+        )
+    return None
+
+
+def _read_marker(path: Path) -> tuple[float, int] | None:
+    marker = path / _MARKER_FILENAME
+    try:
+        used_at = marker.stat().st_mtime
+        size = int(json.loads(marker.read_text(encoding="utf-8")).get("size_bytes") or 0)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return used_at, size
+
+
+def _scan_envs(root: Path) -> list[tuple[float, int, Path]]:
+    entries: list[tuple[float, int, Path]] = []
+    now = time.time()
+    try:
+        skill_dirs = [entry for entry in root.iterdir() if entry.is_dir()]
+    except OSError:
+        return entries
+    for skill_dir in skill_dirs:
+        try:
+            children = list(skill_dir.iterdir())
+        except OSError:
+            continue
+        for child in children:
+            if child.name.startswith(_BUILD_PREFIX):
+                with contextlib.suppress(OSError):
+                    if now - child.stat().st_mtime > _STALE_BUILD_SECONDS:
+                        shutil.rmtree(child, ignore_errors=True)
+                continue
+            info = _read_marker(child)
+            if info is not None:
+                entries.append((info[0], info[1], child))
+    return entries
+
+
+def evict_dependency_envs(keep: str | None = None) -> int:
+    max_bytes = int(settings.SKILL_DEPENDENCY_ENV_MAX_BYTES)
+    if max_bytes <= 0:
+        return 0
+    entries = sorted(_scan_envs(get_dependency_env_root()), key=lambda item: item[0])
+    total = sum(size for _, size, _ in entries)
+    in_use_window = max(1, int(settings.SKILL_EXECUTION_TIMEOUT_SECONDS))
+    now = time.time()
+    evicted = 0
+    for used_at, size, path in entries:
+        if total <= max_bytes:
+            break
+        if str(path) == keep or now - used_at < in_use_window:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        evicted += 1
+    _stats["evictions"] += evicted
+    return evicted
+
+
+def discard_dependency_envs(skill_id: str) -> None:
+    shutil.rmtree(get_dependency_env_root() / skill_id, ignore_errors=True)
+    prefix = str(get_dependency_env_root() / skill_id) + os.sep
+    for key in [key for key in _failures if key.startswith(prefix)]:
+        _failures.pop(key, None)
+
+
+def get_dependency_env_stats() -> dict:
+    stats: dict = dict(_stats)
+    stats["enabled"] = bool(settings.ENABLE_DEPENDENCY_ENVS)
+    stats["max_bytes"] = int(settings.SKILL_DEPENDENCY_ENV_MAX_BYTES)
+    stats["failed_keys"] = len(_failures)
+    return stats
+
+
+def reset_dependency_envs() -> None:
+    _failures.clear()
+    for name in _stats:
+        _stats[name] = 0
@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from mcp_agentskills.config.settings import settings
+
+
+@dataclass(frozen=True)
+class DownloadArtifact:
+    encrypted_code: str
+    checksum: str
+    encryption_scheme: str | None
+    revoked_at: datetime | None
+
+    @property
+    def size(self) -> int:
+        return len(self.encrypted_code)
+
+
+ArtifactKey = tuple[str, str, str]
+
+_artifacts: OrderedDict[ArtifactKey, DownloadArtifact] = OrderedDict()
+_lock = threading.Lock()
+_state = {"bytes": 0}
+_stats: dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+
+def _max_bytes() -> int:
+    return max(0, int(settings.SKILL_DOWNLOAD_ARTIFACT_CACHE_MAX_BYTES))
+
+
+def _drop(key: ArtifactKey) -> None:
+    artifact = _artifacts.pop(key, None)
+    if artifact is not None:
+        _state["bytes"] -= artifact.size
+
+
+def get_download_artifact(
+    skill_id: str,
+    version: str,
+    mode: str,
+    revoked_at: datetime | None,
+) -> DownloadArtifact | None:
+    key = (str(skill_id), version, mode)
+    with _lock:
+        artifact = _artifacts.get(key)
+        if artifact is None:
+            _stats["misses"] += 1
+            return None
+        if artifact.revoked_at != revoked_at:
+            _drop(key)
+            _stats["invalidations"] += 1
+            _stats["misses"] += 1
+            return None
+        _artifacts.move_to_end(key)
+        _stats["hits"] += 1
+        return artifact
+
+
+def put_download_artifact(skill_id: str, version: str, mode: str, artifact: DownloadArtifact) -> bool:
+    max_bytes = _max_bytes()
+    if artifact.size > max_bytes:
+        return False
+    key = (str(skill_id), version, mode)
+    with _lock:
+        _drop(key)
+        while _artifacts and _state["bytes"] + artifact.size > max_bytes:
+            _, evicted = _artifacts.popitem(last=False)
+            _state["bytes"] -= evicted.size
+            _stats["evictions"] += 1
+        _artifacts[key] = artifact
+        _state["bytes"] += artifact.size
+        _stats["stores"] += 1
+    return True
+
+
+def invalidate_download_artifacts(skill_id: str, version: str | None = None) -> None:
+    skill_id = str(skill_id)
+    with _lock:
+        keys = [key for key in _artifacts if key[0] == skill_id and (version is None or key[1] == version)]
+        for key in keys:
+            _drop(key)
+        _stats["invalidations"] += len(keys)
+
+
+def get_download_artifact_stats() -> dict[str, int]:
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_artifacts)
+        stats["bytes"] = _state["bytes"]
+    stats["max_bytes"] = _max_bytes()
+    return stats
+
+
+def reset_download_artifacts() -> None:
+    with _lock:
+        _artifacts.clear()
+        _state["bytes"] = 0
+        for name in _stats:
+            _stats[name] = 0
@@ -1,12 +1,27 @@
 import asyncio
-from collections import defaultdict
+import os
+import socket
 from pathlib import Path
 
 from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.admission_queue import AdmissionQueue
+from mcp_agentskills.core.utils.process_output import (
+    CapturedOutput,
+    capture_process_output,
+)
+from mcp_agentskills.core.utils.progress import create_progress_reporter
+from mcp_agentskills.core.utils.shared_counters import get_counter_backend
+from mcp_agentskills.core.utils.warm_workers import WarmResult
+from mcp_agentskills.core.utils.warm_workers import (
+    run_warm_entrypoint as _run_warm_entrypoint,
+)
+from mcp_agentskills.core.utils.workdir_usage import (
+    get_workdir_usage,
+    schedule_workdir_refresh,
+)
 
-_slot_lock = asyncio.Lock()
-_user_running: dict[str, int] = defaultdict(int)
-_team_running: dict[str, int] = defaultdict(int)
+_HOST_KEY = f"host:{socket.gethostname()}"
+_queue_state: dict = {"queue": None, "loop": None}
 
 
 def _safe_limit(value: int, fallback: int = 1) -> int:
@@ -15,42 +30,73 @@ def _safe_limit(value: int, fallback: int = 1) -> int:
     return value
 
 
+def get_global_execution_limit() -> int:
+    return _safe_limit(settings.SKILL_MAX_CONCURRENT_EXECUTIONS_GLOBAL, os.cpu_count() or 1)
+
+
+def _get_admission_queue() -> AdmissionQueue:
+    loop = asyncio.get_running_loop()
+    queue = _queue_state["queue"]
+    if queue is None or _queue_state["loop"] is not loop:
+        queue = AdmissionQueue(poll_seconds=max(0.01, float(settings.SKILL_EXECUTION_QUEUE_POLL_SECONDS)))
+        _queue_state["queue"] = queue
+        _queue_state["loop"] = loop
+    return queue
+
+
+def _tenant_weight(team_id: str | None) -> float:
+    if not team_id:
+        return 1.0
+    try:
+        return max(0.01, float(settings.SKILL_EXECUTION_TEAM_WEIGHTS.get(team_id, 1)))
+    except (TypeError, ValueError):
+        return 1.0
+
+
 async def acquire_execution_slot(user_id: str, team_id: str | None):
-    user_limit = _safe_limit(settings.SKILL_MAX_CONCURRENT_EXECUTIONS_PER_USER)
-    team_limit = _safe_limit(settings.SKILL_MAX_CONCURRENT_EXECUTIONS_PER_TEAM)
-    async with _slot_lock:
-        if _user_running[user_id] >= user_limit:
-            return None
-        if team_id and _team_running[team_id] >= team_limit:
+    limits = [(f"user:{user_id}", _safe_limit(settings.SKILL_MAX_CONCURRENT_EXECUTIONS_PER_USER))]
+    if team_id:
+        limits.append((f"team:{team_id}", _safe_limit(settings.SKILL_MAX_CONCURRENT_EXECUTIONS_PER_TEAM)))
+    limits.append((_HOST_KEY, get_global_execution_limit()))
+    backend = get_counter_backend()
+    queue = _get_admission_queue()
+    lease_seconds = max(1, settings.SKILL_EXECUTION_LEASE_SECONDS)
+
+    async def _admit():
+        lease_id = await backend.acquire_lease(limits, lease_seconds)
+        if lease_id is None:
             return None
-        _user_running[user_id] += 1
-        if team_id:
-            _team_running[team_id] += 1
-
-    async def _release():
-        async with _slot_lock:
-            if _user_running[user_id] > 0:
-                _user_running[user_id] -= 1
-            if _user_running[user_id] <= 0:
-                _user_running.pop(user_id, None)
-            if team_id:
-                if _team_running[team_id] > 0:
-                    _team_running[team_id] -= 1
-                if _team_running[team_id] <= 0:
-                    _team_running.pop(team_id, None)
-
-    return _release
-
-
-def _dir_size_bytes(path: Path) -> int:
-    total = 0
-    for item in path.rglob("*"):
-        if item.is_file():
-            try:
-                total += item.stat().st_size
-            except OSError:
-                continue
-    return total
+        released = False
+
+        async def _release():
+            nonlocal released
+            if released:
+                return
+            released = True
+            await backend.release_lease(lease_id)
+            queue.notify()
+
+        return _release
+
+    return await queue.acquire(
+        f"team:{team_id}" if team_id else f"user:{user_id}",
+        _admit,
+        timeout=float(settings.SKILL_EXECUTION_QUEUE_TIMEOUT_SECONDS),
+        weight=_tenant_weight(team_id),
+        max_depth=int(settings.SKILL_EXECUTION_QUEUE_MAX_DEPTH),
+    )
+
+
+def get_execution_queue_stats() -> dict:
+    stats = (_queue_state["queue"] or AdmissionQueue()).stats()
+    stats["global_limit"] = get_global_execution_limit()
+    return stats
+
+
+async def close_execution_queue() -> None:
+    queue = _queue_state["queue"]
+    if queue is not None:
+        await queue.close()
 
 
 def is_within_workdir_quota(path: Path, max_bytes: int | None = None) -> bool:
@@ -59,7 +105,58 @@ def is_within_workdir_quota(path: Path, max_bytes: int | None = None) -> bool:
     limit = max_bytes if max_bytes is not None else settings.SKILL_MAX_WORKDIR_BYTES
     if limit <= 0:
         return True
-    return _dir_size_bytes(path) <= limit
+    return get_workdir_usage(path) <= limit
+
+
+def refresh_workdir_quota(path: Path) -> None:
+    schedule_workdir_refresh(path)
+
+
+async def capture_execution_output(proc: asyncio.subprocess.Process, timeout_seconds: float) -> CapturedOutput:
+    reporter = create_progress_reporter()
+    try:
+        return await capture_process_output(
+            proc,
+            timeout_seconds,
+            max_bytes=settings.SKILL_MAX_OUTPUT_BYTES,
+            hard_cap_bytes=settings.SKILL_OUTPUT_HARD_CAP_BYTES,
+            on_output=reporter.feed if reporter is not None else None,
+        )
+    finally:
+        if reporter is not None:
+            await reporter.close()
+
+
+async def capture_output(proc: asyncio.subprocess.Process, timeout_seconds: float) -> tuple[bytes, bytes, str | None]:
+    if getattr(proc, "stdout", None) is None:
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            proc.kill()
+            stdout, stderr = await proc.communicate()
+            return stdout or b"", stderr or b"", "timeout"
+        return stdout or b"", stderr or b"", None
+    captured = await capture_execution_output(proc, timeout_seconds)
+    if captured.timed_out:
+        return captured.stdout, captured.stderr, "timeout"
+    if captured.output_limited:
+        return captured.stdout, captured.stderr, "output_limit"
+    return captured.stdout, captured.stderr, None
+
+
+async def run_warm_entrypoint(
+    skill_id: str,
+    version: str,
+    version_dir: Path,
+    entrypoint: str,
+    params: str,
+    env: dict[str, str],
+    timeout_seconds: float,
+    dependency_env: str = "",
+) -> WarmResult | None:
+    return await _run_warm_entrypoint(
+        skill_id, version, version_dir, entrypoint, params, env, timeout_seconds, dependency_env
+    )
 
 
 def truncate_output(output: str, max_bytes: int | None = None) -> str:
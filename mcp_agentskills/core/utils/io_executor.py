@@ -0,0 +1,85 @@
+import asyncio
+import functools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from mcp_agentskills.config.settings import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats: dict[str, float] = {
+    "submitted": 0,
+    "completed": 0,
+    "failed": 0,
+    "queued": 0,
+    "active": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+    "run_seconds_total": 0.0,
+}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, int(settings.SKILL_IO_MAX_WORKERS)),
+                thread_name_prefix="skill-io",
+            )
+        return _executor
+
+
+def _run_tracked(submitted_at: float, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    started_at = time.perf_counter()
+    waited = started_at - submitted_at
+    with _stats_lock:
+        _stats["queued"] -= 1
+        _stats["active"] += 1
+        _stats["wait_seconds_total"] += waited
+        _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], waited)
+    failed = False
+    try:
+        return func(*args, **kwargs)
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        with _stats_lock:
+            _stats["active"] -= 1
+            _stats["completed"] += 1
+            _stats["failed"] += 1 if failed else 0
+            _stats["run_seconds_total"] += time.perf_counter() - started_at
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    with _stats_lock:
+        _stats["submitted"] += 1
+        _stats["queued"] += 1
+    call = functools.partial(_run_tracked, time.perf_counter(), func, *args, **kwargs)
+    return await loop.run_in_executor(_get_executor(), call)
+
+
+def get_io_executor_stats() -> dict[str, float]:
+    with _stats_lock:
+        stats = dict(_stats)
+    completed = stats["completed"]
+    stats["wait_seconds_avg"] = stats["wait_seconds_total"] / completed if completed else 0.0
+    stats["max_workers"] = max(1, int(settings.SKILL_IO_MAX_WORKERS))
+    return stats
+
+
+def shutdown_io_executor(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        executor = _executor
+        _executor = None
+    if executor is not None:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.periodic_task import PeriodicTask
+from mcp_agentskills.core.utils.skill_storage import SKILL_LOCAL_CACHE_DIRNAME
+
+_STALE_TEMP_SECONDS = 3600
+
+_lock = threading.Lock()
+_entries: OrderedDict[str, int] = OrderedDict()
+_state: dict = {"root": None, "bytes": 0}
+_stats: dict[str, int] = {
+    "hits": 0,
+    "misses": 0,
+    "writes": 0,
+    "evictions": 0,
+    "expired": 0,
+    "janitor_runs": 0,
+}
+
+
+def get_local_cache_dir() -> Path:
+    return Path(settings.SKILL_STORAGE_PATH) / SKILL_LOCAL_CACHE_DIRNAME
+
+
+def _max_bytes() -> int:
+    return max(0, int(settings.SKILL_LOCAL_CACHE_MAX_BYTES))
+
+
+def _is_temp_file(path: Path) -> bool:
+    return path.name.startswith(".") and path.name.endswith(".tmp")
+
+
+def _scan(root: Path) -> list[tuple[float, str, int]]:
+    found: list[tuple[float, str, int]] = []
+    if not root.is_dir():
+        return found
+    for path in root.rglob("*"):
+        if _is_temp_file(path):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if path.is_file():
+            found.append((max(stat.st_atime, stat.st_mtime), str(path), stat.st_size))
+    return sorted(found)
+
+
+def _reindex(root: Path) -> None:
+    _entries.clear()
+    _state["bytes"] = 0
+    for _, key, size in _scan(root):
+        _entries[key] = size
+        _state["bytes"] += size
+    _state["root"] = str(root)
+
+
+def _ensure_index() -> None:
+    root = get_local_cache_dir()
+    if _state["root"] != str(root):
+        _reindex(root)
+
+
+def _remove(key: str) -> None:
+    size = _entries.pop(key, None)
+    if size is not None:
+        _state["bytes"] -= size
+
+
+def _unlink(key: str) -> None:
+    try:
+        Path(key).unlink()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return
+    _remove(key)
+
+
+def _evict_to_budget(keep: str | None = None) -> int:
+    max_bytes = _max_bytes()
+    if max_bytes <= 0:
+        return 0
+    evicted = 0
+    for key in list(_entries):
+        if _state["bytes"] <= max_bytes:
+            break
+        if key == keep and _entries[key] <= max_bytes:
+            continue
+        _unlink(key)
+        evicted += 1
+    _stats["evictions"] += evicted
+    return evicted
+
+
+def record_cache_hit(path: Path) -> None:
+    with _lock:
+        _stats["hits"] += 1
+        _ensure_index()
+        key = str(path)
+        if key in _entries:
+            _entries.move_to_end(key)
+
+
+def record_cache_miss(path: Path | None = None) -> None:
+    with _lock:
+        _stats["misses"] += 1
+        if path is not None:
+            _remove(str(path))
+
+
+def record_cache_expired(path: Path) -> None:
+    with _lock:
+        _stats["expired"] += 1
+        _remove(str(path))
+
+
+def record_cache_write(path: Path, size: int) -> None:
+    with _lock:
+        _ensure_index()
+        key = str(path)
+        _remove(key)
+        _entries[key] = size
+        _state["bytes"] += size
+        _stats["writes"] += 1
+        _evict_to_budget(keep=key)
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _remove_empty_dirs(root: Path) -> None:
+    for current, _, _ in os.walk(root, topdown=False):
+        if current == str(root):
+            continue
+        try:
+            if not os.listdir(current):
+                os.rmdir(current)
+        except OSError:
+            continue
+
+
+def run_local_cache_janitor() -> dict[str, int]:
+    root = get_local_cache_dir()
+    ttl_seconds = int(settings.SKILL_CACHE_TTL_SECONDS or 0)
+    now = time.time()
+    expired = 0
+    if root.is_dir():
+        for path in root.rglob("*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if not path.is_file():
+                continue
+            if _is_temp_file(path):
+                if stat.st_mtime + _STALE_TEMP_SECONDS < now:
+                    _unlink_quietly(path)
+                continue
+            if ttl_seconds > 0 and stat.st_mtime + ttl_seconds < now:
+                _unlink_quietly(path)
+                expired += 1
+        _remove_empty_dirs(root)
+    with _lock:
+        _reindex(root)
+        _stats["expired"] += expired
+        _stats["janitor_runs"] += 1
+        evicted = _evict_to_budget()
+    return {"expired": expired, "evicted": evicted}
+
+
+async def _janitor_tick() -> None:
+    await run_io(run_local_cache_janitor)
+
+
+_janitor = PeriodicTask("local-archive-cache-janitor", _janitor_tick)
+
+
+def start_local_cache_janitor() -> None:
+    interval = int(settings.SKILL_LOCAL_CACHE_JANITOR_INTERVAL_SECONDS)
+    if interval <= 0:
+        return
+    _janitor.start(interval)
+
+
+async def stop_local_cache_janitor() -> None:
+    await _janitor.stop(final_run=False)
+
+
+def get_local_cache_stats() -> dict[str, int]:
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_entries)
+        stats["bytes"] = _state["bytes"]
+    stats["max_bytes"] = _max_bytes()
+    return stats
+
+
+def reset_local_cache_index() -> None:
+    with _lock:
+        _entries.clear()
+        _state["root"] = None
+        _state["bytes"] = 0
+        for name in _stats:
+            _stats[name] = 0
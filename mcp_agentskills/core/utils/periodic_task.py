@@ -0,0 +1,39 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+
+from loguru import logger
+
+
+class PeriodicTask:
+    def __init__(self, name: str, callback: Callable[[], Awaitable[object]]):
+        self.name = name
+        self.callback = callback
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.callback()
+            except Exception as exc:
+                logger.warning(f"Periodic task {self.name} failed: {exc}")
+
+    def start(self, interval_seconds: float) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(max(0.01, float(interval_seconds))), name=self.name)
+
+    async def stop(self, final_run: bool = True) -> None:
+        task = self._task
+        self._task = None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if final_run:
+            await self.callback()
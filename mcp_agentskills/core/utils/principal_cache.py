@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from mcp_agentskills.config.settings import settings
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    token_id: str
+    user_id: str
+    user_active: bool
+    expires_at: datetime | None
+    cached_until: float
+
+    def is_expired(self, now: datetime | None = None) -> bool:
+        if self.expires_at is None:
+            return False
+        return self.expires_at <= (now or datetime.now(timezone.utc))
+
+
+_principals: OrderedDict[str, CachedPrincipal] = OrderedDict()
+
+
+def _normalize_expiry(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def get_cached_principal(token_hash: str) -> CachedPrincipal | None:
+    principal = _principals.get(token_hash)
+    if principal is None:
+        return None
+    if principal.cached_until <= time.monotonic():
+        _principals.pop(token_hash, None)
+        return None
+    _principals.move_to_end(token_hash)
+    return principal
+
+
+def cache_principal(
+    token_hash: str,
+    token_id: str,
+    user_id: str,
+    user_active: bool,
+    expires_at: datetime | None,
+) -> CachedPrincipal:
+    ttl_seconds = max(0, int(settings.MCP_PRINCIPAL_CACHE_TTL_SECONDS))
+    principal = CachedPrincipal(
+        token_id=str(token_id),
+        user_id=str(user_id),
+        user_active=user_active,
+        expires_at=_normalize_expiry(expires_at),
+        cached_until=time.monotonic() + ttl_seconds,
+    )
+    if ttl_seconds <= 0:
+        return principal
+    max_entries = max(1, int(settings.MCP_PRINCIPAL_CACHE_MAX_ENTRIES))
+    _principals.pop(token_hash, None)
+    while len(_principals) >= max_entries:
+        _principals.popitem(last=False)
+    _principals[token_hash] = principal
+    return principal
+
+
+def invalidate_token_principal(token_hash: str) -> None:
+    _principals.pop(token_hash, None)
+
+
+def invalidate_user_principals(user_id: str) -> None:
+    user_id = str(user_id)
+    for token_hash in [key for key, value in _principals.items() if value.user_id == user_id]:
+        _principals.pop(token_hash, None)
+
+
+def reset_principal_cache() -> None:
+    _principals.clear()
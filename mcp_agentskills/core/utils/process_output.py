@@ -0,0 +1,144 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+OutputCallback = Callable[[str, bytes], Awaitable[None]]
+
+_READ_CHUNK_BYTES = 65536
+_KILL_GRACE_SECONDS = 5.0
+
+
+class BoundedOutput:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+        self.head_limit = self.max_bytes // 2
+        self.tail_limit = self.max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    def feed(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        if self.max_bytes <= 0:
+            self.head.extend(chunk)
+            return
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head.extend(chunk[:room])
+            chunk = chunk[room:]
+        if not chunk or self.tail_limit <= 0:
+            return
+        if len(chunk) >= self.tail_limit:
+            self.tail[:] = chunk[-self.tail_limit :]
+            return
+        self.tail.extend(chunk)
+        overflow = len(self.tail) - self.tail_limit
+        if overflow > 0:
+            del self.tail[:overflow]
+
+    def getvalue(self) -> bytes:
+        dropped = self.dropped
+        if dropped <= 0:
+            return bytes(self.head) + bytes(self.tail)
+        marker = f"\n... [{dropped} bytes truncated] ...\n".encode()
+        return bytes(self.head) + marker + bytes(self.tail)
+
+
+@dataclass(frozen=True)
+class CapturedOutput:
+    stdout: bytes
+    stderr: bytes
+    total_bytes: int
+    timed_out: bool = False
+    output_limited: bool = False
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > len(self.stdout) + len(self.stderr)
+
+
+async def _drain(
+    name: str,
+    stream: asyncio.StreamReader | None,
+    sink: BoundedOutput,
+    on_chunk: Callable[[], None],
+    on_output: OutputCallback | None,
+) -> None:
+    if stream is None:
+        return
+    while True:
+        chunk = await stream.read(_READ_CHUNK_BYTES)
+        if not chunk:
+            return
+        sink.feed(chunk)
+        on_chunk()
+        if on_output is not None:
+            await on_output(name, chunk)
+
+
+def _kill(proc: asyncio.subprocess.Process) -> None:
+    with contextlib.suppress(ProcessLookupError):
+        proc.kill()
+
+
+async def _settle(readers: asyncio.Future[tuple[None, None]]) -> None:
+    done, _ = await asyncio.wait({readers}, timeout=_KILL_GRACE_SECONDS)
+    if not done:
+        readers.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await readers
+
+
+async def capture_process_output(
+    proc: asyncio.subprocess.Process,
+    timeout_seconds: float,
+    max_bytes: int,
+    hard_cap_bytes: int = 0,
+    on_output: OutputCallback | None = None,
+) -> CapturedOutput:
+    stdout = BoundedOutput(max_bytes)
+    stderr = BoundedOutput(max_bytes)
+    limited = asyncio.Event()
+
+    def _check_cap() -> None:
+        if hard_cap_bytes > 0 and not limited.is_set() and stdout.total + stderr.total > hard_cap_bytes:
+            limited.set()
+            _kill(proc)
+
+    readers: asyncio.Future[tuple[None, None]] = asyncio.ensure_future(
+        asyncio.gather(
+            _drain("stdout", proc.stdout, stdout, _check_cap, on_output),
+            _drain("stderr", proc.stderr, stderr, _check_cap, on_output),
+        )
+    )
+    limit_hit: asyncio.Future[Any] = asyncio.ensure_future(limited.wait())
+    try:
+        done, _ = await asyncio.wait(
+            [readers, limit_hit],
+            timeout=timeout_seconds,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    except BaseException:
+        _kill(proc)
+        readers.cancel()
+        raise
+    finally:
+        limit_hit.cancel()
+    timed_out = not done
+    if readers not in done:
+        _kill(proc)
+        await _settle(readers)
+    await proc.wait()
+    return CapturedOutput(
+        stdout=stdout.getvalue(),
+        stderr=stderr.getvalue(),
+        total_bytes=stdout.total + stderr.total,
+        timed_out=timed_out,
+        output_limited=limited.is_set(),
+    )
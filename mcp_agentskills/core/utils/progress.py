@@ -0,0 +1,114 @@
+import asyncio
+import codecs
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+
+from loguru import logger
+
+from mcp_agentskills.config.settings import settings
+
+ProgressSender = Callable[[float, float | None, str | None], Awaitable[None]]
+
+
+class ProgressReporter:
+    def __init__(self, send: ProgressSender, interval_seconds: float, max_message_bytes: int):
+        self._send = send
+        self.interval_seconds = max(0.0, float(interval_seconds))
+        self.max_message_bytes = max(1, int(max_message_bytes))
+        self._decoders: dict[str, codecs.IncrementalDecoder] = {}
+        self._pending: list[str] = []
+        self._pending_bytes = 0
+        self._progress = 0
+        self._last_sent = 0.0
+        self._failed = False
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self.notifications = 0
+
+    def _decode(self, stream: str, chunk: bytes, final: bool = False) -> str:
+        decoder = self._decoders.get(stream)
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            self._decoders[stream] = decoder
+        return decoder.decode(chunk, final)
+
+    def _append(self, stream: str, text: str) -> None:
+        if not text:
+            return
+        if self._pending_bytes < self.max_message_bytes:
+            self._pending.append(text if stream == "stdout" else f"[{stream}] {text}")
+        self._pending_bytes += len(text.encode("utf-8"))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self.flush()
+
+    async def feed(self, stream: str, chunk: bytes) -> None:
+        self._progress += len(chunk)
+        if self._failed:
+            return
+        self._append(stream, self._decode(stream, chunk))
+        remaining = self.interval_seconds - (time.monotonic() - self._last_sent)
+        if remaining <= 0:
+            await self.flush()
+        elif self._pending and self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later(remaining))
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if self._failed or not self._pending:
+                return
+            message = "".join(self._pending)
+            encoded = message.encode("utf-8")
+            if len(encoded) > self.max_message_bytes:
+                message = encoded[: self.max_message_bytes].decode("utf-8", errors="ignore") + " ..."
+            self._pending.clear()
+            self._pending_bytes = 0
+            self._last_sent = time.monotonic()
+            try:
+                await self._send(float(self._progress), None, message)
+                self.notifications += 1
+            except Exception as exc:
+                self._failed = True
+                logger.debug(f"Progress notifications disabled for this call: {exc}")
+
+    async def close(self) -> None:
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await timer
+        for stream in list(self._decoders):
+            self._append(stream, self._decode(stream, b"", final=True))
+        await self.flush()
+
+
+def _current_mcp_context():
+    try:
+        from fastmcp.server.dependencies import get_context
+    except Exception:
+        return None
+    try:
+        context = get_context()
+    except Exception:
+        return None
+    request_context = getattr(context, "request_context", None)
+    meta = getattr(request_context, "meta", None) if request_context is not None else None
+    if getattr(meta, "progressToken", None) is None:
+        return None
+    return context
+
+
+def create_progress_reporter() -> ProgressReporter | None:
+    if not settings.ENABLE_EXECUTION_PROGRESS:
+        return None
+    context = _current_mcp_context()
+    if context is None:
+        return None
+    return ProgressReporter(
+        context.report_progress,
+        interval_seconds=settings.SKILL_PROGRESS_INTERVAL_SECONDS,
+        max_message_bytes=settings.SKILL_PROGRESS_MAX_MESSAGE_BYTES,
+    )
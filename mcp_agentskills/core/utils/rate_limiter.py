@@ -0,0 +1,90 @@
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+_registry: dict[str, "TokenBucketLimiter"] = {}
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+def take_tokens(
+    tokens: float,
+    elapsed: float,
+    capacity: int,
+    refill_per_second: float,
+    cost: float = 1.0,
+) -> tuple[float, RateLimitDecision]:
+    tokens = min(float(capacity), tokens + max(0.0, elapsed) * refill_per_second)
+    if tokens >= cost:
+        tokens -= cost
+        return tokens, RateLimitDecision(True, int(tokens), 0.0)
+    return tokens, RateLimitDecision(False, 0, (cost - tokens) / refill_per_second)
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+
+class TokenBucketLimiter:
+    def __init__(self, name: str, capacity: int, window_seconds: float, max_keys: int, shards: int = 16):
+        self.name = name
+        self.capacity = max(1, int(capacity))
+        self.refill_per_second = self.capacity / max(float(window_seconds), 1e-6)
+        shards = max(1, int(shards))
+        self._shards = [_Shard() for _ in range(shards)]
+        self._max_keys_per_shard = max(1, -(-max(1, int(max_keys)) // shards))
+        self._stats = {"allowed": 0, "limited": 0, "evictions": 0}
+        _registry[name] = self
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[zlib.crc32(key.encode("utf-8")) % len(self._shards)]
+
+    def hit(self, key: str, cost: float = 1.0, now: float | None = None) -> RateLimitDecision:
+        now = time.monotonic() if now is None else now
+        shard = self._shard(key)
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.capacity), now]
+                shard.buckets[key] = bucket
+                while len(shard.buckets) > self._max_keys_per_shard:
+                    shard.buckets.popitem(last=False)
+                    self._stats["evictions"] += 1
+            else:
+                shard.buckets.move_to_end(key)
+            bucket[0], decision = take_tokens(
+                bucket[0], now - bucket[1], self.capacity, self.refill_per_second, cost
+            )
+            bucket[1] = now
+            self._stats["allowed" if decision.allowed else "limited"] += 1
+            return decision
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["keys"] = len(self)
+        stats["max_keys"] = self._max_keys_per_shard * len(self._shards)
+        stats["capacity"] = self.capacity
+        return stats
+
+
+def retry_after_header(decision: RateLimitDecision) -> str:
+    return str(max(1, math.ceil(decision.retry_after)))
+
+
+def get_rate_limiter_stats() -> dict[str, dict[str, int]]:
+    return {name: limiter.stats() for name, limiter in _registry.items()}
@@ -0,0 +1,241 @@
+import threading
+import time
+import uuid
+from typing import Any, Protocol, cast
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.periodic_task import PeriodicTask
+from mcp_agentskills.core.utils.rate_limiter import (
+    RateLimitDecision,
+    TokenBucketLimiter,
+    take_tokens,
+)
+from mcp_agentskills.db import session as db_session
+from mcp_agentskills.models.shared_counter import SharedCounter, SharedLease
+
+SlotLimit = tuple[str, int]
+
+
+class CounterBackend(Protocol):
+    name: str
+
+    async def consume(
+        self,
+        namespace: str,
+        key: str,
+        capacity: int,
+        window_seconds: float,
+        cost: float = 1.0,
+    ) -> RateLimitDecision: ...
+
+    async def acquire_lease(self, limits: list[SlotLimit], ttl_seconds: float) -> str | None: ...
+
+    async def release_lease(self, lease_id: str) -> None: ...
+
+    async def prune(self) -> int: ...
+
+
+class MemoryCounterBackend:
+    name = "memory"
+
+    def __init__(self):
+        self._limiters: dict[str, TokenBucketLimiter] = {}
+        self._lock = threading.Lock()
+        self._slots: dict[str, dict[str, float]] = {}
+        self._leases: dict[str, list[str]] = {}
+
+    async def consume(
+        self,
+        namespace: str,
+        key: str,
+        capacity: int,
+        window_seconds: float,
+        cost: float = 1.0,
+    ) -> RateLimitDecision:
+        limiter = self._limiters.get(namespace)
+        if limiter is None:
+            limiter = TokenBucketLimiter(namespace, capacity, window_seconds, settings.RATE_LIMIT_MAX_KEYS)
+            self._limiters[namespace] = limiter
+        return limiter.hit(key, cost)
+
+    def _purge(self, key: str, now: float) -> dict[str, float]:
+        holders = self._slots.get(key, {})
+        for lease_id, expires_at in list(holders.items()):
+            if expires_at <= now:
+                holders.pop(lease_id, None)
+        return holders
+
+    async def acquire_lease(self, limits: list[SlotLimit], ttl_seconds: float) -> str | None:
+        now = time.monotonic()
+        with self._lock:
+            for key, limit in limits:
+                if len(self._purge(key, now)) >= limit:
+                    return None
+            lease_id = str(uuid.uuid4())
+            for key, _ in limits:
+                self._slots.setdefault(key, {})[lease_id] = now + ttl_seconds
+            self._leases[lease_id] = [key for key, _ in limits]
+        return lease_id
+
+    async def release_lease(self, lease_id: str) -> None:
+        with self._lock:
+            for key in self._leases.pop(lease_id, []):
+                holders = self._slots.get(key)
+                if holders is None:
+                    continue
+                holders.pop(lease_id, None)
+                if not holders:
+                    self._slots.pop(key, None)
+
+    async def prune(self) -> int:
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            for key in list(self._slots):
+                before = len(self._slots[key])
+                holders = self._purge(key, now)
+                removed += before - len(holders)
+                if not holders:
+                    self._slots.pop(key, None)
+            active = {lease_id for holders in self._slots.values() for lease_id in holders}
+            for lease_id in list(self._leases):
+                if lease_id not in active:
+                    self._leases.pop(lease_id, None)
+        return removed
+
+
+class SqlCounterBackend:
+    name = "sql"
+
+    async def _lock_counter(self, session: AsyncSession, key: str, initial: float, now: float) -> tuple[float, float]:
+        for _ in range(3):
+            result = cast(
+                CursorResult[Any],
+                await session.execute(
+                    update(SharedCounter).where(SharedCounter.key == key).values(tokens=SharedCounter.tokens)
+                ),
+            )
+            if result.rowcount:
+                row = (
+                    await session.execute(
+                        select(SharedCounter.tokens, SharedCounter.updated_at).where(SharedCounter.key == key)
+                    )
+                ).one()
+                return float(row.tokens), float(row.updated_at)
+            try:
+                async with session.begin_nested():
+                    await session.execute(insert(SharedCounter).values(key=key, tokens=initial, updated_at=now))
+                return initial, now
+            except IntegrityError:
+                continue
+        raise RuntimeError(f"Unable to lock shared counter {key}")
+
+    async def consume(
+        self,
+        namespace: str,
+        key: str,
+        capacity: int,
+        window_seconds: float,
+        cost: float = 1.0,
+    ) -> RateLimitDecision:
+        capacity = max(1, int(capacity))
+        counter_key = f"rl:{namespace}:{key}"
+        now = time.time()
+        async with db_session.async_session_maker() as session:
+            tokens, updated_at = await self._lock_counter(session, counter_key, float(capacity), now)
+            tokens, decision = take_tokens(
+                tokens, now - updated_at, capacity, capacity / max(float(window_seconds), 1e-6), cost
+            )
+            await session.execute(
+                update(SharedCounter).where(SharedCounter.key == counter_key).values(tokens=tokens, updated_at=now)
+            )
+            await session.commit()
+        return decision
+
+    async def acquire_lease(self, limits: list[SlotLimit], ttl_seconds: float) -> str | None:
+        now = time.time()
+        lease_id = str(uuid.uuid4())
+        async with db_session.async_session_maker() as session:
+            for key, _ in sorted(limits):
+                await self._lock_counter(session, f"slot:{key}", 0.0, now)
+            for key, limit in limits:
+                await session.execute(
+                    delete(SharedLease).where(SharedLease.key == key, SharedLease.expires_at <= now)
+                )
+                held = (
+                    await session.execute(select(func.count()).select_from(SharedLease).where(SharedLease.key == key))
+                ).scalar_one()
+                if int(held) >= limit:
+                    await session.rollback()
+                    return None
+            await session.execute(
+                insert(SharedLease),
+                [{"lease_id": lease_id, "key": key, "expires_at": now + ttl_seconds} for key, _ in limits],
+            )
+            await session.commit()
+        return lease_id
+
+    async def release_lease(self, lease_id: str) -> None:
+        async with db_session.async_session_maker() as session:
+            await session.execute(delete(SharedLease).where(SharedLease.lease_id == lease_id))
+            await session.commit()
+
+    async def prune(self) -> int:
+        now = time.time()
+        idle_cutoff = now - max(1, int(settings.RATE_LIMIT_WINDOW))
+        async with db_session.async_session_maker() as session:
+            result = cast(
+                CursorResult[Any],
+                await session.execute(delete(SharedLease).where(SharedLease.expires_at <= now)),
+            )
+            await session.execute(delete(SharedCounter).where(SharedCounter.updated_at < idle_cutoff))
+            await session.commit()
+        return int(result.rowcount or 0)
+
+
+_backends: dict[str, CounterBackend] = {}
+
+
+def create_counter_backend(name: str | None = None) -> CounterBackend:
+    name = (name or settings.SHARED_STATE_BACKEND).lower()
+    if name == "sql":
+        return SqlCounterBackend()
+    if name == "memory":
+        return MemoryCounterBackend()
+    raise ValueError(f"Unsupported shared state backend: {name}")
+
+
+def get_counter_backend() -> CounterBackend:
+    name = settings.SHARED_STATE_BACKEND.lower()
+    backend = _backends.get(name)
+    if backend is None:
+        backend = create_counter_backend(name)
+        _backends[name] = backend
+    return backend
+
+
+def reset_counter_backends() -> None:
+    _backends.clear()
+
+
+async def _janitor_tick() -> None:
+    await get_counter_backend().prune()
+
+
+_janitor = PeriodicTask("shared-counter-janitor", _janitor_tick)
+
+
+def start_shared_counter_janitor() -> None:
+    interval = int(settings.SHARED_STATE_JANITOR_INTERVAL_SECONDS)
+    if interval <= 0:
+        return
+    _janitor.start(interval)
+
+
+async def stop_shared_counter_janitor() -> None:
+    await _janitor.stop(final_run=False)
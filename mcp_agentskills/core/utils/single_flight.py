@@ -0,0 +1,58 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+_registry: dict[str, "SingleFlight[Any]"] = {}
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+        _registry[name] = self
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        self._stats["calls"] += 1
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            self._stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._stats["executions"] += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                self._calls.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["in_flight"] = len(self._calls)
+        return stats
+
+
+def get_single_flight_stats() -> dict[str, dict[str, int]]:
+    return {name: flight.stats() for name, flight in _registry.items()}
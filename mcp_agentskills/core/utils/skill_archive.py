@@ -1,11 +1,104 @@
+import asyncio
 import base64
+import contextlib
+import functools
 import hashlib
+import io
 import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO, Protocol
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.archive_crypto import (
+    STREAM_HEADER_SIZE,
+    STREAM_TAG_SIZE,
+    build_stream_header,
+    decrypt_bytes,
+    derive_key,
+    derive_nonce_prefix,
+    encrypt_frame,
+    encrypt_stream,
+    encrypted_size,
+    frame_count,
+    frame_offset,
+    get_aead,
+    is_stream_payload,
+)
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.local_archive_cache import (
+    record_cache_expired,
+    record_cache_hit,
+    record_cache_miss,
+    record_cache_write,
+)
+from mcp_agentskills.core.utils.single_flight import SingleFlight
+from mcp_agentskills.core.utils.skill_storage import (
+    SKILL_ARCHIVES_DIRNAME,
+    SKILL_LOCAL_CACHE_DIRNAME,
+)
+
+ArchiveContent = bytes | BinaryIO
+
+_CHECKSUM_CACHE_MAX_ENTRIES = 1024
+_checksums: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class ArchiveSource:
+    size: int
+    checksum: str
+    path: Path | None = None
+    data: bytes | None = None
+    fetch: Callable[[int, int], bytes] | None = None
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        if self.data is not None:
+            return self.data[offset : offset + length]
+        if self.fetch is not None:
+            return self.fetch(offset, length)
+        if self.path is None:
+            return b""
+        with self.path.open("rb") as reader:
+            reader.seek(offset)
+            return reader.read(length)
+
+    def stream_size(self, encrypted: bool) -> int:
+        if not encrypted:
+            return self.size
+        return encrypted_size(self.size, _frame_size())
+
+
+def _chunk_size() -> int:
+    return max(1, int(settings.SKILL_UPLOAD_CHUNK_BYTES))
+
+
+def _download_chunk_size() -> int:
+    return max(1, int(settings.SKILL_DOWNLOAD_CHUNK_BYTES))
+
+
+def _frame_size() -> int:
+    return max(1, int(settings.SKILL_DOWNLOAD_FRAME_BYTES))
+
+
+def _copy_to_path(source: BinaryIO, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with temp_path.open("wb") as destination:
+            shutil.copyfileobj(source, destination, _chunk_size())
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
 
 
 def _archive_key(user_id: str, skill_name: str, version: str) -> str:
@@ -13,28 +106,34 @@ def _archive_key(user_id: str, skill_name: str, version: str) -> str:
 
 
 def _archive_path(user_id: str, skill_name: str, version: str) -> Path:
-    base = Path(settings.SKILL_STORAGE_PATH) / "_archives" / user_id / skill_name
-    return base / f"{version}.zip"
+    return Path(settings.SKILL_STORAGE_PATH) / SKILL_ARCHIVES_DIRNAME / _archive_key(user_id, skill_name, version)
 
 
 def _local_cache_path(user_id: str, skill_name: str, version: str) -> Path:
-    base = Path(settings.SKILL_STORAGE_PATH) / "_local_cache" / user_id / skill_name
+    base = Path(settings.SKILL_STORAGE_PATH) / SKILL_LOCAL_CACHE_DIRNAME / user_id / skill_name
     return base / f"{version}.cache"
 
 
-def _build_encryption_key(value: str) -> bytes:
-    return hashlib.sha256(value.encode("utf-8")).digest()
+def _encryption_workers() -> int:
+    return max(1, int(settings.SKILL_ENCRYPTION_WORKERS))
 
 
-def _encrypt_payload(payload: bytes) -> bytes:
-    key = _build_encryption_key(settings.SECRET_KEY)
-    nonce = os.urandom(12)
-    encrypted = nonce + AESGCM(key).encrypt(nonce, payload, None)
-    return base64.b64encode(encrypted)
+def _encrypt_to_path(source: BinaryIO, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with temp_path.open("wb") as destination:
+            encrypt_stream(source, destination, derive_key(settings.SECRET_KEY), _frame_size())
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
 
 
 def _decrypt_payload(payload: bytes) -> bytes:
-    key = _build_encryption_key(settings.SECRET_KEY)
+    key = derive_key(settings.SECRET_KEY)
+    if is_stream_payload(payload):
+        return decrypt_bytes(payload, key, _encryption_workers())
     raw = base64.b64decode(payload)
     nonce, ciphertext = raw[:12], raw[12:]
     return AESGCM(key).decrypt(nonce, ciphertext, None)
@@ -48,37 +147,56 @@ def _is_expired(path: Path) -> bool:
         modified = path.stat().st_mtime
     except OSError:
         return False
-    import time
-
     return modified + ttl_seconds < time.time()
 
 
+def _touch_access_time(path: Path) -> None:
+    try:
+        stat = path.stat()
+        os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+    except OSError:
+        pass
+
+
 def _read_local_cache(path: Path) -> bytes | None:
     if not path.exists():
+        record_cache_miss(path)
         return None
     if _is_expired(path):
         try:
             path.unlink()
         except OSError:
             pass
+        record_cache_expired(path)
+        record_cache_miss(path)
         return None
     data = path.read_bytes()
     if settings.ENABLE_LOCAL_CACHE_ENCRYPTION:
         try:
-            return _decrypt_payload(data)
+            data = _decrypt_payload(data)
         except Exception:
             try:
                 path.unlink()
             except OSError:
                 pass
+            record_cache_miss(path)
             return None
+    _touch_access_time(path)
+    record_cache_hit(path)
     return data
 
 
-def _write_local_cache(path: Path, content: bytes) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    data = _encrypt_payload(content) if settings.ENABLE_LOCAL_CACHE_ENCRYPTION else content
-    path.write_bytes(data)
+def _write_local_cache(path: Path, content: ArchiveContent) -> None:
+    source = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    if settings.ENABLE_LOCAL_CACHE_ENCRYPTION:
+        _encrypt_to_path(source, path)
+    else:
+        _copy_to_path(source, path)
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return
+    record_cache_write(path, size)
 
 
 def _read_plain_archive(path: Path) -> bytes | None:
@@ -93,58 +211,354 @@ def _read_plain_archive(path: Path) -> bytes | None:
     return path.read_bytes()
 
 
-def _get_s3_client():
+@dataclass(frozen=True)
+class ArchiveObject:
+    size: int
+    checksum: str | None
+
+
+class ArchiveBackend(Protocol):
+    name: str
+
+    async def save(self, key: str, source: BinaryIO) -> None: ...
+
+    async def load(self, key: str) -> bytes | None: ...
+
+    async def stat(self, key: str) -> ArchiveObject | None: ...
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes: ...
+
+
+class LocalArchiveBackend:
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key
+
+    async def save(self, key: str, source: BinaryIO) -> None:
+        await run_io(_copy_to_path, source, self.path_for(key))
+
+    async def load(self, key: str) -> bytes | None:
+        return await run_io(_read_plain_archive, self.path_for(key))
+
+    def _stat(self, key: str) -> ArchiveObject | None:
+        path = self.path_for(key)
+        if not path.exists() or _is_expired(path):
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return ArchiveObject(size=stat.st_size, checksum=_file_checksum(path, stat.st_size, stat.st_mtime_ns))
+
+    async def stat(self, key: str) -> ArchiveObject | None:
+        return await run_io(self._stat, key)
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        with self.path_for(key).open("rb") as reader:
+            reader.seek(offset)
+            return reader.read(length)
+
+
+_s3_clients: dict[tuple, object] = {}
+_s3_clients_lock = threading.Lock()
+
+
+def _s3_client_settings() -> tuple:
+    return (
+        settings.SKILL_ARCHIVE_S3_REGION,
+        settings.SKILL_ARCHIVE_S3_ENDPOINT,
+        settings.SKILL_ARCHIVE_S3_ACCESS_KEY_ID,
+        settings.SKILL_ARCHIVE_S3_SECRET_ACCESS_KEY,
+        settings.SKILL_ARCHIVE_S3_FORCE_PATH_STYLE,
+        max(1, int(settings.SKILL_ARCHIVE_S3_MAX_POOL_CONNECTIONS)),
+    )
+
+
+def _create_s3_client(options: tuple):
     import importlib
 
+    region, endpoint, access_key_id, secret_access_key, force_path_style, pool_size = options
     boto3 = importlib.import_module("boto3")
     config_module = importlib.import_module("botocore.config")
     Config = getattr(config_module, "Config")
+    config_options: dict = {"max_pool_connections": pool_size}
+    if force_path_style:
+        config_options["s3"] = {"addressing_style": "path"}
     session = boto3.session.Session()
     return session.client(
         "s3",
-        region_name=settings.SKILL_ARCHIVE_S3_REGION or None,
-        endpoint_url=settings.SKILL_ARCHIVE_S3_ENDPOINT or None,
-        aws_access_key_id=settings.SKILL_ARCHIVE_S3_ACCESS_KEY_ID or None,
-        aws_secret_access_key=settings.SKILL_ARCHIVE_S3_SECRET_ACCESS_KEY or None,
-        config=Config(s3={"addressing_style": "path"})
-        if settings.SKILL_ARCHIVE_S3_FORCE_PATH_STYLE
-        else None,
+        region_name=region or None,
+        endpoint_url=endpoint or None,
+        aws_access_key_id=access_key_id or None,
+        aws_secret_access_key=secret_access_key or None,
+        config=Config(**config_options),
     )
 
 
-async def save_archive(user_id: str, skill_name: str, version: str, content: bytes) -> None:
-    backend = (settings.SKILL_ARCHIVE_BACKEND or "local").lower()
-    if backend == "s3":
-        _write_local_cache(_local_cache_path(user_id, skill_name, version), content)
-        client = _get_s3_client()
-        client.put_object(
-            Bucket=settings.SKILL_ARCHIVE_S3_BUCKET,
-            Key=_archive_key(user_id, skill_name, version),
-            Body=content,
-        )
-        return
-    path = _archive_path(user_id, skill_name, version)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_bytes(content)
+def _get_s3_client():
+    options = _s3_client_settings()
+    with _s3_clients_lock:
+        client = _s3_clients.get(options)
+        if client is None:
+            _s3_clients.clear()
+            client = _create_s3_client(options)
+            _s3_clients[options] = client
+        return client
 
 
-async def load_archive(user_id: str, skill_name: str, version: str) -> bytes | None:
-    backend = (settings.SKILL_ARCHIVE_BACKEND or "local").lower()
-    if backend == "s3":
+def reset_s3_client() -> None:
+    with _s3_clients_lock:
+        _s3_clients.clear()
+
+
+def _measure_source(source: BinaryIO) -> tuple[int, str]:
+    source.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(_chunk_size())
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    source.seek(0)
+    return size, digest.hexdigest()
+
+
+def _read_at(source: BinaryIO, offset: int, length: int) -> bytes:
+    source.seek(offset)
+    return source.read(length)
+
+
+def _is_missing_object(exc: Exception) -> bool:
+    response = getattr(exc, "response", None)
+    if not isinstance(response, dict):
+        return False
+    code = str(response.get("Error", {}).get("Code", ""))
+    return code in {"404", "NoSuchKey", "NotFound"}
+
+
+class S3ArchiveBackend:
+    name = "s3"
+
+    @property
+    def bucket(self) -> str:
+        return settings.SKILL_ARCHIVE_S3_BUCKET
+
+    async def save(self, key: str, source: BinaryIO) -> None:
+        size, digest = await run_io(_measure_source, source)
+        metadata = {"sha256": digest}
         client = _get_s3_client()
+        if size <= max(0, int(settings.SKILL_ARCHIVE_S3_MULTIPART_THRESHOLD_BYTES)):
+            body = await run_io(source.read)
+            await run_io(client.put_object, Bucket=self.bucket, Key=key, Body=body, Metadata=metadata)
+            return
+        await self._multipart_upload(client, key, source, size, metadata)
+
+    async def _multipart_upload(self, client, key: str, source: BinaryIO, size: int, metadata: dict) -> None:
+        part_size = max(1, int(settings.SKILL_ARCHIVE_S3_MULTIPART_PART_BYTES))
+        part_count = max(1, -(-size // part_size))
+        upload = await run_io(client.create_multipart_upload, Bucket=self.bucket, Key=key, Metadata=metadata)
+        upload_id = upload["UploadId"]
+        semaphore = asyncio.Semaphore(max(1, int(settings.SKILL_ARCHIVE_S3_MULTIPART_CONCURRENCY)))
+        read_lock = asyncio.Lock()
+
+        async def send(number: int) -> dict:
+            async with semaphore:
+                async with read_lock:
+                    body = await run_io(_read_at, source, (number - 1) * part_size, part_size)
+                result = await run_io(
+                    client.upload_part,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=body,
+                )
+                return {"PartNumber": number, "ETag": result["ETag"]}
+
         try:
-            result = client.get_object(
-                Bucket=settings.SKILL_ARCHIVE_S3_BUCKET,
-                Key=_archive_key(user_id, skill_name, version),
+            parts = await asyncio.gather(*(send(number) for number in range(1, part_count + 1)))
+            await run_io(
+                client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": list(parts)},
             )
-        except Exception:
-            if settings.ENABLE_CACHE_OFFLINE_FALLBACK:
-                return _read_local_cache(_local_cache_path(user_id, skill_name, version))
-            return None
+        except BaseException:
+            with contextlib.suppress(Exception):
+                await run_io(client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def load(self, key: str) -> bytes | None:
+        client = _get_s3_client()
+        result = await run_io(client.get_object, Bucket=self.bucket, Key=key)
         body = result.get("Body")
-        payload = body.read() if body else None
-        if payload is not None:
-            _write_local_cache(_local_cache_path(user_id, skill_name, version), payload)
-        return payload
-    path = _archive_path(user_id, skill_name, version)
-    return _read_plain_archive(path)
+        return await run_io(body.read) if body else None
+
+    async def stat(self, key: str) -> ArchiveObject | None:
+        client = _get_s3_client()
+        try:
+            result = await run_io(client.head_object, Bucket=self.bucket, Key=key)
+        except Exception as exc:
+            if _is_missing_object(exc):
+                return None
+            raise
+        digest = (result.get("Metadata") or {}).get("sha256")
+        return ArchiveObject(
+            size=int(result.get("ContentLength") or 0),
+            checksum=f"sha256:{digest}" if digest else None,
+        )
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        result = _get_s3_client().get_object(
+            Bucket=self.bucket,
+            Key=key,
+            Range=f"bytes={offset}-{offset + length - 1}",
+        )
+        return result["Body"].read()
+
+
+def get_archive_backend() -> ArchiveBackend:
+    backend = (settings.SKILL_ARCHIVE_BACKEND or "local").lower()
+    if backend == "s3":
+        return S3ArchiveBackend()
+    return LocalArchiveBackend(Path(settings.SKILL_STORAGE_PATH) / SKILL_ARCHIVES_DIRNAME)
+
+
+async def save_archive(user_id: str, skill_name: str, version: str, content: ArchiveContent) -> None:
+    backend = get_archive_backend()
+    source = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    if backend.name == "s3":
+        source.seek(0)
+        await run_io(_write_local_cache, _local_cache_path(user_id, skill_name, version), source)
+    source.seek(0)
+    await backend.save(_archive_key(user_id, skill_name, version), source)
+
+
+_archive_loads: SingleFlight[bytes | None] = SingleFlight("archive-load")
+
+
+async def load_archive(user_id: str, skill_name: str, version: str) -> bytes | None:
+    backend = get_archive_backend()
+    return await _archive_loads.do(
+        (backend.name, user_id, skill_name, version),
+        lambda: _load_archive(backend, user_id, skill_name, version),
+    )
+
+
+async def _load_archive(backend: ArchiveBackend, user_id: str, skill_name: str, version: str) -> bytes | None:
+    if backend.name != "s3":
+        return await backend.load(_archive_key(user_id, skill_name, version))
+    cache_path = _local_cache_path(user_id, skill_name, version)
+    try:
+        payload = await backend.load(_archive_key(user_id, skill_name, version))
+    except Exception:
+        if settings.ENABLE_CACHE_OFFLINE_FALLBACK:
+            return await run_io(_read_local_cache, cache_path)
+        return None
+    if payload is not None:
+        await run_io(_write_local_cache, cache_path, payload)
+    return payload
+
+
+def _file_checksum(path: Path, size: int, modified_ns: int) -> str:
+    key = (str(path), size, modified_ns)
+    cached = _checksums.get(key)
+    if cached is not None:
+        _checksums.move_to_end(key)
+        return cached
+    digest = hashlib.sha256()
+    with path.open("rb") as reader:
+        while True:
+            chunk = reader.read(_download_chunk_size())
+            if not chunk:
+                break
+            digest.update(chunk)
+    checksum = f"sha256:{digest.hexdigest()}"
+    while len(_checksums) >= _CHECKSUM_CACHE_MAX_ENTRIES:
+        _checksums.popitem(last=False)
+    _checksums[key] = checksum
+    return checksum
+
+
+def archive_source_from_bytes(payload: bytes) -> ArchiveSource:
+    return ArchiveSource(size=len(payload), checksum=f"sha256:{hashlib.sha256(payload).hexdigest()}", data=payload)
+
+
+async def open_archive_source(user_id: str, skill_name: str, version: str) -> ArchiveSource | None:
+    backend = get_archive_backend()
+    key = _archive_key(user_id, skill_name, version)
+    try:
+        stored = await backend.stat(key)
+    except Exception:
+        stored = None
+    if stored is not None and stored.checksum:
+        if isinstance(backend, LocalArchiveBackend):
+            return ArchiveSource(size=stored.size, checksum=stored.checksum, path=backend.path_for(key))
+        return ArchiveSource(
+            size=stored.size,
+            checksum=stored.checksum,
+            fetch=functools.partial(backend.read_range, key),
+        )
+    if backend.name != "s3":
+        return None
+    payload = await load_archive(user_id, skill_name, version)
+    if payload is None:
+        return None
+    return await run_io(archive_source_from_bytes, payload)
+
+
+def _encrypt_frames(source: ArchiveSource, key: bytes, header: bytes, first: int, last: int) -> bytes:
+    frame_size = _frame_size()
+    total = frame_count(source.size, frame_size)
+    plain = source.read_range(first * frame_size, (last - first + 1) * frame_size)
+    aead = get_aead(key)
+    parts = []
+    for index in range(first, last + 1):
+        start = (index - first) * frame_size
+        parts.append(encrypt_frame(aead, header, index, plain[start : start + frame_size], index == total - 1))
+    return b"".join(parts)
+
+
+async def iter_archive_range(
+    source: ArchiveSource,
+    start: int,
+    end: int,
+    encrypted: bool = False,
+) -> AsyncIterator[bytes]:
+    chunk_size = _download_chunk_size()
+    if not encrypted:
+        position = start
+        while position <= end:
+            length = min(chunk_size, end - position + 1)
+            yield await run_io(source.read_range, position, length)
+            position += length
+        return
+    frame_size = _frame_size()
+    key = derive_key(settings.SECRET_KEY)
+    header = build_stream_header(frame_size, derive_nonce_prefix(key, source.checksum))
+    position = start
+    if position < STREAM_HEADER_SIZE:
+        yield header[position : min(end + 1, STREAM_HEADER_SIZE)]
+        position = STREAM_HEADER_SIZE
+    if position > end:
+        return
+    stride = frame_size + STREAM_TAG_SIZE
+    last_frame = min(frame_count(source.size, frame_size) - 1, (end - STREAM_HEADER_SIZE) // stride)
+    frames_per_chunk = max(1, chunk_size // frame_size)
+    first = (position - STREAM_HEADER_SIZE) // stride
+    while first <= last_frame:
+        last = min(last_frame, first + frames_per_chunk - 1)
+        payload = await run_io(_encrypt_frames, source, key, header, first, last)
+        span_start = frame_offset(first, frame_size)
+        span_end = span_start + len(payload)
+        yield payload[max(position, span_start) - span_start : min(end + 1, span_end) - span_start]
+        first = last + 1
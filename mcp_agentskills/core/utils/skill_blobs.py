@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.skill_storage import (
+    SKILL_BLOBS_DIRNAME,
+    SKILL_EXECUTIONS_DIRNAME,
+    delete_skill_dir,
+    get_skill_versions_dir,
+    hash_file,
+    link_or_copy_file,
+)
+
+SKILL_MANIFESTS_DIRNAME = ".manifests"
+MANIFEST_SCHEMA_VERSION = 1
+_READ_ONLY_MODE = 0o444
+
+
+def get_blobs_dir() -> Path:
+    return Path(settings.SKILL_STORAGE_PATH) / SKILL_BLOBS_DIRNAME
+
+
+def get_blob_path(digest: str) -> Path:
+    return get_blobs_dir() / digest[:2] / digest
+
+
+def get_manifest_path(version_dir: Path) -> Path:
+    return version_dir.parent / SKILL_MANIFESTS_DIRNAME / f"{version_dir.name}.json"
+
+
+def _link_to_blob(path: Path, digest: str) -> None:
+    blob = get_blob_path(digest)
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(path, blob)
+    except FileExistsError:
+        if not os.path.samefile(path, blob):
+            temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                os.link(blob, temp_path)
+                os.replace(temp_path, path)
+            finally:
+                if temp_path.exists():
+                    temp_path.unlink()
+    os.chmod(blob, _READ_ONLY_MODE)
+
+
+def build_manifest(version_dir: Path, digests: dict[str, tuple[str, int]] | None = None) -> dict:
+    digests = dict(digests or {})
+    files: dict[str, dict] = {}
+    for path in sorted(version_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(version_dir).as_posix()
+        digest, size = digests.get(relative) or hash_file(path)
+        files[relative] = {"size": size, "sha256": digest}
+    return {"schema_version": MANIFEST_SCHEMA_VERSION, "version": version_dir.name, "files": files}
+
+
+def intern_version_dir(version_dir: Path, digests: dict[str, tuple[str, int]] | None = None) -> dict:
+    manifest = build_manifest(version_dir, digests)
+    if settings.ENABLE_SKILL_BLOB_STORE:
+        for relative, entry in manifest["files"].items():
+            try:
+                _link_to_blob(version_dir / relative, entry["sha256"])
+            except OSError:
+                continue
+    write_manifest(version_dir, manifest)
+    return manifest
+
+
+def ensure_manifest(version_dir: Path) -> dict:
+    manifest = load_manifest(version_dir)
+    if manifest is not None:
+        return manifest
+    manifest = build_manifest(version_dir)
+    write_manifest(version_dir, manifest)
+    return manifest
+
+
+def write_manifest(version_dir: Path, manifest: dict) -> None:
+    path = get_manifest_path(version_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    temp_path.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def load_manifest(version_dir: Path) -> dict | None:
+    path = get_manifest_path(version_dir)
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("files"), dict):
+        return None
+    return manifest
+
+
+def collect_skill_blob_digests(user_id: str, skill_name: str) -> set[str]:
+    manifests_dir = get_skill_versions_dir(user_id, skill_name) / SKILL_MANIFESTS_DIRNAME
+    digests: set[str] = set()
+    if not manifests_dir.is_dir():
+        return digests
+    for path in manifests_dir.glob("*.json"):
+        manifest = load_manifest(get_skill_versions_dir(user_id, skill_name) / path.stem)
+        if manifest is None:
+            continue
+        for entry in manifest["files"].values():
+            digest = entry.get("sha256") if isinstance(entry, dict) else None
+            if digest:
+                digests.add(str(digest))
+    return digests
+
+
+def release_blobs(digests: set[str]) -> int:
+    removed = 0
+    for digest in digests:
+        blob = get_blob_path(digest)
+        try:
+            if blob.stat().st_nlink <= 1:
+                blob.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def delete_skill_tree(user_id: str, skill_name: str) -> None:
+    digests = collect_skill_blob_digests(user_id, skill_name)
+    versions_dir = get_skill_versions_dir(user_id, skill_name)
+    if versions_dir.is_dir():
+        remove_execution_trees([path for path in versions_dir.iterdir() if path.is_dir()])
+    delete_skill_dir(user_id, skill_name)
+    release_blobs(digests)
+
+
+def get_executions_dir() -> Path:
+    return Path(settings.SKILL_STORAGE_PATH) / SKILL_EXECUTIONS_DIRNAME
+
+
+def get_execution_tree_path(version_dir: Path) -> Path:
+    key = hashlib.sha256(str(version_dir.resolve()).encode("utf-8")).hexdigest()[:32]
+    return get_executions_dir() / key
+
+
+def ensure_execution_tree(version_dir: Path) -> Path:
+    target_dir = get_execution_tree_path(version_dir)
+    if target_dir.is_dir():
+        return target_dir
+    staging_dir = target_dir.with_name(f".{target_dir.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        staging_dir.mkdir(parents=True)
+        for path in sorted(version_dir.rglob("*")):
+            target = staging_dir / path.relative_to(version_dir)
+            if path.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+            elif path.is_file():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                link_or_copy_file(path, target, mode="auto")
+        try:
+            os.rename(staging_dir, target_dir)
+        except OSError:
+            if not target_dir.is_dir():
+                raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return target_dir
+
+
+def remove_execution_trees(version_dirs: list[Path]) -> None:
+    for version_dir in version_dirs:
+        shutil.rmtree(get_execution_tree_path(version_dir), ignore_errors=True)
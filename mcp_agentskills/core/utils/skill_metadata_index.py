@@ -0,0 +1,119 @@
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.single_flight import SingleFlight
+from mcp_agentskills.core.utils.skill_storage import discover_skill_files
+
+MetadataParser = Callable[[str, str], Awaitable[dict[str, str] | None]]
+
+
+@dataclass
+class _IndexedSkill:
+    signature: tuple[int, int, int] | None = None
+    metadata: dict[str, str] | None = None
+
+
+@dataclass
+class _SkillIndex:
+    dir_mtimes: dict[str, int] = field(default_factory=dict)
+    skills: dict[str, _IndexedSkill] = field(default_factory=dict)
+    dirty: bool = True
+    validated_at: float = 0.0
+
+
+_indexes: dict[str, _SkillIndex] = {}
+_revalidations: SingleFlight[None] = SingleFlight("skill-metadata-index")
+
+
+def _signature(stat: os.stat_result) -> tuple[int, int, int]:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _dir_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _dirs_changed(index: _SkillIndex) -> bool:
+    for path, mtime in index.dir_mtimes.items():
+        if _dir_mtime(path) != mtime:
+            return True
+    return False
+
+
+def _discover(index: _SkillIndex, search_dir: Path) -> None:
+    skill_files, scanned_dirs = discover_skill_files(search_dir)
+    found = {str(path) for path in skill_files}
+    for path in list(index.skills):
+        if path not in found:
+            index.skills.pop(path, None)
+    for path in found:
+        index.skills.setdefault(path, _IndexedSkill())
+    index.dir_mtimes = {}
+    for directory in scanned_dirs:
+        mtime = _dir_mtime(str(directory))
+        if mtime is not None:
+            index.dir_mtimes[str(directory)] = mtime
+    if str(search_dir) not in index.dir_mtimes:
+        index.dir_mtimes[str(search_dir)] = _dir_mtime(str(search_dir)) or 0
+    index.dirty = False
+
+
+async def _refresh_entry(path: str, entry: _IndexedSkill, parser: MetadataParser) -> bool:
+    try:
+        signature = _signature(os.stat(path))
+    except OSError:
+        return False
+    if entry.signature == signature:
+        return True
+    content = Path(path).read_text(encoding="utf-8")
+    entry.metadata = await parser(content, path)
+    entry.signature = signature
+    return True
+
+
+async def _revalidate(index: _SkillIndex, search_dir: Path, parser: MetadataParser) -> None:
+    now = time.monotonic()
+    if index.dirty or _dirs_changed(index):
+        _discover(index, search_dir)
+    for path in sorted(index.skills):
+        entry = index.skills.get(path)
+        if entry is None:
+            continue
+        if not await _refresh_entry(path, entry, parser):
+            index.skills.pop(path, None)
+    index.validated_at = now
+
+
+async def load_skill_metadata_entries(search_dir: Path, parser: MetadataParser) -> list[tuple[Path, dict[str, str]]]:
+    key = str(search_dir)
+    index = _indexes.get(key)
+    if index is None:
+        index = _SkillIndex()
+        _indexes[key] = index
+    ttl_seconds = max(0, int(settings.SKILL_METADATA_INDEX_TTL_SECONDS))
+    if index.dirty or time.monotonic() - index.validated_at >= ttl_seconds:
+        await _revalidations.do(key, lambda: _revalidate(index, search_dir, parser))
+    return [(Path(path), entry.metadata) for path, entry in sorted(index.skills.items()) if entry.metadata]
+
+
+def invalidate_skill_metadata(user_id: str | None = None) -> None:
+    if not user_id:
+        for index in _indexes.values():
+            index.dirty = True
+        return
+    target = (Path(settings.SKILL_STORAGE_PATH) / user_id).resolve()
+    for key, index in _indexes.items():
+        root = Path(key)
+        if target == root or target.is_relative_to(root) or root.is_relative_to(target):
+            index.dirty = True
+
+
+def reset_skill_metadata_index() -> None:
+    _indexes.clear()
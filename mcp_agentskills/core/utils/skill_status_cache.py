@@ -0,0 +1,63 @@
+import time
+
+from mcp_agentskills.config.settings import settings
+
+_entries: dict[tuple[str, str], tuple[bool | None, float]] = {}
+
+
+def get_cached_skill_status(user_id: str, skill_name: str) -> tuple[bool, bool | None]:
+    key = (user_id, skill_name)
+    cached = _entries.get(key)
+    if cached is None:
+        return False, None
+    status, expires_at = cached
+    if expires_at <= time.monotonic():
+        _entries.pop(key, None)
+        return False, None
+    return True, status
+
+
+def set_cached_skill_status(user_id: str, skill_name: str, status: bool | None) -> None:
+    ttl_seconds = settings.SKILL_STATUS_CACHE_TTL_SECONDS
+    if status is None:
+        ttl_seconds = settings.SKILL_STATUS_NEGATIVE_CACHE_TTL_SECONDS
+    if ttl_seconds <= 0:
+        return
+    max_entries = max(1, int(settings.SKILL_STATUS_CACHE_MAX_ENTRIES))
+    key = (user_id, skill_name)
+    _entries.pop(key, None)
+    while len(_entries) >= max_entries:
+        _entries.pop(next(iter(_entries)))
+    _entries[key] = (status, time.monotonic() + ttl_seconds)
+
+
+def invalidate_skill_status(user_id: str, skill_name: str | None = None) -> None:
+    if skill_name is not None:
+        _entries.pop((user_id, skill_name), None)
+        return
+    for key in [key for key in _entries if key[0] == user_id]:
+        _entries.pop(key, None)
+
+
+def reset_skill_status_cache() -> None:
+    _entries.clear()
+
+
+async def is_skill_active(skill_name: str, user_id: str | None) -> bool:
+    if not user_id:
+        return True
+    hit, status = get_cached_skill_status(user_id, skill_name)
+    if hit:
+        return status is not False
+    try:
+        from mcp_agentskills.db.session import get_async_session
+        from mcp_agentskills.repositories.skill import SkillRepository
+    except Exception:
+        return True
+    async for session in get_async_session():
+        repo = SkillRepository(session)
+        record = await repo.get_by_name(user_id, skill_name)
+        status = bool(record.is_active) if record else None
+        set_cached_skill_status(user_id, skill_name, status)
+        return status is not False
+    return True
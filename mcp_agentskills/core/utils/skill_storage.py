@@ -1,9 +1,20 @@
+import ctypes
+import hashlib
+import io
 import json
+import os
 import re
+import shutil
+import uuid
+import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 
 from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.workdir_usage import (
+    invalidate_workdir_usage,
+    record_workdir_write,
+)
 
 ALLOWED_EXTENSIONS = {".md", ".py", ".js", ".sh", ".txt", ".json", ".yaml", ".yml"}
 SAFE_FILENAME_PATTERN = re.compile(r"^[a-zA-Z0-9_\-\.]+$")
@@ -11,6 +22,26 @@ MAX_FILE_SIZE = 10 * 1024 * 1024
 MAX_TOTAL_SIZE = 100 * 1024 * 1024
 MAX_FILES_PER_SKILL = 50
 SKILL_VERSIONS_DIRNAME = "_versions"
+SKILL_ARCHIVES_DIRNAME = "_archives"
+SKILL_LOCAL_CACHE_DIRNAME = "_local_cache"
+SKILL_BLOBS_DIRNAME = "_blobs"
+SKILL_DEPENDENCY_ENVS_DIRNAME = "_envs"
+SKILL_EXECUTIONS_DIRNAME = "_exec"
+RESERVED_STORAGE_DIRNAMES = {
+    SKILL_VERSIONS_DIRNAME,
+    SKILL_ARCHIVES_DIRNAME,
+    SKILL_LOCAL_CACHE_DIRNAME,
+    SKILL_BLOBS_DIRNAME,
+    SKILL_DEPENDENCY_ENVS_DIRNAME,
+    SKILL_EXECUTIONS_DIRNAME,
+}
+SKILL_MD_FILENAME = "SKILL.md"
+SKILL_PUBLISH_STAGING_PREFIX = ".publish-"
+SKILL_VERSION_STORE_PREFIX = ".versions-"
+_FICLONE = 0x40049409
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+_HASH_CHUNK_BYTES = 1024 * 1024
 
 
 def validate_skill_name(skill_name: str) -> tuple[bool, str]:
@@ -53,6 +84,7 @@ def clear_skill_current_dir(user_id: str, skill_name: str) -> None:
     path = get_user_skill_dir(user_id, skill_name)
     if not path.exists():
         return
+    invalidate_workdir_usage(path)
     versions_dir = path / SKILL_VERSIONS_DIRNAME
     for child in list(path.iterdir()):
         if child == versions_dir:
@@ -69,6 +101,39 @@ def clear_skill_current_dir(user_id: str, skill_name: str) -> None:
         child.rmdir()
 
 
+def discover_skill_files(search_dir: Path, max_depth: int | None = None) -> tuple[list[Path], list[Path]]:
+    depth_limit = settings.SKILL_DISCOVERY_MAX_DEPTH if max_depth is None else max_depth
+    skill_files: list[Path] = []
+    scanned_dirs: list[Path] = []
+    pending: list[tuple[Path, int]] = [(search_dir, 0)]
+    while pending:
+        current, depth = pending.pop()
+        try:
+            with os.scandir(current) as iterator:
+                entries = list(iterator)
+        except OSError:
+            continue
+        marker = next(
+            (entry for entry in entries if entry.name == SKILL_MD_FILENAME and entry.is_file()),
+            None,
+        )
+        if marker is not None and current != search_dir:
+            skill_files.append(Path(marker.path))
+            continue
+        scanned_dirs.append(current)
+        if marker is not None:
+            skill_files.append(Path(marker.path))
+        if depth >= depth_limit:
+            continue
+        for entry in entries:
+            if entry.name in RESERVED_STORAGE_DIRNAMES or entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                pending.append((Path(entry.path), depth + 1))
+    skill_files.sort()
+    return skill_files, scanned_dirs
+
+
 def create_skill_dir(user_id: str, skill_name: str) -> Path:
     path = get_user_skill_dir(user_id, skill_name)
     path.mkdir(parents=True, exist_ok=True)
@@ -79,6 +144,11 @@ def delete_skill_dir(user_id: str, skill_name: str) -> None:
     path = get_user_skill_dir(user_id, skill_name)
     if not path.exists():
         return
+    invalidate_workdir_usage(path)
+    versions_link = path / SKILL_VERSIONS_DIRNAME
+    if versions_link.is_symlink():
+        shutil.rmtree(versions_link.resolve(), ignore_errors=True)
+        versions_link.unlink()
     for child in path.rglob("*"):
         if child.is_file():
             child.unlink()
@@ -88,10 +158,216 @@ def delete_skill_dir(user_id: str, skill_name: str) -> None:
     path.rmdir()
 
 
+def rename_skill_dir(user_id: str, old_name: str, new_name: str) -> Path:
+    old_dir = get_user_skill_dir(user_id, old_name)
+    new_dir = get_user_skill_dir(user_id, new_name)
+    if old_dir.exists():
+        new_dir.parent.mkdir(parents=True, exist_ok=True)
+        old_dir.rename(new_dir)
+    else:
+        new_dir.mkdir(parents=True, exist_ok=True)
+    invalidate_workdir_usage(old_dir)
+    invalidate_workdir_usage(new_dir)
+    return new_dir
+
+
+def _reflink_file(source: Path, target: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with source.open("rb") as reader, target.open("wb") as writer:
+            fcntl.ioctl(writer.fileno(), _FICLONE, reader.fileno())
+    except OSError:
+        if target.exists():
+            target.unlink()
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def _ensure_writable(path: Path) -> None:
+    mode = path.stat().st_mode
+    if not mode & 0o200:
+        os.chmod(path, mode | 0o200)
+
+
+def link_or_copy_file(source: Path, target: Path, mode: str | None = None) -> str:
+    mode = (mode or settings.SKILL_PUBLISH_MODE or "auto").strip().lower()
+    if mode == "hardlink" and settings.ENABLE_SKILL_BLOB_STORE:
+        mode = "auto"
+    if mode != "copy" and _reflink_file(source, target):
+        _ensure_writable(target)
+        return "reflink"
+    if mode == "hardlink":
+        try:
+            os.link(source, target)
+            return "hardlink"
+        except OSError:
+            pass
+    shutil.copy2(source, target)
+    _ensure_writable(target)
+    return "copy"
+
+
+def hash_file(path: Path) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as reader:
+        while True:
+            chunk = reader.read(_HASH_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _is_same_content(source: Path, target: Path, digest: str | None = None) -> bool:
+    try:
+        source_stat = source.stat()
+        target_stat = os.lstat(target)
+    except OSError:
+        return False
+    if (source_stat.st_dev, source_stat.st_ino) == (target_stat.st_dev, target_stat.st_ino):
+        return True
+    if target_stat.st_mode & 0o170000 != 0o100000 or source_stat.st_size != target_stat.st_size:
+        return False
+    try:
+        if digest is None:
+            digest = hash_file(source)[0]
+        return hash_file(target)[0] == digest
+    except OSError:
+        return False
+
+
+def _exchange_dirs(first: Path, second: Path) -> bool:
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False
+    result = renameat2(_AT_FDCWD, os.fsencode(first), _AT_FDCWD, os.fsencode(second), _RENAME_EXCHANGE)
+    return result == 0
+
+
+def _swap_dirs(staging_dir: Path, root_dir: Path) -> None:
+    if _exchange_dirs(staging_dir, root_dir):
+        return
+    backup_dir = staging_dir.with_name(f"{staging_dir.name}.old")
+    os.rename(root_dir, backup_dir)
+    os.rename(staging_dir, root_dir)
+    os.rename(backup_dir, staging_dir)
+
+
+def _ensure_versions_link(root_dir: Path) -> Path:
+    link = root_dir / SKILL_VERSIONS_DIRNAME
+    if link.is_symlink():
+        return link
+    store = root_dir.parent / f"{SKILL_VERSION_STORE_PREFIX}{uuid.uuid4().hex}"
+    if link.is_dir():
+        os.rename(link, store)
+    else:
+        store.mkdir(parents=True)
+    os.symlink(os.path.relpath(store, root_dir), link)
+    return link
+
+
+def _link_published(current: Path, target: Path) -> bool:
+    try:
+        os.link(current, target)
+    except OSError:
+        return False
+    return True
+
+
+def publish_version_files(
+    user_id: str,
+    skill_name: str,
+    version_dir: Path,
+    digests: dict[str, str] | None = None,
+) -> dict[str, int]:
+    digests = digests or {}
+    root_dir = get_user_skill_dir(user_id, skill_name)
+    root_dir.mkdir(parents=True, exist_ok=True)
+    versions_link = _ensure_versions_link(root_dir)
+    version_dir = version_dir.resolve()
+    staging_dir = root_dir.parent / f"{SKILL_PUBLISH_STAGING_PREFIX}{skill_name}-{uuid.uuid4().hex}"
+    counts = {"reflink": 0, "hardlink": 0, "copy": 0, "unchanged": 0}
+    try:
+        staging_dir.mkdir()
+        for file_path in sorted(version_dir.rglob("*")):
+            if not file_path.is_file():
+                continue
+            relative = file_path.relative_to(version_dir)
+            target = staging_dir / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            current = root_dir / relative
+            if _is_same_content(file_path, current, digests.get(relative.as_posix())) and _link_published(
+                current, target
+            ):
+                counts["unchanged"] += 1
+                continue
+            counts[link_or_copy_file(file_path, target)] += 1
+        os.symlink(os.readlink(versions_link), staging_dir / SKILL_VERSIONS_DIRNAME)
+        _swap_dirs(staging_dir, root_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        invalidate_workdir_usage(root_dir)
+    return counts
+
+
+def build_zip_archive(source_dir: Path) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for file_path in source_dir.rglob("*"):
+            if not file_path.is_file():
+                continue
+            archive.write(file_path, arcname=file_path.relative_to(source_dir).as_posix())
+    return buffer.getvalue()
+
+
+def total_files_size(base_dir: Path, relative_paths: list[str]) -> int:
+    total_size = 0
+    for rel_path in relative_paths:
+        file_path = base_dir / rel_path
+        if file_path.is_file():
+            total_size += file_path.stat().st_size
+    return total_size
+
+
+def read_text_file(path: Path) -> str:
+    if not path.exists() or not path.is_file():
+        raise ValueError("File not found")
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def write_file_bytes(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        temp_path.write_bytes(content)
+        previous = _file_size(path)
+        os.replace(temp_path, path)
+        record_workdir_write(path, len(content) - previous)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
 def save_file(user_id: str, skill_name: str, filename: str, content: bytes) -> Path:
     path = create_skill_dir(user_id, skill_name)
     file_path = path / filename
+    previous = _file_size(file_path)
     file_path.write_bytes(content)
+    record_workdir_write(file_path, len(content) - previous)
     return file_path
 
 
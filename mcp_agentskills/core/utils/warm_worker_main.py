@@ -0,0 +1,231 @@
+import ast
+import contextlib
+import importlib.util
+import json
+import os
+import runpy
+import selectors
+import signal
+import sys
+import traceback
+from collections.abc import Iterator
+
+OUTPUT_LIMIT_EXIT_CODE = 86
+_READ_CHUNK_BYTES = 65536
+
+
+class _Capture:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+        self.head_limit = self.max_bytes // 2
+        self.tail_limit = self.max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        if self.max_bytes <= 0:
+            self.head.extend(chunk)
+            return
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head.extend(chunk[:room])
+            chunk = chunk[room:]
+        if not chunk or self.tail_limit <= 0:
+            return
+        self.tail.extend(chunk)
+        overflow = len(self.tail) - self.tail_limit
+        if overflow > 0:
+            del self.tail[:overflow]
+
+    def getvalue(self) -> str:
+        dropped = self.total - len(self.head) - len(self.tail)
+        data = bytes(self.head)
+        if dropped > 0:
+            data += f"\n... [{dropped} bytes truncated] ...\n".encode()
+        return (data + bytes(self.tail)).decode("utf-8", errors="replace")
+
+
+def _is_local(name: str, root: str) -> bool:
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return True
+    if spec is None:
+        return True
+    locations = list(spec.submodule_search_locations or [])
+    if spec.origin:
+        locations.append(spec.origin)
+    return any(os.path.abspath(location).startswith(root + os.sep) for location in locations)
+
+
+def _preload(entry: str, root: str) -> None:
+    try:
+        with open(entry, encoding="utf-8") as handle:
+            tree = ast.parse(handle.read())
+    except (OSError, SyntaxError, ValueError):
+        return
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            if _is_local(name.partition(".")[0], root):
+                continue
+            try:
+                __import__(name)
+            except ImportError as exc:
+                print(f"warm worker: not preloading {name}: {exc}", file=sys.stderr)
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _run(request: dict, entry: str) -> int:
+    os.environ["SKILL_PARAMS"] = request.get("params", "")
+    sys.argv = [entry]
+    try:
+        runpy.run_path(entry, run_name="__main__")
+    except SystemExit as exc:
+        return _exit_code(exc)
+    except BaseException:
+        traceback.print_exc()
+        raise
+    return 0
+
+
+@contextlib.contextmanager
+def _redirect_child(stdout_fd: int, stderr_fd: int) -> Iterator[None]:
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(stdout_fd, 1)
+    os.dup2(stderr_fd, 2)
+    os.close(stdout_fd)
+    os.close(stderr_fd)
+    with (
+        open(0, closefd=False) as stdin,
+        open(1, "w", encoding="utf-8", errors="replace", closefd=False) as stdout,
+        open(2, "w", encoding="utf-8", errors="replace", closefd=False) as stderr,
+    ):
+        sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+        yield
+
+
+def _flush_streams() -> None:
+    for stream in (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__):
+        if stream is not None:
+            with contextlib.suppress(Exception):
+                stream.flush()
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _collect(
+    pid: int,
+    streams: dict[int, _Capture],
+    status_fd: int,
+    hard_cap_bytes: int,
+) -> tuple[bytes, bool]:
+    status = bytearray()
+    limited = False
+    with selectors.DefaultSelector() as selector:
+        for fd in (*streams, status_fd):
+            selector.register(fd, selectors.EVENT_READ)
+        while selector.get_map() and not limited:
+            for key, _ in selector.select():
+                fd = key.fd
+                chunk = os.read(fd, _READ_CHUNK_BYTES)
+                if not chunk:
+                    selector.unregister(fd)
+                elif fd == status_fd:
+                    status.extend(chunk)
+                else:
+                    streams[fd].feed(chunk)
+            total = sum(capture.total for capture in streams.values())
+            if hard_cap_bytes > 0 and total > hard_cap_bytes:
+                limited = True
+                with contextlib.suppress(ProcessLookupError):
+                    os.kill(pid, signal.SIGKILL)
+    return bytes(status), limited
+
+
+def _serve(request: dict, entry: str, channel_fd: int) -> bytes:
+    max_bytes = int(request.get("max_bytes", 0))
+    hard_cap_bytes = int(request.get("hard_cap_bytes", 0))
+    stdout_r, stdout_w = os.pipe()
+    stderr_r, stderr_w = os.pipe()
+    status_r, status_w = os.pipe()
+    _flush_streams()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            for fd in (stdout_r, stderr_r, status_r, channel_fd):
+                os.close(fd)
+            with _redirect_child(stdout_w, stderr_w):
+                returncode = _run(request, entry)
+            _flush_streams()
+            _write_all(status_w, str(returncode).encode())
+        finally:
+            os._exit(1)
+    for fd in (stdout_w, stderr_w, status_w):
+        os.close(fd)
+    stdout = _Capture(max_bytes)
+    stderr = _Capture(max_bytes)
+    try:
+        status, limited = _collect(pid, {stdout_r: stdout, stderr_r: stderr}, status_r, hard_cap_bytes)
+    finally:
+        for fd in (stdout_r, stderr_r, status_r):
+            os.close(fd)
+    _, wait_status = os.waitpid(pid, 0)
+    if limited:
+        returncode = OUTPUT_LIMIT_EXIT_CODE
+    elif status:
+        returncode = int(status)
+    else:
+        returncode = os.waitstatus_to_exitcode(wait_status)
+    result = {
+        "returncode": returncode,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "output_limited": limited,
+    }
+    return json.dumps(result).encode("utf-8")
+
+
+def main() -> None:
+    entry = sys.argv[1]
+    channel_fd = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    with open(1, "w", closefd=False) as stdout:
+        sys.stdout = stdout
+        root = os.path.abspath(os.getcwd())
+        sys.path.insert(0, root)
+        _preload(entry, root)
+        _write_all(channel_fd, b'{"ready": true}\n')
+        for line in sys.stdin.buffer:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            _write_all(channel_fd, _serve(request, entry, channel_fd) + b"\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import signal
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.periodic_task import PeriodicTask
+from mcp_agentskills.core.utils.skill_blobs import ensure_execution_tree
+
+_WORKER_SCRIPT = Path(__file__).with_name("warm_worker_main.py")
+_STREAM_LIMIT = 1 << 30
+
+WorkerKey = tuple[str, str, str]
+
+
+@dataclass
+class _Worker:
+    key: WorkerKey
+    proc: asyncio.subprocess.Process
+    version_dir: str
+    entrypoint: str
+    generation: int
+    workdir: str
+    runs: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+@dataclass(frozen=True)
+class WarmResult:
+    stdout: bytes
+    stderr: bytes
+    returncode: int
+    timed_out: bool = False
+    output_limited: bool = False
+
+
+_idle: OrderedDict[WorkerKey, list[_Worker]] = OrderedDict()
+_generations: dict[str, int] = {}
+_state: dict = {"loop": None, "busy": 0}
+_stats: dict[str, int] = {
+    "spawned": 0,
+    "reused": 0,
+    "runs": 0,
+    "recycled": 0,
+    "evicted": 0,
+    "expired": 0,
+    "invalidated": 0,
+    "timeouts": 0,
+    "failures": 0,
+}
+
+
+def is_warm_workers_enabled() -> bool:
+    return bool(settings.ENABLE_WARM_WORKERS) and hasattr(os, "fork")
+
+
+def _max_workers() -> int:
+    return max(0, int(settings.SKILL_WARM_WORKERS_MAX))
+
+
+def _idle_count() -> int:
+    return sum(len(workers) for workers in _idle.values())
+
+
+def _kill(worker: _Worker) -> None:
+    if worker.proc.returncode is None:
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.killpg(worker.proc.pid, signal.SIGKILL)
+
+
+def _discard(worker: _Worker, reason: str) -> None:
+    _kill(worker)
+    _stats[reason] += 1
+
+
+def _take_all() -> list[_Worker]:
+    workers = [worker for bucket in _idle.values() for worker in bucket]
+    _idle.clear()
+    return workers
+
+
+def _check_loop() -> None:
+    loop = asyncio.get_running_loop()
+    if _state["loop"] is not loop:
+        for worker in _take_all():
+            _kill(worker)
+        _state["loop"] = loop
+        _state["busy"] = 0
+
+
+def _resolve_entrypoint(version_dir: Path, entrypoint: str) -> tuple[str, str] | None:
+    base = version_dir.resolve()
+    target = (base / entrypoint).resolve()
+    if not target.is_relative_to(base) or not target.is_file():
+        return None
+    return str(base), str(target)
+
+
+def _python_executable(env: dict[str, str]) -> str:
+    return shutil.which("python", path=env.get("PATH")) or sys.executable
+
+
+async def _spawn(key: WorkerKey, version_dir: str, entrypoint: str, env: dict[str, str]) -> _Worker | None:
+    worker_env = {name: value for name, value in env.items() if name != "SKILL_PARAMS"}
+    workdir = version_dir
+    if settings.ENABLE_SKILL_BLOB_STORE:
+        workdir = str(await run_io(ensure_execution_tree, Path(version_dir)))
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            _python_executable(env),
+            "-u",
+            str(_WORKER_SCRIPT),
+            str(Path(workdir) / Path(entrypoint).relative_to(version_dir)),
+            cwd=workdir,
+            env=worker_env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+            limit=_STREAM_LIMIT,
+        )
+    except OSError as exc:
+        logger.warning(f"Failed to start warm worker for {key}: {exc}")
+        _stats["failures"] += 1
+        return None
+    worker = _Worker(
+        key=key,
+        proc=proc,
+        version_dir=version_dir,
+        entrypoint=entrypoint,
+        generation=_generations.get(key[0], 0),
+        workdir=workdir,
+    )
+    startup_timeout = max(1.0, float(settings.SKILL_WARM_WORKER_STARTUP_TIMEOUT_SECONDS))
+    assert proc.stdout is not None
+    try:
+        line = await asyncio.wait_for(proc.stdout.readline(), timeout=startup_timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Warm worker for {key} did not become ready in {startup_timeout}s")
+        _discard(worker, "failures")
+        return None
+    except BaseException:
+        _kill(worker)
+        raise
+    if not line.strip():
+        _discard(worker, "failures")
+        return None
+    _stats["spawned"] += 1
+    return worker
+
+
+def _checkout(key: WorkerKey, version_dir: str, entrypoint: str) -> _Worker | None:
+    bucket = _idle.get(key)
+    while bucket:
+        worker = bucket.pop()
+        if not bucket:
+            _idle.pop(key, None)
+        if (
+            worker.proc.returncode is None
+            and worker.version_dir == version_dir
+            and worker.entrypoint == entrypoint
+            and worker.generation == _generations.get(key[0], 0)
+        ):
+            _stats["reused"] += 1
+            return worker
+        _discard(worker, "invalidated")
+        bucket = _idle.get(key)
+    return None
+
+
+def _checkin(worker: _Worker) -> None:
+    max_runs = int(settings.SKILL_WARM_WORKER_MAX_RUNS)
+    if max_runs > 0 and worker.runs >= max_runs:
+        _discard(worker, "recycled")
+        return
+    if worker.generation != _generations.get(worker.key[0], 0):
+        _discard(worker, "invalidated")
+        return
+    worker.last_used = time.monotonic()
+    _idle.setdefault(worker.key, []).append(worker)
+    _idle.move_to_end(worker.key)
+    while _idle and _idle_count() + _state["busy"] > _max_workers():
+        oldest_key = next(iter(_idle))
+        bucket = _idle[oldest_key]
+        _discard(bucket.pop(0), "evicted")
+        if not bucket:
+            _idle.pop(oldest_key, None)
+
+
+async def run_warm_entrypoint(
+    skill_id: str,
+    version: str,
+    version_dir: Path,
+    entrypoint: str,
+    params: str,
+    env: dict[str, str],
+    timeout_seconds: float,
+    dependency_env: str = "",
+) -> WarmResult | None:
+    if not is_warm_workers_enabled() or _max_workers() <= 0:
+        return None
+    resolved = await run_io(_resolve_entrypoint, version_dir, entrypoint)
+    if resolved is None:
+        return None
+    cwd, entry_path = resolved
+    _check_loop()
+    key = (skill_id, version, dependency_env)
+    worker = _checkout(key, cwd, entry_path)
+    if worker is None and _idle_count() + _state["busy"] >= _max_workers():
+        if not _idle:
+            return None
+        oldest_key = next(iter(_idle))
+        bucket = _idle[oldest_key]
+        _discard(bucket.pop(0), "evicted")
+        if not bucket:
+            _idle.pop(oldest_key, None)
+    _state["busy"] += 1
+    if worker is None:
+        try:
+            worker = await _spawn(key, cwd, entry_path, env)
+        finally:
+            if worker is None:
+                _state["busy"] = max(0, _state["busy"] - 1)
+        if worker is None:
+            return None
+    request = {
+        "params": params,
+        "max_bytes": max(0, int(settings.SKILL_MAX_OUTPUT_BYTES)),
+        "hard_cap_bytes": max(0, int(settings.SKILL_OUTPUT_HARD_CAP_BYTES)),
+    }
+    healthy = False
+    stdin, stdout = worker.proc.stdin, worker.proc.stdout
+    assert stdin is not None and stdout is not None
+    try:
+        stdin.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        await stdin.drain()
+        line = await asyncio.wait_for(stdout.readline(), timeout=timeout_seconds)
+        worker.runs += 1
+        _stats["runs"] += 1
+        if not line.strip():
+            _stats["failures"] += 1
+            return WarmResult(stdout=b"", stderr=b"warm worker exited unexpectedly", returncode=1)
+        payload = json.loads(line)
+        healthy = True
+        return WarmResult(
+            stdout=str(payload.get("stdout", "")).encode("utf-8"),
+            stderr=str(payload.get("stderr", "")).encode("utf-8"),
+            returncode=int(payload.get("returncode", 1)),
+            output_limited=bool(payload.get("output_limited", False)),
+        )
+    except asyncio.TimeoutError:
+        _stats["timeouts"] += 1
+        return WarmResult(stdout=b"", stderr=b"", returncode=-signal.SIGKILL, timed_out=True)
+    except (OSError, ValueError) as exc:
+        logger.warning(f"Warm worker for {key} failed: {exc}")
+        _stats["failures"] += 1
+        return WarmResult(stdout=b"", stderr=b"warm worker exited unexpectedly", returncode=1)
+    finally:
+        _state["busy"] = max(0, _state["busy"] - 1)
+        if healthy:
+            _checkin(worker)
+        else:
+            _kill(worker)
+
+
+def close_warm_workers(skill_id: str | None = None) -> int:
+    if skill_id is None:
+        for name in list(_generations):
+            _generations[name] += 1
+        workers = _take_all()
+    else:
+        _generations[skill_id] = _generations.get(skill_id, 0) + 1
+        workers = []
+        for key in [key for key in _idle if key[0] == skill_id]:
+            workers.extend(_idle.pop(key))
+    for worker in workers:
+        _discard(worker, "invalidated")
+    return len(workers)
+
+
+def expire_idle_warm_workers(max_idle_seconds: float) -> int:
+    now = time.monotonic()
+    expired = 0
+    for key in list(_idle):
+        bucket = _idle[key]
+        keep = []
+        for worker in bucket:
+            if now - worker.last_used >= max_idle_seconds or worker.proc.returncode is not None:
+                _discard(worker, "expired")
+                expired += 1
+            else:
+                keep.append(worker)
+        if keep:
+            _idle[key] = keep
+        else:
+            _idle.pop(key, None)
+    return expired
+
+
+async def _janitor_tick() -> None:
+    expire_idle_warm_workers(float(settings.SKILL_WARM_WORKER_IDLE_SECONDS))
+
+
+_janitor = PeriodicTask("warm-worker-janitor", _janitor_tick)
+
+
+def start_warm_worker_janitor() -> None:
+    idle_seconds = int(settings.SKILL_WARM_WORKER_IDLE_SECONDS)
+    if not is_warm_workers_enabled() or idle_seconds <= 0:
+        return
+    _janitor.start(max(1, idle_seconds // 2))
+
+
+async def stop_warm_worker_janitor() -> None:
+    await _janitor.stop(final_run=False)
+    close_warm_workers()
+
+
+def get_warm_worker_stats() -> dict:
+    stats: dict = dict(_stats)
+    stats["enabled"] = is_warm_workers_enabled()
+    stats["idle"] = _idle_count()
+    stats["busy"] = _state["busy"]
+    stats["keys"] = len(_idle)
+    stats["max_workers"] = _max_workers()
+    return stats
+
+
+def reset_warm_workers() -> None:
+    for worker in _take_all():
+        _kill(worker)
+    _generations.clear()
+    _state["busy"] = 0
+    for name in _stats:
+        _stats[name] = 0
@@ -0,0 +1,247 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.periodic_task import PeriodicTask
+
+DirSnapshot = tuple[int, int, tuple[str, ...]]
+
+
+@dataclass
+class _Usage:
+    total: int = 0
+    dirs: dict[str, DirSnapshot] = field(default_factory=dict)
+    dirty: set[str] = field(default_factory=set)
+    stale: bool = False
+    generation: int = 0
+    reconciled_at: float = field(default_factory=time.monotonic)
+
+
+_lock = threading.Lock()
+_usage: OrderedDict[str, _Usage] = OrderedDict()
+_refreshes: dict[str, asyncio.Task] = {}
+_refresh_again: set[str] = set()
+_stats: dict[str, int] = {
+    "hits": 0,
+    "full_scans": 0,
+    "delta_scans": 0,
+    "dirs_rescanned": 0,
+    "writes": 0,
+    "reconciled": 0,
+    "drift_bytes": 0,
+}
+
+
+def _key(path: Path | str) -> str:
+    return os.path.abspath(os.fspath(path))
+
+
+def _max_entries() -> int:
+    return max(1, int(settings.SKILL_WORKDIR_USAGE_MAX_ENTRIES))
+
+
+def _scan_dir(path: str) -> DirSnapshot | None:
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        direct = 0
+        children: list[str] = []
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        children.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        direct += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return mtime_ns, direct, tuple(children)
+
+
+def _walk(root: str, previous: dict[str, DirSnapshot], dirty: set[str]) -> tuple[dict[str, DirSnapshot], int]:
+    snapshots: dict[str, DirSnapshot] = {}
+    rescanned = 0
+    pending = [root]
+    while pending:
+        current = pending.pop()
+        known = previous.get(current)
+        snapshot = None
+        if known is not None and current not in dirty:
+            try:
+                if os.stat(current).st_mtime_ns == known[0]:
+                    snapshot = known
+            except OSError:
+                continue
+        if snapshot is None:
+            snapshot = _scan_dir(current)
+            rescanned += 1
+            if snapshot is None:
+                continue
+        snapshots[current] = snapshot
+        pending.extend(snapshot[2])
+    return snapshots, rescanned
+
+
+def _store(key: str, usage: _Usage) -> None:
+    _usage[key] = usage
+    _usage.move_to_end(key)
+    while len(_usage) > _max_entries():
+        _usage.popitem(last=False)
+
+
+def _rescan(key: str, usage: _Usage | None, full: bool) -> _Usage:
+    with _lock:
+        previous = {} if usage is None or full else usage.dirs
+        dirty = set() if usage is None else set(usage.dirty)
+        generation = 0 if usage is None else usage.generation
+    snapshots, rescanned = _walk(key, previous, dirty)
+    total = sum(snapshot[1] for snapshot in snapshots.values())
+    refreshed = _Usage(total=total, dirs=snapshots)
+    if full and usage is not None:
+        refreshed.reconciled_at = time.monotonic()
+    elif usage is not None:
+        refreshed.reconciled_at = usage.reconciled_at
+    with _lock:
+        _stats["full_scans" if full or usage is None else "delta_scans"] += 1
+        _stats["dirs_rescanned"] += rescanned
+        if full and usage is not None:
+            _stats["reconciled"] += 1
+            _stats["drift_bytes"] += abs(total - usage.total)
+        current = _usage.get(key)
+        if current is not None:
+            refreshed.dirty = current.dirty - dirty
+            refreshed.generation = current.generation
+            refreshed.stale = current.generation != generation
+        _store(key, refreshed)
+    return refreshed
+
+
+def get_workdir_usage(path: Path) -> int:
+    key = _key(path)
+    with _lock:
+        usage = _usage.get(key)
+        if usage is not None and not usage.stale:
+            _usage.move_to_end(key)
+            _stats["hits"] += 1
+            return usage.total
+    return _rescan(key, usage, full=False).total
+
+
+def refresh_workdir_usage(path: Path) -> int:
+    key = _key(path)
+    with _lock:
+        usage = _usage.get(key)
+    return _rescan(key, usage, full=False).total
+
+
+async def _refresh_in_background(key: str) -> None:
+    try:
+        while True:
+            _refresh_again.discard(key)
+            await run_io(refresh_workdir_usage, Path(key))
+            if key not in _refresh_again:
+                return
+    except Exception as exc:
+        logger.warning(f"Failed to refresh workdir usage for {key}: {exc}")
+    finally:
+        if _refreshes.get(key) is asyncio.current_task():
+            _refreshes.pop(key, None)
+
+
+def schedule_workdir_refresh(path: Path) -> None:
+    key = _key(path)
+    loop = asyncio.get_running_loop()
+    task = _refreshes.get(key)
+    if task is not None and not task.done() and task.get_loop() is loop:
+        _refresh_again.add(key)
+        return
+    _refreshes[key] = loop.create_task(_refresh_in_background(key))
+
+
+def _cached_roots(key: str):
+    path = Path(key)
+    for candidate in (path, *path.parents):
+        usage = _usage.get(str(candidate))
+        if usage is not None:
+            yield usage
+
+
+def record_workdir_write(path: Path, delta: int) -> None:
+    key = _key(path)
+    with _lock:
+        _stats["writes"] += 1
+        for usage in _cached_roots(key):
+            usage.total = max(0, usage.total + delta)
+            usage.dirty.add(os.path.dirname(key))
+
+
+def invalidate_workdir_usage(path: Path) -> None:
+    key = _key(path)
+    prefix = key.rstrip(os.sep) + os.sep
+    with _lock:
+        for root, usage in _usage.items():
+            if root.startswith(prefix):
+                usage.dirty.add(root)
+            elif root != key and not prefix.startswith(root.rstrip(os.sep) + os.sep):
+                continue
+            else:
+                usage.dirty.add(key)
+            usage.stale = True
+            usage.generation += 1
+
+
+def reconcile_workdir_usage(max_age_seconds: float = 0) -> int:
+    now = time.monotonic()
+    with _lock:
+        due = [(key, usage) for key, usage in _usage.items() if now - usage.reconciled_at >= max_age_seconds]
+    for key, usage in due:
+        if os.path.isdir(key):
+            _rescan(key, usage, full=True)
+        else:
+            with _lock:
+                _usage.pop(key, None)
+    return len(due)
+
+
+async def _reconcile_tick() -> None:
+    await run_io(reconcile_workdir_usage, float(settings.SKILL_WORKDIR_USAGE_RECONCILE_SECONDS))
+
+
+_reconciler = PeriodicTask("workdir-usage-reconciler", _reconcile_tick)
+
+
+def start_workdir_usage_reconciler() -> None:
+    interval = int(settings.SKILL_WORKDIR_USAGE_RECONCILE_SECONDS)
+    if interval <= 0:
+        return
+    _reconciler.start(interval)
+
+
+async def stop_workdir_usage_reconciler() -> None:
+    await _reconciler.stop(final_run=False)
+
+
+def get_workdir_usage_stats() -> dict[str, int]:
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_usage)
+    stats["max_entries"] = _max_entries()
+    return stats
+
+
+def reset_workdir_usage() -> None:
+    _refreshes.clear()
+    _refresh_again.clear()
+    with _lock:
+        _usage.clear()
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,37 @@
+from typing import Any, cast
+
+import sqlalchemy as sa
+from alembic import op as _op
+
+op = cast(Any, _op)
+
+revision = "k6l7m8n9o0p1"
+down_revision = "j5k6l7m8n9o0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "shared_counters",
+        sa.Column("key", sa.String(length=255), primary_key=True, nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_shared_counters_updated_at", "shared_counters", ["updated_at"], unique=False)
+    op.create_table(
+        "shared_leases",
+        sa.Column("lease_id", sa.String(length=36), primary_key=True, nullable=False),
+        sa.Column("key", sa.String(length=255), primary_key=True, nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_shared_leases_key", "shared_leases", ["key"], unique=False)
+    op.create_index("ix_shared_leases_expires_at", "shared_leases", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shared_leases_expires_at", table_name="shared_leases")
+    op.drop_index("ix_shared_leases_key", table_name="shared_leases")
+    op.drop_table("shared_leases")
+    op.drop_index("ix_shared_counters_updated_at", table_name="shared_counters")
+    op.drop_table("shared_counters")
@@ -3,6 +3,7 @@ from mcp_agentskills.models.base import Base
 from mcp_agentskills.models.email_delivery_log import EmailDeliveryLog
 from mcp_agentskills.models.enterprise import Enterprise
 from mcp_agentskills.models.request_metric import RequestMetric
+from mcp_agentskills.models.shared_counter import SharedCounter, SharedLease
 from mcp_agentskills.models.skill import Skill
 from mcp_agentskills.models.skill_version import SkillVersion
 from mcp_agentskills.models.team import Team
@@ -22,4 +23,6 @@ __all__ = [
     "RequestMetric",
     "VerificationCode",
     "EmailDeliveryLog",
+    "SharedCounter",
+    "SharedLease",
 ]
@@ -0,0 +1,20 @@
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from mcp_agentskills.models.base import Base
+
+
+class SharedCounter(Base):
+    __tablename__ = "shared_counters"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, default=0.0)
+    updated_at: Mapped[float] = mapped_column(Float, index=True)
+
+
+class SharedLease(Base):
+    __tablename__ = "shared_leases"
+
+    lease_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True, index=True)
+    expires_at: Mapped[float] = mapped_column(Float, index=True)
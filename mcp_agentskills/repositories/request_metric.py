@@ -39,6 +39,22 @@ class RequestMetricRepository:
         await self.session.execute(update_stmt)
         await self.session.commit()
 
+    async def upsert_hour_buckets(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        insert_stmt = self._get_insert()(RequestMetric).values(rows)
+        update_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["user_id", "bucket_start"],
+            set_={
+                "total_count": RequestMetric.total_count + insert_stmt.excluded.total_count,
+                "success_count": RequestMetric.success_count + insert_stmt.excluded.success_count,
+                "failure_count": RequestMetric.failure_count + insert_stmt.excluded.failure_count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(update_stmt)
+        await self.session.commit()
+
     async def aggregate_window(self, user_id: str, start: datetime, end: datetime) -> tuple[int, int]:
         result = await self.session.execute(
             select(
@@ -1,8 +1,8 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
 from typing import Any
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import bindparam, func, or_, select, update
 
 from mcp_agentskills.models.token import APIToken
 from mcp_agentskills.repositories.base import BaseRepository
@@ -48,11 +48,21 @@ class TokenRepository(BaseRepository):
         await self.session.refresh(token)
         return token
 
-    async def mark_used(self, token: APIToken) -> APIToken:
-        token.last_used_at = datetime.now(timezone.utc)
+    async def bulk_mark_used(self, usages: dict[str, datetime]) -> None:
+        if not usages:
+            return
+        statement = (
+            update(APIToken)
+            .where(APIToken.id == bindparam("b_id"))
+            .where(or_(APIToken.last_used_at.is_(None), APIToken.last_used_at < bindparam("b_used_at")))
+            .values(last_used_at=bindparam("b_used_at"))
+        )
+        connection = await self.session.connection()
+        await connection.execute(
+            statement,
+            [{"b_id": token_id, "b_used_at": used_at} for token_id, used_at in usages.items()],
+        )
         await self.session.commit()
-        await self.session.refresh(token)
-        return token
 
     async def revoke(self, token: APIToken) -> APIToken:
         token.is_active = False
@@ -13,5 +13,6 @@ class SkillDownloadResponse(BaseModel):
     version: str
     encrypted_code: str
     checksum: str
+    encryption_scheme: str | None = None
     expires_at: datetime
     cache_ttl_seconds: int | None = None
@@ -14,6 +14,10 @@ class SkillInstallInstructionsResponse(BaseModel):
 class SkillVersionDiffFile(BaseModel):
     path: str
     diff: str
+    from_sha256: str | None = None
+    to_sha256: str | None = None
+    from_size: int | None = None
+    to_size: int | None = None
 
 
 class SkillVersionDiffResponse(BaseModel):
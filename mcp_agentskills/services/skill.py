@@ -8,9 +8,9 @@ import os
 from pathlib import Path
 import re
 import shutil
+from typing import BinaryIO
 import zipfile
 
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import yaml
 
 from mcp_agentskills.config.settings import settings
@@ -19,23 +19,56 @@ from mcp_agentskills.core.utils.skill_storage import (
     MAX_FILES_PER_SKILL,
     MAX_FILE_SIZE,
     MAX_TOTAL_SIZE,
-    clear_skill_current_dir,
+    build_zip_archive,
     create_skill_dir,
-    delete_skill_dir,
     get_safe_skill_path,
     get_skill_versions_dir,
     get_user_skill_dir,
     list_files,
+    publish_version_files,
+    read_text_file,
+    rename_skill_dir,
+    total_files_size,
     validate_file_path,
     validate_skill_name,
     validate_filename,
+    write_file_bytes,
 )
-from mcp_agentskills.core.utils.skill_archive import load_archive, save_archive
+from mcp_agentskills.core.utils.archive_crypto import (
+    LEGACY_SCHEME,
+    STREAM_SCHEME,
+    derive_key,
+    encrypt_bytes,
+    get_aead,
+)
+from mcp_agentskills.core.utils.dependency_envs import discard_dependency_envs
+from mcp_agentskills.core.utils.download_artifacts import (
+    DownloadArtifact,
+    get_download_artifact,
+    invalidate_download_artifacts,
+    put_download_artifact,
+)
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.skill_archive import (
+    archive_source_from_bytes,
+    load_archive,
+    open_archive_source,
+    save_archive,
+)
+from mcp_agentskills.core.utils.skill_blobs import delete_skill_tree, ensure_manifest, intern_version_dir
+from mcp_agentskills.core.utils.single_flight import SingleFlight
+from mcp_agentskills.core.utils.skill_metadata_index import invalidate_skill_metadata
+from mcp_agentskills.core.utils.skill_status_cache import invalidate_skill_status
+from mcp_agentskills.core.utils.warm_workers import close_warm_workers
+from mcp_agentskills.core.utils.workdir_usage import record_workdir_write
 from mcp_agentskills.models.skill import Skill
 from mcp_agentskills.models.user import User
 from mcp_agentskills.repositories.skill import SkillRepository
 from mcp_agentskills.repositories.skill_version import SkillVersionRepository
 
+_archive_rebuilds: SingleFlight[bytes] = SingleFlight("archive-rebuild")
+_artifact_builds: SingleFlight[DownloadArtifact] = SingleFlight("download-artifact")
+
 
 class SkillService:
     def __init__(self, skill_repo: SkillRepository, version_repo: SkillVersionRepository | None = None):
@@ -85,7 +118,8 @@ class SkillService:
         visibility_value = (visibility or settings.DEFAULT_SKILL_VISIBILITY or "private").strip().lower()
         if visibility_value not in {"private", "team", "enterprise"}:
             raise ValueError("Invalid visibility")
-        path = create_skill_dir(user.id, name)
+        path = await run_io(create_skill_dir, user.id, name)
+        invalidate_skill_status(user.id, name)
         return await self.skill_repo.create(
             user_id=user.id,
             name=name,
@@ -116,38 +150,46 @@ class SkillService:
             existing = await self.skill_repo.get_by_name(user.id, new_name)
             if existing and existing.id != skill.id:
                 raise ValueError("Skill already exists")
-            old_dir = get_user_skill_dir(user.id, skill.name)
-            new_dir = get_user_skill_dir(user.id, new_name)
-            if old_dir.exists():
-                new_dir.parent.mkdir(parents=True, exist_ok=True)
-                old_dir.rename(new_dir)
-            else:
-                new_dir.mkdir(parents=True, exist_ok=True)
+            new_dir = await run_io(rename_skill_dir, user.id, skill.name, new_name)
             fields["skill_dir"] = str(new_dir)
+            invalidate_skill_metadata(user.id)
+            invalidate_skill_status(user.id, skill.name)
+            invalidate_skill_status(user.id, new_name)
         return await self.skill_repo.update(skill, **fields)
 
     async def deactivate_skill(self, user: User, skill_id: str) -> Skill:
         skill = await self.get_skill(user, skill_id)
         self._ensure_owner(user, skill)
         now = datetime.now(timezone.utc).replace(microsecond=0)
-        return await self.skill_repo.update(skill, is_active=False, cache_revoked_at=now)
+        updated = await self.skill_repo.update(skill, is_active=False, cache_revoked_at=now)
+        invalidate_skill_status(user.id, skill.name)
+        invalidate_download_artifacts(skill.id)
+        close_warm_workers(skill.id)
+        return updated
 
     async def activate_skill(self, user: User, skill_id: str) -> Skill:
         skill = await self.get_skill(user, skill_id)
         self._ensure_owner(user, skill)
-        return await self.skill_repo.update(skill, is_active=True)
+        updated = await self.skill_repo.update(skill, is_active=True)
+        invalidate_skill_status(user.id, skill.name)
+        return updated
 
     async def delete_skill(self, user: User, skill_id: str) -> bool:
         skill = await self.get_skill(user, skill_id)
         self._ensure_owner(user, skill)
         await self.skill_repo.delete(skill)
-        delete_skill_dir(user.id, skill.name)
+        await run_io(delete_skill_tree, user.id, skill.name)
+        await run_io(discard_dependency_envs, skill.id)
+        invalidate_skill_metadata(user.id)
+        invalidate_skill_status(user.id, skill.name)
+        invalidate_download_artifacts(skill.id)
+        close_warm_workers(skill.id)
         return True
 
     async def list_skill_files(self, user: User, skill_id: str) -> list[str]:
         skill = await self.get_skill(user, skill_id)
         self._ensure_active(skill)
-        return list_files(user.id, skill.name)
+        return await run_io(list_files, user.id, skill.name)
 
     async def read_skill_file(self, user: User, skill_id: str, file_path: str) -> str:
         skill = await self.get_skill(user, skill_id)
@@ -156,9 +198,7 @@ class SkillService:
         safe_path = get_safe_skill_path(base_dir, user.id, skill.name, file_path)
         if not safe_path:
             raise ValueError("Invalid file path")
-        if not safe_path.exists() or not safe_path.is_file():
-            raise ValueError("File not found")
-        return safe_path.read_text(encoding="utf-8", errors="replace")
+        return await run_io(read_text_file, safe_path)
 
     async def upload_file(self, user: User, skill_id: str, filename: str, content: bytes) -> str:
         skill = await self.get_skill(user, skill_id)
@@ -168,23 +208,19 @@ class SkillService:
             raise ValueError(error)
         if len(content) > MAX_FILE_SIZE:
             raise ValueError("File too large")
-        existing = list_files(user.id, skill.name)
+        existing = await run_io(list_files, user.id, skill.name)
         if len(existing) >= MAX_FILES_PER_SKILL:
             raise ValueError("Too many files in skill")
         skill_dir = get_user_skill_dir(user.id, skill.name)
-        total_size = 0
-        for rel_path in existing:
-            file_path = skill_dir / rel_path
-            if file_path.exists() and file_path.is_file():
-                total_size += file_path.stat().st_size
+        total_size = await run_io(total_files_size, skill_dir, existing)
         if total_size + len(content) > MAX_TOTAL_SIZE:
             raise ValueError("Total skill size limit exceeded")
         base_dir = Path(settings.SKILL_STORAGE_PATH)
         safe_path = get_safe_skill_path(base_dir, user.id, skill.name, filename)
         if not safe_path:
             raise ValueError("Invalid file path")
-        safe_path.parent.mkdir(parents=True, exist_ok=True)
-        safe_path.write_bytes(content)
+        await run_io(write_file_bytes, safe_path, content)
+        invalidate_skill_metadata(user.id)
         return filename
 
     def _require_version_repo(self) -> SkillVersionRepository:
@@ -202,6 +238,31 @@ class SkillService:
         if skill.user_id != user.id:
             raise ValueError("Skill not found")
 
+    @staticmethod
+    def _extract_members(
+        archive: zipfile.ZipFile,
+        entries: list[zipfile.ZipInfo],
+        target_dir: Path,
+    ) -> dict[str, tuple[str, int]]:
+        chunk_size = max(1, int(settings.SKILL_UPLOAD_CHUNK_BYTES))
+        digests: dict[str, tuple[str, int]] = {}
+        for info in entries:
+            file_path = info.filename.replace("\\", "/").lstrip("/")
+            target = target_dir / file_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            digest = hashlib.sha256()
+            size = 0
+            with archive.open(info) as reader, target.open("wb") as writer:
+                while True:
+                    chunk = reader.read(chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    writer.write(chunk)
+            digests[target.relative_to(target_dir).as_posix()] = (digest.hexdigest(), size)
+        return digests
+
     @staticmethod
     def _parse_frontmatter(content: str) -> dict:
         stripped = content.lstrip()
@@ -257,14 +318,23 @@ class SkillService:
         return items
 
     @staticmethod
-    def _build_encryption_key(value: str) -> bytes:
-        return hashlib.sha256(value.encode("utf-8")).digest()
+    def _download_encryption_scheme() -> str:
+        scheme = (settings.SKILL_DOWNLOAD_ENCRYPTION_SCHEME or LEGACY_SCHEME).lower()
+        return STREAM_SCHEME if scheme == STREAM_SCHEME else LEGACY_SCHEME
 
     @staticmethod
     def _encrypt_payload(payload: bytes) -> tuple[str, str]:
-        key = SkillService._build_encryption_key(settings.SECRET_KEY)
-        nonce = os.urandom(12)
-        encrypted = nonce + AESGCM(key).encrypt(nonce, payload, None)
+        key = derive_key(settings.SECRET_KEY)
+        if SkillService._download_encryption_scheme() == LEGACY_SCHEME:
+            nonce = os.urandom(12)
+            encrypted = nonce + get_aead(key).encrypt(nonce, payload, None)
+        else:
+            encrypted = encrypt_bytes(
+                payload,
+                key,
+                max(1, int(settings.SKILL_DOWNLOAD_FRAME_BYTES)),
+                workers=max(1, int(settings.SKILL_ENCRYPTION_WORKERS)),
+            )
         encoded = base64.b64encode(encrypted).decode("utf-8")
         checksum = hashlib.sha256(encrypted).hexdigest()
         return encoded, f"sha256:{checksum}"
@@ -353,7 +423,7 @@ class SkillService:
         skill = await self.get_skill(user, skill_id)
         return await repo.list_by_skill(skill.id)
 
-    async def download_skill(self, user: User, skill_id: str, version: str | None = None) -> dict:
+    async def _resolve_download_target(self, user: User, skill_id: str, version: str | None) -> tuple[Skill, str]:
         repo = self._require_version_repo()
         skill = await self.get_skill(user, skill_id)
         self._ensure_active(skill)
@@ -368,36 +438,100 @@ class SkillService:
         record = await repo.get_by_version(skill.id, target_version)
         if not record:
             raise ValueError("Version not found")
-        archive_bytes = await load_archive(user.id, skill.name, target_version)
+        return skill, target_version
+
+    async def _rebuild_archive(self, user: User, skill: Skill, version: str) -> bytes:
+        base_dir = get_skill_versions_dir(user.id, skill.name)
+        version_dir = (base_dir / version).resolve()
+        if not version_dir.exists():
+            raise ValueError("Version files not found")
+
+        async def rebuild() -> bytes:
+            archive_bytes = await run_io(build_zip_archive, version_dir)
+            await save_archive(user.id, skill.name, version, archive_bytes)
+            return archive_bytes
+
+        return await _archive_rebuilds.do((user.id, skill.name, version), rebuild)
+
+    async def _load_or_rebuild_archive(self, user: User, skill: Skill, version: str) -> bytes:
+        archive_bytes = await load_archive(user.id, skill.name, version)
         if archive_bytes is None:
-            base_dir = get_skill_versions_dir(user.id, skill.name)
-            version_dir = (base_dir / target_version).resolve()
-            if not version_dir.exists():
-                raise ValueError("Version files not found")
-            buffer = io.BytesIO()
-            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
-                for file_path in version_dir.rglob("*"):
-                    if not file_path.is_file():
-                        continue
-                    relative = file_path.relative_to(version_dir)
-                    archive.write(file_path, arcname=relative.as_posix())
-            archive_bytes = buffer.getvalue()
-            await save_archive(user.id, skill.name, target_version, archive_bytes)
+            archive_bytes = await self._rebuild_archive(user, skill, version)
+        return archive_bytes
+
+    @classmethod
+    def _download_artifact_mode(cls) -> str:
+        if not settings.ENABLE_SKILL_DOWNLOAD_ENCRYPTION:
+            return "plain"
+        return cls._download_encryption_scheme()
+
+    @classmethod
+    def _build_download_artifact(cls, archive_bytes: bytes, revoked_at: datetime | None) -> DownloadArtifact:
         if settings.ENABLE_SKILL_DOWNLOAD_ENCRYPTION:
-            encrypted_code, checksum = self._encrypt_payload(archive_bytes)
+            encrypted_code, checksum = cls._encrypt_payload(archive_bytes)
+            scheme = cls._download_encryption_scheme()
         else:
             encrypted_code = base64.b64encode(archive_bytes).decode("utf-8")
-            checksum = self._checksum_payload(archive_bytes)
+            checksum = cls._checksum_payload(archive_bytes)
+            scheme = None
+        return DownloadArtifact(
+            encrypted_code=encrypted_code,
+            checksum=checksum,
+            encryption_scheme=scheme,
+            revoked_at=revoked_at,
+        )
+
+    async def _warm_download_artifact(self, skill: Skill, version: str, source: BinaryIO) -> None:
+        if not settings.SKILL_DOWNLOAD_ARTIFACT_WARM_ON_UPLOAD:
+            return
+        max_bytes = max(0, int(settings.SKILL_DOWNLOAD_ARTIFACT_CACHE_MAX_BYTES))
+        if await run_io(source.seek, 0, os.SEEK_END) > max_bytes:
+            return
+        source.seek(0)
+        archive_bytes = await run_io(source.read)
+        artifact = await run_io(self._build_download_artifact, archive_bytes, skill.cache_revoked_at)
+        put_download_artifact(skill.id, version, self._download_artifact_mode(), artifact)
+
+    async def download_skill(self, user: User, skill_id: str, version: str | None = None) -> dict:
+        skill, target_version = await self._resolve_download_target(user, skill_id, version)
+        mode = self._download_artifact_mode()
+        artifact = get_download_artifact(skill.id, target_version, mode, skill.cache_revoked_at)
+        if artifact is None:
+
+            async def prepare() -> DownloadArtifact:
+                archive_bytes = await self._load_or_rebuild_archive(user, skill, target_version)
+                prepared = await run_io(self._build_download_artifact, archive_bytes, skill.cache_revoked_at)
+                put_download_artifact(skill.id, target_version, mode, prepared)
+                return prepared
+
+            artifact = await _artifact_builds.do((skill.id, target_version, mode, skill.cache_revoked_at), prepare)
         expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
         return {
             "skill_uuid": skill.id,
             "version": target_version,
-            "encrypted_code": encrypted_code,
-            "checksum": checksum,
+            "encrypted_code": artifact.encrypted_code,
+            "checksum": artifact.checksum,
+            "encryption_scheme": artifact.encryption_scheme,
             "expires_at": expires_at,
             "cache_ttl_seconds": settings.SKILL_CACHE_TTL_SECONDS,
         }
 
+    async def open_download_archive(self, user: User, skill_id: str, version: str | None = None) -> dict:
+        skill, target_version = await self._resolve_download_target(user, skill_id, version)
+        source = await open_archive_source(user.id, skill.name, target_version)
+        if source is None:
+            archive_bytes = await self._rebuild_archive(user, skill, target_version)
+            source = await open_archive_source(user.id, skill.name, target_version)
+            if source is None:
+                source = await run_io(archive_source_from_bytes, archive_bytes)
+        return {
+            "skill_uuid": skill.id,
+            "skill_name": skill.name,
+            "version": target_version,
+            "source": source,
+            "encrypted": settings.ENABLE_SKILL_DOWNLOAD_ENCRYPTION,
+        }
+
     async def get_install_instructions(self, user: User, skill_id: str, version: str) -> dict:
         repo = self._require_version_repo()
         skill = await self.get_skill(user, skill_id)
@@ -447,7 +581,13 @@ class SkillService:
             "dependency_spec": dependency_spec or None,
         }
 
-    async def diff_versions(self, user: User, skill_id: str, from_version: str, to_version: str) -> dict:
+    async def _resolve_version_pair(
+        self,
+        user: User,
+        skill_id: str,
+        from_version: str,
+        to_version: str,
+    ) -> tuple[Path, Path, str, str]:
         skill = await self.get_skill(user, skill_id)
         self._ensure_active(skill)
         base_dir = get_skill_versions_dir(user.id, skill.name)
@@ -460,33 +600,92 @@ class SkillService:
             raise ValueError("Invalid version")
         if not from_dir.exists() or not to_dir.exists():
             raise ValueError("Version files not found")
-        from_files = {
-            str(path.relative_to(from_dir)).replace("\\", "/")
-            for path in from_dir.rglob("*")
-            if path.is_file()
+        return from_dir, to_dir, from_version, to_version
+
+    async def diff_versions(
+        self,
+        user: User,
+        skill_id: str,
+        from_version: str,
+        to_version: str,
+        include_diff: bool = True,
+    ) -> dict:
+        from_dir, to_dir, from_version, to_version = await self._resolve_version_pair(
+            user, skill_id, from_version, to_version
+        )
+        return await run_io(self._diff_version_dirs, from_dir, to_dir, from_version, to_version, include_diff)
+
+    async def diff_version_file(
+        self,
+        user: User,
+        skill_id: str,
+        from_version: str,
+        to_version: str,
+        file_path: str,
+    ) -> dict:
+        from_dir, to_dir, from_version, to_version = await self._resolve_version_pair(
+            user, skill_id, from_version, to_version
+        )
+        valid, error = validate_file_path(file_path)
+        if not valid:
+            raise ValueError(error)
+        return await run_io(self._diff_single_file, from_dir, to_dir, from_version, to_version, file_path)
+
+    @staticmethod
+    def _unified_diff(
+        left: Path | None,
+        right: Path | None,
+        relative: str,
+        from_version: str,
+        to_version: str,
+    ) -> str:
+        left_text = left.read_text(encoding="utf-8", errors="replace").splitlines() if left else []
+        right_text = right.read_text(encoding="utf-8", errors="replace").splitlines() if right else []
+        diff_lines = difflib.unified_diff(
+            left_text,
+            right_text,
+            fromfile=f"{from_version}/{relative}",
+            tofile=f"{to_version}/{relative}",
+            lineterm="",
+        )
+        return "\n".join(diff_lines)
+
+    @staticmethod
+    def _diff_entry(relative: str, left: dict | None, right: dict | None) -> dict:
+        return {
+            "path": relative,
+            "diff": "",
+            "from_sha256": left.get("sha256") if left else None,
+            "to_sha256": right.get("sha256") if right else None,
+            "from_size": left.get("size") if left else None,
+            "to_size": right.get("size") if right else None,
         }
-        to_files = {str(path.relative_to(to_dir)).replace("\\", "/") for path in to_dir.rglob("*") if path.is_file()}
-        added = sorted(to_files - from_files)
-        removed = sorted(from_files - to_files)
+
+    @classmethod
+    def _diff_version_dirs(
+        cls,
+        from_dir: Path,
+        to_dir: Path,
+        from_version: str,
+        to_version: str,
+        include_diff: bool = True,
+    ) -> dict:
+        from_files = ensure_manifest(from_dir)["files"]
+        to_files = ensure_manifest(to_dir)["files"]
+        added = sorted(set(to_files) - set(from_files))
+        removed = sorted(set(from_files) - set(to_files))
         modified: list[dict] = []
-        for relative in sorted(from_files & to_files):
-            left = from_dir / relative
-            right = to_dir / relative
-            if left.read_bytes() == right.read_bytes():
+        for relative in sorted(set(from_files) & set(to_files)):
+            left = from_files[relative]
+            right = to_files[relative]
+            if left.get("sha256") == right.get("sha256"):
                 continue
-            diff_text = ""
-            if left.stat().st_size <= 100_000 and right.stat().st_size <= 100_000:
-                left_text = left.read_text(encoding="utf-8", errors="replace").splitlines()
-                right_text = right.read_text(encoding="utf-8", errors="replace").splitlines()
-                diff_lines = difflib.unified_diff(
-                    left_text,
-                    right_text,
-                    fromfile=f"{from_version}/{relative}",
-                    tofile=f"{to_version}/{relative}",
-                    lineterm="",
+            entry = cls._diff_entry(relative, left, right)
+            if include_diff and int(left.get("size") or 0) <= 100_000 and int(right.get("size") or 0) <= 100_000:
+                entry["diff"] = cls._unified_diff(
+                    from_dir / relative, to_dir / relative, relative, from_version, to_version
                 )
-                diff_text = "\n".join(diff_lines)
-            modified.append({"path": relative, "diff": diff_text})
+            modified.append(entry)
         return {
             "from_version": from_version,
             "to_version": to_version,
@@ -495,6 +694,35 @@ class SkillService:
             "modified": modified,
         }
 
+    @classmethod
+    def _diff_single_file(
+        cls,
+        from_dir: Path,
+        to_dir: Path,
+        from_version: str,
+        to_version: str,
+        relative: str,
+    ) -> dict:
+        relative = relative.replace("\\", "/").lstrip("/")
+        left = ensure_manifest(from_dir)["files"].get(relative)
+        right = ensure_manifest(to_dir)["files"].get(relative)
+        if left is None and right is None:
+            raise ValueError("File not found")
+        entry = cls._diff_entry(relative, left, right)
+        if left and right and left.get("sha256") == right.get("sha256"):
+            return entry
+        max_bytes = max(0, int(settings.SKILL_DIFF_MAX_FILE_BYTES))
+        if int((left or {}).get("size") or 0) > max_bytes or int((right or {}).get("size") or 0) > max_bytes:
+            raise ValueError("File too large to diff")
+        entry["diff"] = cls._unified_diff(
+            from_dir / relative if left else None,
+            to_dir / relative if right else None,
+            relative,
+            from_version,
+            to_version,
+        )
+        return entry
+
     async def rollback_version(self, user: User, skill_id: str, version: str):
         repo = self._require_version_repo()
         skill = await self.get_skill(user, skill_id)
@@ -510,15 +738,10 @@ class SkillService:
             raise ValueError("Invalid version")
         if not version_dir.exists():
             raise ValueError("Version files not found")
-        clear_skill_current_dir(user.id, skill.name)
-        root_dir = get_user_skill_dir(user.id, skill.name)
-        for file_path in version_dir.rglob("*"):
-            if not file_path.is_file():
-                continue
-            relative = file_path.relative_to(version_dir)
-            target = root_dir / relative
-            target.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(file_path, target)
+        manifest = await run_io(ensure_manifest, version_dir)
+        digests = {relative: entry["sha256"] for relative, entry in manifest["files"].items() if entry.get("sha256")}
+        await run_io(publish_version_files, user.id, skill.name, version_dir, digests)
+        invalidate_skill_metadata(user.id)
         await self.skill_repo.update(skill, current_version=version, description=record.description)
         return record
 
@@ -527,7 +750,7 @@ class SkillService:
         user: User,
         skill_id: str,
         filename: str,
-        content: bytes,
+        content: bytes | BinaryIO,
         metadata_text: str | None = None,
     ) -> dict:
         repo = self._require_version_repo()
@@ -535,8 +758,10 @@ class SkillService:
         self._ensure_owner(user, skill)
         if not filename.lower().endswith(".zip"):
             raise ValueError("Invalid zip file")
+        source = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+        source.seek(0)
         try:
-            archive = zipfile.ZipFile(io.BytesIO(content))
+            archive = await run_io(zipfile.ZipFile, source)
         except zipfile.BadZipFile as exc:
             raise ValueError("Invalid zip file") from exc
         with archive:
@@ -561,7 +786,7 @@ class SkillService:
             )
             if not skill_md:
                 raise ValueError("SKILL.md not found")
-            skill_md_content = archive.read(skill_md).decode("utf-8", errors="replace")
+            skill_md_content = (await run_io(archive.read, skill_md)).decode("utf-8", errors="replace")
             frontmatter = self._parse_frontmatter(skill_md_content)
             metadata: dict = {}
             if metadata_text:
@@ -596,7 +821,7 @@ class SkillService:
                 node_spec: dict[str, object] = {}
                 requirements: list[str] = []
                 if "requirements.txt" in entry_names:
-                    requirements_text = archive.read("requirements.txt").decode("utf-8", errors="replace")
+                    requirements_text = (await run_io(archive.read, "requirements.txt")).decode("utf-8", errors="replace")
                     requirements = self._parse_requirements_text(requirements_text)
                     if requirements:
                         dependencies = requirements
@@ -613,7 +838,9 @@ class SkillService:
                     }
                 if "package.json" in entry_names:
                     try:
-                        package_json = json.loads(archive.read("package.json").decode("utf-8", errors="replace"))
+                        package_json = json.loads(
+                            (await run_io(archive.read, "package.json")).decode("utf-8", errors="replace")
+                        )
                     except json.JSONDecodeError:
                         package_json = {}
                     lockfile = ""
@@ -635,27 +862,28 @@ class SkillService:
                 if node_spec:
                     dependency_spec["node"] = node_spec
             base_dir = get_skill_versions_dir(user.id, skill.name)
-            base_resolved = base_dir.resolve()
-            version_dir = (base_dir / version).resolve()
+            base_resolved = await run_io(base_dir.resolve)
+            version_dir = await run_io((base_dir / version).resolve)
             if not version_dir.is_relative_to(base_resolved):
                 raise ValueError("Invalid version")
-            if version_dir.exists():
+            if await run_io(version_dir.exists):
                 raise ValueError("Version already exists")
-            version_dir.mkdir(parents=True, exist_ok=True)
-            for info in entries:
-                file_path = info.filename.replace("\\", "/").lstrip("/")
-                target = version_dir / file_path
-                target.parent.mkdir(parents=True, exist_ok=True)
-                target.write_bytes(archive.read(info))
-            clear_skill_current_dir(user.id, skill.name)
-            root_dir = get_user_skill_dir(user.id, skill.name)
-            for entry_path in version_dir.rglob("*"):
-                if not entry_path.is_file():
-                    continue
-                relative = entry_path.relative_to(version_dir)
-                target = root_dir / relative
-                target.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(entry_path, target)
+            await run_io(version_dir.mkdir, parents=True, exist_ok=True)
+            try:
+                digests = await run_io(self._extract_members, archive, entries, version_dir)
+            except (OSError, zipfile.BadZipFile) as exc:
+                await run_io(shutil.rmtree, version_dir, ignore_errors=True)
+                raise ValueError("Invalid zip file") from exc
+            record_workdir_write(version_dir, sum(size for _, size in digests.values()))
+            await run_io(intern_version_dir, version_dir, digests)
+            await run_io(
+                publish_version_files,
+                user.id,
+                skill.name,
+                version_dir,
+                {relative: digest for relative, (digest, _) in digests.items()},
+            )
+            invalidate_skill_metadata(user.id)
             record = await repo.create_version(
                 skill_id=skill.id,
                 version=version,
@@ -672,7 +900,10 @@ class SkillService:
                 },
             )
             await self.skill_repo.update(skill, current_version=version, description=description, is_active=True)
-            await save_archive(user.id, skill.name, version, content)
+            invalidate_skill_status(user.id, skill.name)
+            invalidate_download_artifacts(skill.id, version)
+            await save_archive(user.id, skill.name, version, source)
+            await self._warm_download_artifact(skill, version, source)
             return {
                 "version": record.version,
                 "current_version": version,
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 
+from mcp_agentskills.core.metrics.token_usage import record_token_use
 from mcp_agentskills.core.security.token import generate_api_token, hash_token
+from mcp_agentskills.core.utils.principal_cache import invalidate_token_principal
 from mcp_agentskills.models.token import APIToken
 from mcp_agentskills.models.user import User
 from mcp_agentskills.repositories.token import TokenRepository
@@ -46,6 +48,7 @@ class TokenService:
         if not token or token.user_id != user.id:
             raise ValueError("Token not found")
         await self.token_repo.revoke(token)
+        invalidate_token_principal(token.token_hash)
         return True
 
     async def validate_token(self, token_value: str) -> APIToken:
@@ -61,5 +64,5 @@ class TokenService:
                 expires_at = expires_at.replace(tzinfo=timezone.utc)
             if expires_at <= datetime.now(timezone.utc):
                 raise ValueError("Token expired")
-        await self.token_repo.mark_used(token)
+        record_token_use(token.id)
         return token
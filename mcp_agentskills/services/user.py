@@ -1,4 +1,11 @@
-from mcp_agentskills.core.utils.skill_storage import delete_skill_dir
+from mcp_agentskills.core.utils.dependency_envs import discard_dependency_envs
+from mcp_agentskills.core.utils.download_artifacts import invalidate_download_artifacts
+from mcp_agentskills.core.utils.io_executor import run_io
+from mcp_agentskills.core.utils.principal_cache import invalidate_user_principals
+from mcp_agentskills.core.utils.skill_blobs import delete_skill_tree
+from mcp_agentskills.core.utils.skill_metadata_index import invalidate_skill_metadata
+from mcp_agentskills.core.utils.skill_status_cache import invalidate_skill_status
+from mcp_agentskills.core.utils.warm_workers import close_warm_workers
 from mcp_agentskills.models.user import User
 from mcp_agentskills.repositories.skill import SkillRepository
 from mcp_agentskills.repositories.user import UserRepository
@@ -9,12 +16,21 @@ class UserService:
         self.user_repo = user_repo
 
     async def update_user(self, user: User, **fields) -> User:
-        return await self.user_repo.update(user, **fields)
+        updated = await self.user_repo.update(user, **fields)
+        invalidate_user_principals(updated.id)
+        return updated
 
     async def delete_user(self, user: User) -> bool:
+        user_id = user.id
         skill_repo = SkillRepository(self.user_repo.session)
         skills = await skill_repo.list_by_user(user.id)
         for skill in skills:
-            delete_skill_dir(user.id, skill.name)
+            await run_io(delete_skill_tree, user.id, skill.name)
+            await run_io(discard_dependency_envs, skill.id)
+            invalidate_download_artifacts(skill.id)
+            close_warm_workers(skill.id)
+        invalidate_skill_metadata(user.id)
+        invalidate_skill_status(user.id)
         await self.user_repo.delete(user)
+        invalidate_user_principals(user_id)
         return True
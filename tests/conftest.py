@@ -3,6 +3,7 @@ import sys
 from pathlib import Path
 from typing import AsyncGenerator
 
+import pytest
 import pytest_asyncio
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
@@ -40,6 +41,15 @@ def _set_default_env():
 _set_default_env()
 
 
+@pytest.fixture(autouse=True)
+def _reset_counter_backends():
+    from mcp_agentskills.core.utils.shared_counters import reset_counter_backends
+
+    reset_counter_backends()
+    yield
+    reset_counter_backends()
+
+
 @pytest_asyncio.fixture(scope="session")
 async def async_engine():
     from mcp_agentskills import models as _models
@@ -58,6 +58,12 @@ async def test_skill_download_returns_encrypted_payload(client, tmp_path, monkey
     encrypted = base64.b64decode(payload["encrypted_code"])
     digest = hashlib.sha256(encrypted).hexdigest()
     assert payload["checksum"] == f"sha256:{digest}"
+    assert payload["encryption_scheme"] == "aes-256-gcm"
+    from mcp_agentskills.config.settings import settings
+    from mcp_agentskills.core.utils.archive_crypto import derive_key, get_aead
+
+    plain = get_aead(derive_key(settings.SECRET_KEY)).decrypt(encrypted[:12], encrypted[12:], None)
+    assert zipfile.ZipFile(io.BytesIO(plain)).read("reference.md") == b"hello"
     assert payload["skill_uuid"] == skill_id
     assert payload["version"] == "1.0.0"
     expires_at = datetime.fromisoformat(payload["expires_at"].replace("Z", "+00:00"))
@@ -91,3 +97,105 @@ async def test_skill_download_denied_without_permission(client, tmp_path, monkey
         headers=headers,
     )
     assert response.status_code == 403
+
+
+async def _upload_streaming_skill(client, headers, name):
+    created = await client.post(
+        "/api/v1/skills",
+        json={"name": name, "description": "desc"},
+        headers=headers,
+    )
+    skill_id = created.json()["id"]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("SKILL.md", f"---\nname: {name}\nversion: 1.0.0\n---\nbody")
+        archive.writestr("reference.md", os.urandom(4096).hex())
+    buffer.seek(0)
+    await client.post(
+        "/api/v1/skills/upload",
+        data={"skill_uuid": skill_id},
+        files={"file": ("skill.zip", buffer.read(), "application/zip")},
+        headers=headers,
+    )
+    return skill_id
+
+
+@pytest.mark.asyncio
+async def test_skill_archive_stream_supports_range_and_etag(client, tmp_path, monkeypatch):
+    from mcp_agentskills.config.settings import settings
+
+    monkeypatch.setenv("SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "ENABLE_SKILL_DOWNLOAD_ENCRYPTION", False)
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_CHUNK_BYTES", 1000)
+    access = await _sso_login_with_role(client, "archivestream@example.com", "archivestreamer", role="admin")
+    headers = {"Authorization": f"Bearer {access}"}
+    skill_id = await _upload_streaming_skill(client, headers, "skillstream")
+
+    response = await client.get(f"/api/v1/skills/{skill_id}/archive?version=1.0.0", headers=headers)
+    assert response.status_code == 200
+    body = response.content
+    checksum = f"sha256:{hashlib.sha256(body).hexdigest()}"
+    assert response.headers["etag"] == f'"{checksum}"'
+    assert response.headers["x-skill-checksum"] == checksum
+    assert response.headers["accept-ranges"] == "bytes"
+    assert zipfile.ZipFile(io.BytesIO(body)).read("SKILL.md").startswith(b"---")
+
+    cached = await client.get(
+        f"/api/v1/skills/{skill_id}/archive",
+        headers={**headers, "If-None-Match": response.headers["etag"]},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    partial = await client.get(
+        f"/api/v1/skills/{skill_id}/archive",
+        headers={**headers, "Range": "bytes=10-2509"},
+    )
+    assert partial.status_code == 206
+    assert partial.content == body[10:2510]
+    assert partial.headers["content-range"] == f"bytes 10-2509/{len(body)}"
+    suffix = await client.get(
+        f"/api/v1/skills/{skill_id}/archive",
+        headers={**headers, "Range": "bytes=-100"},
+    )
+    assert suffix.content == body[-100:]
+    stale = await client.get(
+        f"/api/v1/skills/{skill_id}/archive",
+        headers={**headers, "Range": "bytes=0-9", "If-Range": '"sha256:stale"'},
+    )
+    assert stale.status_code == 200
+    assert stale.content == body
+    unsatisfiable = await client.get(
+        f"/api/v1/skills/{skill_id}/archive",
+        headers={**headers, "Range": f"bytes={len(body)}-"},
+    )
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(body)}"
+
+
+@pytest.mark.asyncio
+async def test_skill_archive_stream_encrypted_frames(client, tmp_path, monkeypatch):
+    from mcp_agentskills.config.settings import settings
+    from mcp_agentskills.core.utils.archive_crypto import decrypt_bytes, derive_key
+
+    monkeypatch.setenv("SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "ENABLE_SKILL_DOWNLOAD_ENCRYPTION", True)
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_FRAME_BYTES", 512)
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_CHUNK_BYTES", 1024)
+    access = await _sso_login_with_role(client, "streamenc@example.com", "streamenc", role="admin")
+    headers = {"Authorization": f"Bearer {access}"}
+    skill_id = await _upload_streaming_skill(client, headers, "skillstreamenc")
+
+    response = await client.get(f"/api/v1/skills/{skill_id}/archive", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    plain = decrypt_bytes(response.content, derive_key(settings.SECRET_KEY))
+    assert f"sha256:{hashlib.sha256(plain).hexdigest()}" == response.headers["x-skill-checksum"]
+    assert int(response.headers["content-length"]) == len(response.content)
+
+    partial = await client.get(
+        f"/api/v1/skills/{skill_id}/archive",
+        headers={**headers, "Range": "bytes=5-1800"},
+    )
+    assert partial.status_code == 206
+    assert partial.content == response.content[5:1801]
@@ -508,6 +508,42 @@ async def test_skill_versions_diff_returns_modified_files(client, tmp_path, monk
     assert "reference.md" in modified
     assert "-first" in modified["reference.md"]
     assert "+second" in modified["reference.md"]
+    entry = next(item for item in payload["modified"] if item["path"] == "reference.md")
+    assert entry["from_sha256"] != entry["to_sha256"]
+    assert entry["from_size"] == len("first")
+    assert entry["to_size"] == len("second")
+    assert "SKILL.md" in modified
+
+    summary = await client.get(
+        f"/api/v1/skills/{skill_id}/versions/diff?from=1.0.0&to=1.1.0&include_diff=false",
+        headers=headers,
+    )
+    assert summary.status_code == 200
+    assert all(item["diff"] == "" for item in summary.json()["modified"])
+
+    single = await client.get(
+        f"/api/v1/skills/{skill_id}/versions/diff/file?from=1.0.0&to=1.1.0&path=reference.md",
+        headers=headers,
+    )
+    assert single.status_code == 200
+    assert "+second" in single.json()["diff"]
+    added = await client.get(
+        f"/api/v1/skills/{skill_id}/versions/diff/file?from=1.0.0&to=1.1.0&path=new.md",
+        headers=headers,
+    )
+    assert added.status_code == 200
+    assert added.json()["from_sha256"] is None
+    assert "+added" in added.json()["diff"]
+    missing = await client.get(
+        f"/api/v1/skills/{skill_id}/versions/diff/file?from=1.0.0&to=1.1.0&path=absent.md",
+        headers=headers,
+    )
+    assert missing.status_code == 400
+    escaped = await client.get(
+        f"/api/v1/skills/{skill_id}/versions/diff/file?from=1.0.0&to=1.1.0&path=../secret",
+        headers=headers,
+    )
+    assert escaped.status_code == 400
 
 
 @pytest.mark.asyncio
@@ -827,3 +863,22 @@ async def test_skill_dependency_spec_frontmatter_yaml(client, tmp_path, monkeypa
     assert payload["commands"] == ["poetry install"]
     assert payload["dependency_spec"]["python"]["manager"] == "poetry"
     assert "git" in payload["dependency_spec"]["system"]["packages"]
+
+
+@pytest.mark.asyncio
+async def test_skill_versions_diff_backfills_missing_manifest(tmp_path, monkeypatch):
+    from mcp_agentskills.core.utils.skill_blobs import get_manifest_path, load_manifest
+    from mcp_agentskills.services.skill import SkillService
+
+    monkeypatch.setattr(settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    from_dir = tmp_path / "1.0.0"
+    to_dir = tmp_path / "1.1.0"
+    for directory, text in ((from_dir, "same\nold"), (to_dir, "same\nnew")):
+        (directory / "docs").mkdir(parents=True)
+        (directory / "docs" / "a.md").write_text(text, encoding="utf-8")
+        (directory / "keep.md").write_text("unchanged", encoding="utf-8")
+    payload = SkillService._diff_version_dirs(from_dir, to_dir, "1.0.0", "1.1.0")
+    assert [item["path"] for item in payload["modified"]] == ["docs/a.md"]
+    assert "+new" in payload["modified"][0]["diff"]
+    assert get_manifest_path(from_dir).exists()
+    assert set(load_manifest(to_dir)["files"]) == {"docs/a.md", "keep.md"}
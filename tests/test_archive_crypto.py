@@ -0,0 +1,93 @@
+import io
+import os
+
+import pytest
+
+from mcp_agentskills.core.utils.archive_crypto import (
+    STREAM_HEADER_SIZE,
+    decrypt_bytes,
+    decrypt_range,
+    decrypt_stream,
+    derive_key,
+    encrypt_bytes,
+    encrypt_stream,
+    encrypted_size,
+    get_aead,
+    shutdown_crypto_pool,
+)
+
+
+def test_segmented_encryption_roundtrip_streaming_and_parallel():
+    key = derive_key("secret")
+    assert derive_key("secret") is key
+    payload = os.urandom(10_000)
+    encrypted = encrypt_bytes(payload, key, 1024, workers=4)
+    shutdown_crypto_pool()
+    assert len(encrypted) == encrypted_size(len(payload), 1024)
+    assert decrypt_bytes(encrypted, key) == payload
+
+    streamed = io.BytesIO()
+    written = encrypt_stream(io.BytesIO(payload), streamed, key, 1024)
+    assert written == len(encrypted)
+    restored = io.BytesIO()
+    assert decrypt_stream(io.BytesIO(streamed.getvalue()), restored, key) == len(payload)
+    assert restored.getvalue() == payload
+
+    assert decrypt_range(io.BytesIO(encrypted), key, 1000, 2100) == payload[1000:3100]
+    assert decrypt_range(io.BytesIO(encrypted), key, 9990, 100) == payload[9990:]
+    assert decrypt_bytes(encrypt_bytes(b"", key, 1024), key) == b""
+
+
+def test_segmented_encryption_rejects_truncation_and_tampering():
+    key = derive_key("secret")
+    payload = os.urandom(4096)
+    encrypted = encrypt_bytes(payload, key, 1024)
+    truncated = encrypted[: STREAM_HEADER_SIZE + 2 * (1024 + 16)]
+    with pytest.raises(Exception):
+        decrypt_bytes(truncated, key)
+    tampered = bytearray(encrypted)
+    tampered[8] ^= 1
+    with pytest.raises(Exception):
+        decrypt_bytes(bytes(tampered), key)
+
+
+def test_local_cache_reads_legacy_and_segmented_formats(tmp_path, monkeypatch):
+    import base64
+
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    from mcp_agentskills.config.settings import settings
+    from mcp_agentskills.core.utils import skill_archive
+
+    monkeypatch.setattr(settings, "ENABLE_LOCAL_CACHE_ENCRYPTION", True)
+    monkeypatch.setattr(settings, "SKILL_CACHE_TTL_SECONDS", 3600)
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_FRAME_BYTES", 64)
+    payload = os.urandom(1000)
+    path = tmp_path / "archive.cache"
+    skill_archive._write_local_cache(path, io.BytesIO(payload))
+    assert path.read_bytes()[:3] == b"SKS"
+    assert skill_archive._read_local_cache(path) == payload
+
+    nonce = os.urandom(12)
+    legacy = nonce + AESGCM(derive_key(settings.SECRET_KEY)).encrypt(nonce, payload, None)
+    path.write_bytes(base64.b64encode(legacy))
+    assert skill_archive._read_local_cache(path) == payload
+
+
+def test_download_scheme_defaults_to_legacy_and_stream_is_opt_in(monkeypatch):
+    import base64
+
+    from mcp_agentskills.config.settings import settings
+    from mcp_agentskills.services.skill import SkillService
+
+    key = derive_key(settings.SECRET_KEY)
+    payload = b"archive-bytes" * 100
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_ENCRYPTION_SCHEME", "aes-256-gcm")
+    assert SkillService._download_encryption_scheme() == "aes-256-gcm"
+    legacy = base64.b64decode(SkillService._encrypt_payload(payload)[0])
+    assert get_aead(key).decrypt(legacy[:12], legacy[12:], None) == payload
+
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_ENCRYPTION_SCHEME", "aes-256-gcm-stream-v1")
+    assert SkillService._download_encryption_scheme() == "aes-256-gcm-stream-v1"
+    streamed = base64.b64decode(SkillService._encrypt_payload(payload)[0])
+    assert decrypt_bytes(streamed, key) == payload
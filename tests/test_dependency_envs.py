@@ -0,0 +1,118 @@
+import asyncio
+import os
+import sys
+import zipfile
+
+import pytest
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils import dependency_envs
+from mcp_agentskills.core.utils.dependency_envs import (
+    apply_dependency_env,
+    dependency_spec_hash,
+    discard_dependency_envs,
+    ensure_dependency_env,
+    evict_dependency_envs,
+    get_dependency_env_stats,
+    python_requirements,
+    reset_dependency_envs,
+)
+
+
+def _build_wheel(wheelhouse, name="demo_dep", version="1.0", value=42):
+    wheelhouse.mkdir(exist_ok=True)
+    dist_info = f"{name}-{version}.dist-info"
+    path = wheelhouse / f"{name}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(f"{name}/__init__.py", f"VALUE = {value}\n")
+        archive.writestr(
+            f"{dist_info}/METADATA",
+            f"Metadata-Version: 2.1\nName: {name.replace('_', '-')}\nVersion: {version}\n",
+        )
+        archive.writestr(
+            f"{dist_info}/WHEEL",
+            "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        archive.writestr(
+            f"{dist_info}/RECORD",
+            f"{name}/__init__.py,,\n{dist_info}/METADATA,,\n{dist_info}/WHEEL,,\n{dist_info}/RECORD,,\n",
+        )
+    return path
+
+
+@pytest.fixture
+def env_settings(tmp_path, monkeypatch):
+    wheelhouse = tmp_path / "wheelhouse"
+    _build_wheel(wheelhouse)
+    monkeypatch.setattr(settings, "SKILL_DEPENDENCY_ENV_PATH", str(tmp_path / "envs"))
+    monkeypatch.setattr(settings, "SKILL_DEPENDENCY_WHEELHOUSE", str(wheelhouse))
+    monkeypatch.setattr(settings, "SKILL_DEPENDENCY_ENV_MAX_BYTES", 1 << 30)
+    reset_dependency_envs()
+    yield tmp_path
+    reset_dependency_envs()
+
+
+def test_python_requirements_from_spec():
+    spec = {"python": {"manager": "pip", "requirements": ["demo-dep==1.0", " "], "files": []}}
+    assert python_requirements(spec) == ["demo-dep==1.0"]
+    assert python_requirements({}, ["requests"]) == ["requests"]
+    assert python_requirements({"python": {"manager": "conda", "requirements": ["x"]}}) is None
+    assert python_requirements({"python": {"requirements": ["--index-url=http://evil"]}}) is None
+    assert dependency_spec_hash({"a": 1, "b": 2}) == dependency_spec_hash({"b": 2, "a": 1})
+
+
+@pytest.mark.asyncio
+async def test_dependency_env_is_built_once_offline_and_reused(env_settings, monkeypatch):
+    spec = {"schema_version": 1, "python": {"manager": "pip", "requirements": ["demo-dep==1.0"]}}
+    dependency_env = await ensure_dependency_env("skill-1", "1.0.0", spec)
+    assert dependency_env is not None
+    assert (dependency_env.site_packages / "demo_dep" / "__init__.py").exists()
+
+    async def fail_build(*args, **kwargs):
+        raise AssertionError("unexpected rebuild")
+
+    monkeypatch.setattr(dependency_envs, "_build", fail_build)
+    again = await ensure_dependency_env("skill-1", "1.0.0", spec)
+    assert again == dependency_env
+    stats = get_dependency_env_stats()
+    assert stats["builds"] == 1
+    assert stats["hits"] == 1
+
+    env = apply_dependency_env({"PATH": os.environ.get("PATH", "")}, dependency_env)
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        "import demo_dep; print(demo_dep.VALUE)",
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    stdout, _ = await proc.communicate()
+    assert proc.returncode == 0
+    assert stdout.decode().strip() == "42"
+
+
+@pytest.mark.asyncio
+async def test_dependency_env_build_failure_backs_off(env_settings):
+    spec = {"python": {"manager": "pip", "requirements": ["missing-dep==9.9"]}}
+    assert await ensure_dependency_env("skill-1", "1.0.0", spec) is None
+    assert await ensure_dependency_env("skill-1", "1.0.0", spec) is None
+    stats = get_dependency_env_stats()
+    assert stats["build_failures"] == 1
+    assert stats["failed_keys"] == 1
+    assert not any(name.startswith(".build-") for name in os.listdir(env_settings / "envs" / "skill-1"))
+
+
+@pytest.mark.asyncio
+async def test_dependency_envs_evicted_lru_and_discarded(env_settings, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_EXECUTION_TIMEOUT_SECONDS", 1)
+    spec = {"python": {"manager": "pip", "requirements": ["demo-dep==1.0"]}}
+    first = await ensure_dependency_env("skill-1", "1.0.0", spec)
+    second = await ensure_dependency_env("skill-2", "1.0.0", spec)
+    old = first.path / ".env.json"
+    os.utime(old, (old.stat().st_atime - 60, old.stat().st_mtime - 60))
+    monkeypatch.setattr(settings, "SKILL_DEPENDENCY_ENV_MAX_BYTES", 1)
+    assert evict_dependency_envs(str(second.path)) == 1
+    assert not first.path.exists()
+    assert second.path.exists()
+    discard_dependency_envs("skill-2")
+    assert not second.path.exists()
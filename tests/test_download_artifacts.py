@@ -0,0 +1,93 @@
+import io
+import zipfile
+from datetime import datetime, timezone
+
+import pytest
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils.download_artifacts import (
+    DownloadArtifact,
+    get_download_artifact,
+    get_download_artifact_stats,
+    invalidate_download_artifacts,
+    put_download_artifact,
+    reset_download_artifacts,
+)
+from mcp_agentskills.repositories.skill import SkillRepository
+from mcp_agentskills.repositories.skill_version import SkillVersionRepository
+from mcp_agentskills.repositories.user import UserRepository
+from mcp_agentskills.services.skill import SkillService
+
+
+@pytest.fixture(autouse=True)
+def _reset_artifacts():
+    reset_download_artifacts()
+    yield
+    reset_download_artifacts()
+
+
+def _artifact(size: int, revoked_at=None) -> DownloadArtifact:
+    return DownloadArtifact(encrypted_code="x" * size, checksum="sha256:x", encryption_scheme=None, revoked_at=revoked_at)
+
+
+def test_download_artifacts_evict_lru_by_bytes(monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_ARTIFACT_CACHE_MAX_BYTES", 100)
+    assert put_download_artifact("s1", "1.0.0", "plain", _artifact(40))
+    assert put_download_artifact("s1", "1.1.0", "plain", _artifact(40))
+    assert get_download_artifact("s1", "1.0.0", "plain", None) is not None
+    assert put_download_artifact("s2", "1.0.0", "plain", _artifact(40))
+    assert get_download_artifact("s1", "1.1.0", "plain", None) is None
+    assert get_download_artifact("s1", "1.0.0", "plain", None) is not None
+    assert not put_download_artifact("s3", "1.0.0", "plain", _artifact(101))
+    stats = get_download_artifact_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 80
+
+    invalidate_download_artifacts("s1")
+    assert get_download_artifact("s1", "1.0.0", "plain", None) is None
+    assert get_download_artifact("s2", "1.0.0", "other-mode", None) is None
+
+
+def test_download_artifacts_respect_cache_revocation():
+    put_download_artifact("s1", "1.0.0", "plain", _artifact(10))
+    revoked = datetime.now(timezone.utc)
+    assert get_download_artifact("s1", "1.0.0", "plain", revoked) is None
+    assert get_download_artifact_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_warms_download_artifact(async_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "SKILL_ARCHIVE_BACKEND", "local")
+    user = await UserRepository(async_session).create(
+        email="artifact@example.com", username="artifactuser", password="pass1234"
+    )
+    service = SkillService(SkillRepository(async_session), SkillVersionRepository(async_session))
+    skill = await service.create_skill(user, name="artifacts", description="desc")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("SKILL.md", "---\nname: artifacts\nversion: 1.0.0\n---\nbody")
+    await service.upload_zip(user, skill.id, "artifacts.zip", buffer.getvalue())
+    assert get_download_artifact_stats()["entries"] == 1
+
+    first = await service.download_skill(user, skill.id, "1.0.0")
+    second = await service.download_skill(user, skill.id, "1.0.0")
+    assert first["encrypted_code"] == second["encrypted_code"]
+    assert get_download_artifact_stats()["hits"] == 2
+
+    await service.deactivate_skill(user, skill.id)
+    assert get_download_artifact_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_download_artifact_skips_oversized_archive_without_reading(monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_ARTIFACT_WARM_ON_UPLOAD", True)
+    monkeypatch.setattr(settings, "SKILL_DOWNLOAD_ARTIFACT_CACHE_MAX_BYTES", 10)
+
+    class _Source(io.BytesIO):
+        def read(self, *args):
+            raise AssertionError("oversized archive was read")
+
+    service = SkillService(None, None)
+    await service._warm_download_artifact(object(), "1.0.0", _Source(b"x" * 100))
+    assert get_download_artifact_stats()["entries"] == 0
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 
@@ -7,6 +9,7 @@ async def test_user_execution_slot_blocks_second_acquire_when_limit_one(monkeypa
     from mcp_agentskills.core.utils.execution_control import acquire_execution_slot
 
     monkeypatch.setattr(settings_module.settings, "SKILL_MAX_CONCURRENT_EXECUTIONS_PER_USER", 1, raising=False)
+    monkeypatch.setattr(settings_module.settings, "SKILL_EXECUTION_QUEUE_TIMEOUT_SECONDS", 0.05, raising=False)
 
     release = await acquire_execution_slot("u-1", "t-1")
     assert release is not None
@@ -15,6 +18,71 @@ async def test_user_execution_slot_blocks_second_acquire_when_limit_one(monkeypa
     await release()
 
 
+@pytest.mark.asyncio
+async def test_queued_execution_slot_is_granted_when_released(monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils.execution_control import (
+        acquire_execution_slot,
+        get_execution_queue_stats,
+    )
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_MAX_CONCURRENT_EXECUTIONS_PER_USER", 1, raising=False)
+    monkeypatch.setattr(settings_module.settings, "SKILL_EXECUTION_QUEUE_TIMEOUT_SECONDS", 5, raising=False)
+
+    release = await acquire_execution_slot("u-queue", None)
+    waiting = asyncio.create_task(acquire_execution_slot("u-queue", None))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    assert get_execution_queue_stats()["depth"] == 1
+    await release()
+    second = await asyncio.wait_for(waiting, timeout=1)
+    assert second is not None
+    await second()
+    stats = get_execution_queue_stats()
+    assert stats["depth"] == 0
+    assert stats["admitted_after_wait"] >= 1
+    assert stats["wait_seconds"]["count"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_is_fifo_per_tenant_and_weighted_across_tenants():
+    from mcp_agentskills.core.utils.admission_queue import AdmissionQueue
+
+    queue = AdmissionQueue(poll_seconds=60)
+    capacity = {"free": 0}
+    order = []
+
+    def admit_for(name):
+        async def _admit():
+            if capacity["free"] <= 0:
+                return None
+            capacity["free"] -= 1
+            order.append(name)
+
+            async def _release():
+                capacity["free"] += 1
+
+            return _release
+
+        return _admit
+
+    names = ["a1", "a2", "a3", "a4", "b1", "b2"]
+    tasks = []
+    for name in names:
+        weight = 3 if name.startswith("a") else 1
+        tasks.append(asyncio.create_task(queue.acquire(name[0], admit_for(name), timeout=5, weight=weight)))
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert queue.depth == len(names)
+    capacity["free"] = len(names)
+    queue.notify()
+    await asyncio.gather(*tasks)
+    assert [name for name in order if name.startswith("a")] == ["a1", "a2", "a3", "a4"]
+    assert order.index("b1") < order.index("a4")
+    assert order.index("b2") > order.index("a3")
+    await queue.close()
+
+
 def test_workdir_quota_rejects_oversized_directory(tmp_path):
     from mcp_agentskills.core.utils.execution_control import is_within_workdir_quota
 
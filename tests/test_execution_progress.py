@@ -0,0 +1,96 @@
+import asyncio
+import sys
+
+import pytest
+
+from mcp_agentskills.core.utils.execution_control import capture_execution_output
+from mcp_agentskills.core.utils.progress import ProgressReporter
+
+
+@pytest.mark.asyncio
+async def test_progress_reporter_coalesces_chunks_and_decodes_split_utf8():
+    sent = []
+
+    async def send(progress, total, message):
+        sent.append((progress, message))
+
+    reporter = ProgressReporter(send, interval_seconds=60, max_message_bytes=1024)
+    await reporter.feed("stdout", b"first ")
+    await reporter.feed("stdout", "café".encode()[:4])
+    await reporter.feed("stdout", "café".encode()[4:])
+    await reporter.feed("stderr", b"oops")
+    assert len(sent) == 1
+    await reporter.close()
+    assert sent[0] == (6.0, "first ")
+    assert sent[1] == (15.0, "café[stderr] oops")
+
+
+@pytest.mark.asyncio
+async def test_progress_reporter_stops_after_send_failure():
+    calls = 0
+
+    async def send(progress, total, message):
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("client gone")
+
+    reporter = ProgressReporter(send, interval_seconds=0, max_message_bytes=1024)
+    await reporter.feed("stdout", b"a")
+    await reporter.feed("stdout", b"b")
+    await reporter.close()
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_progress_reporter_flushes_pending_text_on_timer():
+    sent = []
+
+    async def send(progress, total, message):
+        sent.append(message)
+
+    reporter = ProgressReporter(send, interval_seconds=0.05, max_message_bytes=1024)
+    await reporter.feed("stdout", b"first ")
+    await reporter.feed("stdout", b"second")
+    assert sent == ["first "]
+    await asyncio.sleep(0.2)
+    assert sent == ["first ", "second"]
+    await reporter.feed("stderr", b"\xc3")
+    await reporter.close()
+    assert sent[-1] == "[stderr] \ufffd"
+
+
+@pytest.mark.asyncio
+async def test_execution_output_is_streamed_as_mcp_progress(monkeypatch):
+    from fastmcp import Client, FastMCP
+
+    from mcp_agentskills.config import settings as settings_module
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_PROGRESS_INTERVAL_SECONDS", 0, raising=False)
+    server = FastMCP("progress-test")
+
+    @server.tool
+    async def run_script() -> str:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            "import sys, time\n"
+            "for i in range(3):\n"
+            "    print(f'line {i}', flush=True)\n"
+            "    time.sleep(0.05)\n",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        captured = await capture_execution_output(proc, 30)
+        return captured.stdout.decode()
+
+    messages = []
+
+    async def on_progress(progress, total, message):
+        messages.append(message)
+
+    async with Client(server, progress_handler=on_progress) as client:
+        result = await client.call_tool("run_script", {})
+
+    assert result.data == "line 0\nline 1\nline 2\n"
+    assert len(messages) >= 2
+    assert "".join(messages) == "line 0\nline 1\nline 2\n"
@@ -0,0 +1,69 @@
+import os
+import time
+
+import pytest
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils import skill_archive
+from mcp_agentskills.core.utils.local_archive_cache import (
+    get_local_cache_dir,
+    get_local_cache_stats,
+    reset_local_cache_index,
+    run_local_cache_janitor,
+)
+
+
+@pytest.fixture(autouse=True)
+def _local_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "ENABLE_LOCAL_CACHE_ENCRYPTION", False)
+    monkeypatch.setattr(settings, "SKILL_CACHE_TTL_SECONDS", 3600)
+    monkeypatch.setattr(settings, "SKILL_LOCAL_CACHE_MAX_BYTES", 250)
+    reset_local_cache_index()
+    yield
+    reset_local_cache_index()
+
+
+def test_local_cache_evicts_least_recently_used_over_budget():
+    paths = [skill_archive._local_cache_path("user", "skill", f"1.0.{index}") for index in range(4)]
+    for path in paths[:3]:
+        skill_archive._write_local_cache(path, b"x" * 80)
+    assert skill_archive._read_local_cache(paths[0]) == b"x" * 80
+    skill_archive._write_local_cache(paths[3], b"y" * 80)
+
+    assert paths[0].exists()
+    assert not paths[1].exists()
+    assert paths[2].exists() and paths[3].exists()
+    assert skill_archive._read_local_cache(paths[1]) is None
+    stats = get_local_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 240
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["writes"] == 4
+
+
+def test_local_cache_janitor_expires_and_reconciles(monkeypatch):
+    fresh = skill_archive._local_cache_path("user", "skill", "2.0.0")
+    stale = skill_archive._local_cache_path("user", "other", "1.0.0")
+    skill_archive._write_local_cache(fresh, b"a" * 100)
+    skill_archive._write_local_cache(stale, b"b" * 100)
+    old = time.time() - 7200
+    os.utime(stale, (old, old))
+    leftover = fresh.with_name(".2.0.0.cache.dead.tmp")
+    leftover.write_bytes(b"partial")
+    os.utime(leftover, (old, old))
+    external = get_local_cache_dir() / "user" / "skill" / "3.0.0.cache"
+    external.write_bytes(b"c" * 200)
+
+    result = run_local_cache_janitor()
+
+    assert result == {"expired": 1, "evicted": 1}
+    assert not stale.exists()
+    assert not stale.parent.exists()
+    assert not leftover.exists()
+    assert not fresh.exists()
+    assert external.exists()
+    stats = get_local_cache_stats()
+    assert stats["bytes"] == 200
+    assert stats["janitor_runs"] == 1
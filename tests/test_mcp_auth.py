@@ -36,3 +36,69 @@ async def test_api_token_verifier_accepts_valid_token(async_session):
     assert get_current_user_id() == str(user.id)
     set_current_user_id(None)
     reset_session_provider()
+
+
+@pytest.mark.asyncio
+async def test_api_token_verifier_caches_principal_until_revoked(async_session):
+    from mcp_agentskills.core.utils.principal_cache import reset_principal_cache
+
+    reset_principal_cache()
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create(email="cached@example.com", username="cached", password="password")
+    service = TokenService(TokenRepository(async_session), user_repo)
+    token, token_value = await service.create_token_with_value(user, name="cached")
+    sessions_opened = []
+
+    async def session_provider():
+        sessions_opened.append(True)
+        yield async_session
+
+    set_session_provider(session_provider)
+    verifier = ApiTokenVerifier()
+    assert await verifier.verify_token(token_value) is not None
+    assert await verifier.verify_token(token_value) is not None
+    assert len(sessions_opened) == 1
+
+    await service.revoke_token(user, token.id)
+    _, error = await verifier.verify_token_with_error(token_value)
+    assert error is not None
+    assert error[0] == "TOKEN_REVOKED"
+    set_current_user_id(None)
+    reset_session_provider()
+    reset_principal_cache()
+
+
+@pytest.mark.asyncio
+async def test_api_token_verifier_cached_principal_respects_expiry(async_session):
+    from datetime import datetime, timedelta, timezone
+
+    from mcp_agentskills.core.utils import principal_cache
+
+    principal_cache.reset_principal_cache()
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create(email="expiring@example.com", username="expiring", password="password")
+    service = TokenService(TokenRepository(async_session), user_repo)
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    token, token_value = await service.create_token_with_value(user, name="expiring", expires_at=expires_at)
+
+    async def session_provider():
+        yield async_session
+
+    set_session_provider(session_provider)
+    verifier = ApiTokenVerifier()
+    assert await verifier.verify_token(token_value) is not None
+
+    token_hash = token.token_hash
+    principal_cache.cache_principal(
+        token_hash,
+        token_id=token.id,
+        user_id=user.id,
+        user_active=True,
+        expires_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+    )
+    _, error = await verifier.verify_token_with_error(token_value)
+    assert error is not None
+    assert error[0] == "TOKEN_EXPIRED"
+    assert principal_cache.get_cached_principal(token_hash) is None
+    set_current_user_id(None)
+    reset_session_provider()
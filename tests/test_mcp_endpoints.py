@@ -90,6 +90,8 @@ async def test_mcp_token_expired_returns_code(client, async_session):
 
 @pytest.mark.asyncio
 async def test_mcp_valid_token_marks_used_once(client, async_session, monkeypatch):
+    from mcp_agentskills.core.metrics import token_usage
+
     user_repo = UserRepository(async_session)
     user = await user_repo.create(email="used@example.com", username="used", password="pass1234")
     service = TokenService(TokenRepository(async_session), user_repo)
@@ -97,26 +99,30 @@ async def test_mcp_valid_token_marks_used_once(client, async_session, monkeypatc
     assert token.last_used_at is None
 
     calls = {"count": 0}
-    original_mark_used = TokenRepository.mark_used
+    original_bulk_mark_used = TokenRepository.bulk_mark_used
 
-    async def wrapped_mark_used(self, token_obj):
+    async def wrapped_bulk_mark_used(self, usages):
         calls["count"] += 1
-        return await original_mark_used(self, token_obj)
+        return await original_bulk_mark_used(self, usages)
 
-    monkeypatch.setattr(TokenRepository, "mark_used", wrapped_mark_used)
+    monkeypatch.setattr(TokenRepository, "bulk_mark_used", wrapped_bulk_mark_used)
 
     async def session_provider():
         yield async_session
 
     set_mcp_session_provider(session_provider)
+    token_usage.set_session_provider(session_provider)
     try:
         await client.post("/mcp", headers={"Authorization": f"Bearer {value}"})
+        assert token.id in token_usage.pending_token_usage()
+        assert calls["count"] == 0
+        await token_usage.flush_token_usage()
     finally:
         reset_mcp_session_provider()
+        token_usage.reset_session_provider()
 
-    refreshed = await service.token_repo.get_by_id(token.id)
-    assert refreshed is not None
-    assert refreshed.last_used_at is not None
+    await async_session.refresh(token)
+    assert token.last_used_at is not None
     assert calls["count"] == 1
 
 
@@ -5,6 +5,8 @@ from sqlalchemy import func, select
 
 from mcp_agentskills.config.settings import settings
 from mcp_agentskills.core.metrics.tool_call_metrics import (
+    flush_tool_call_metrics,
+    get_tool_call_metrics_stats,
     record_tool_call,
     reset_session_provider,
     set_session_provider,
@@ -28,6 +30,7 @@ async def test_tool_call_metrics_use_hour_bucket_counts(async_session):
     try:
         await record_tool_call("load_skill", output="ok")
         await record_tool_call("load_skill", output=tool_error_payload("bad", "ANY_ERROR"))
+        await flush_tool_call_metrics()
     finally:
         set_current_user_id(None)
         reset_session_provider()
@@ -61,6 +64,7 @@ async def test_tool_call_metrics_disabled_by_enable_metrics(async_session):
     set_current_user_id(str(user.id))
     try:
         await record_tool_call("load_skill", output="ok")
+        await flush_tool_call_metrics()
     finally:
         settings.ENABLE_METRICS = original_enable
         set_current_user_id(None)
@@ -70,3 +74,63 @@ async def test_tool_call_metrics_disabled_by_enable_metrics(async_session):
         select(func.coalesce(func.sum(RequestMetric.total_count), 0)).where(RequestMetric.user_id == user.id)
     )
     assert int(result.scalar_one()) == 0
+
+
+@pytest.mark.asyncio
+async def test_tool_call_metrics_batch_deltas_into_one_flush(async_session, monkeypatch):
+    from mcp_agentskills.repositories.request_metric import RequestMetricRepository
+
+    user_repo = UserRepository(async_session)
+    user = await user_repo.create(email="tool-metric-batch@example.com", username="toolbatch", password="pass1234")
+
+    async def session_provider():
+        yield async_session
+
+    calls = {"count": 0}
+    original_upsert = RequestMetricRepository.upsert_hour_buckets
+
+    async def wrapped_upsert(self, rows):
+        calls["count"] += 1
+        return await original_upsert(self, rows)
+
+    monkeypatch.setattr(RequestMetricRepository, "upsert_hour_buckets", wrapped_upsert)
+    set_session_provider(session_provider)
+    set_current_user_id(str(user.id))
+    try:
+        await flush_tool_call_metrics()
+        calls["count"] = 0
+        for _ in range(5):
+            await record_tool_call("load_skill", output="ok")
+        assert calls["count"] == 0
+        assert await flush_tool_call_metrics() == 5
+        await record_tool_call("load_skill", exception=RuntimeError("boom"))
+        assert await flush_tool_call_metrics() == 1
+    finally:
+        set_current_user_id(None)
+        reset_session_provider()
+
+    assert calls["count"] == 2
+    row = await async_session.execute(select(RequestMetric).where(RequestMetric.user_id == user.id))
+    metric = row.scalar_one()
+    assert (metric.total_count, metric.success_count, metric.failure_count) == (6, 5, 1)
+
+
+@pytest.mark.asyncio
+async def test_tool_call_metrics_drop_new_buckets_when_full(monkeypatch):
+    from mcp_agentskills.core.metrics import tool_call_metrics
+
+    monkeypatch.setattr(settings, "TOOL_CALL_METRICS_MAX_PENDING_BUCKETS", 1)
+    monkeypatch.setattr(tool_call_metrics, "_pending", {})
+    dropped_before = get_tool_call_metrics_stats()["dropped_deltas"]
+    try:
+        set_current_user_id("metrics-user-a")
+        await record_tool_call("load_skill", output="ok")
+        await record_tool_call("load_skill", output="ok")
+        set_current_user_id("metrics-user-b")
+        await record_tool_call("load_skill", output="ok")
+    finally:
+        set_current_user_id(None)
+
+    stats = get_tool_call_metrics_stats()
+    assert stats["pending_buckets"] == 1
+    assert stats["dropped_deltas"] == dropped_before + 1
@@ -8,8 +8,11 @@ import pytest
 from sqlalchemy import select
 
 from mcp_agentskills.core.security.jwt_utils import create_access_token
+from mcp_agentskills.core.utils.skill_storage import (
+    get_skill_versions_dir,
+    get_user_skill_dir,
+)
 from mcp_agentskills.core.utils.user_context import set_current_user_id
-from mcp_agentskills.core.utils.skill_storage import get_skill_versions_dir, get_user_skill_dir
 from mcp_agentskills.models.audit_log import AuditLog
 from mcp_agentskills.models.skill import Skill
 from mcp_agentskills.models.skill_version import SkillVersion
@@ -127,7 +130,10 @@ async def test_skill_resource_ops_return_metadata(async_session, tmp_path, monke
     )
     (version_dir / "SKILL.md").write_text(skill_md, encoding="utf-8")
     set_current_user_id(str(user.id))
-    from mcp_agentskills.core.tools.skill_resource_ops import SkillDetailResourceOp, SkillListResourceOp
+    from mcp_agentskills.core.tools.skill_resource_ops import (
+        SkillDetailResourceOp,
+        SkillListResourceOp,
+    )
 
     list_op = SkillListResourceOp()
     await list_op.async_execute()
@@ -248,6 +254,78 @@ async def test_execute_skill_runs_entrypoint(async_session, tmp_path, monkeypatc
     assert result.scalar_one_or_none() is not None
 
 
+@pytest.mark.asyncio
+async def test_execute_skill_streams_coalesced_progress(async_session, tmp_path, monkeypatch):
+    monkeypatch.setenv("SKILL_STORAGE_PATH", str(tmp_path))
+    _install_flowllm_stubs(tmp_path, monkeypatch)
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import progress
+    from mcp_agentskills.db import session as db_session
+
+    monkeypatch.setattr(db_session, "get_async_session", lambda: _override_session(async_session))
+    monkeypatch.setattr(settings_module.settings, "ENABLE_EXECUTION_PROGRESS", True)
+    monkeypatch.setattr(settings_module.settings, "SKILL_PROGRESS_INTERVAL_SECONDS", 60)
+    messages = []
+
+    class FakeContext:
+        async def report_progress(self, progress, total=None, message=None):
+            messages.append(message)
+
+    monkeypatch.setattr(progress, "_current_mcp_context", FakeContext)
+    user = User(email="progress@example.com", username="progress", hashed_password="x")
+    async_session.add(user)
+    await async_session.commit()
+    await async_session.refresh(user)
+    skill = Skill(
+        user_id=user.id,
+        name="skillprogress",
+        description="desc",
+        tags=[],
+        skill_dir=str(get_user_skill_dir(user.id, "skillprogress")),
+        current_version="1.0.0",
+    )
+    async_session.add(skill)
+    await async_session.commit()
+    await async_session.refresh(skill)
+    async_session.add(
+        SkillVersion(
+            skill_id=skill.id,
+            version="1.0.0",
+            description="desc",
+            dependencies=[],
+            dependency_spec={"schema_version": 1},
+            dependency_spec_version="1",
+            metadata_json={"name": "skillprogress", "description": "desc", "version": "1.0.0"},
+        )
+    )
+    await async_session.commit()
+    version_dir = get_skill_versions_dir(user.id, skill.name) / "1.0.0"
+    version_dir.mkdir(parents=True, exist_ok=True)
+    (version_dir / "run.py").write_text(
+        "import sys, time\n"
+        "print('line 0', flush=True)\n"
+        "time.sleep(0.1)\n"
+        "for i in range(1, 20):\n"
+        "    print(f'line {i}', flush=True)\n"
+        "sys.stderr.write('warn\\n')\n",
+        encoding="utf-8",
+    )
+    skill_md = "---\nname: skillprogress\ndescription: desc\nentrypoint: run.py\n---\nbody"
+    (version_dir / "SKILL.md").write_text(skill_md, encoding="utf-8")
+    set_current_user_id(str(user.id))
+    from mcp_agentskills.core.tools.execute_skill_op import ExecuteSkillOp
+
+    op = ExecuteSkillOp()
+    op.input_dict = {"skill_uuid": skill.id, "version": "1.0.0", "parameters": {}}
+    await op.async_execute()
+    payload = json.loads(op._output)
+    assert payload["result"]["status"] == "success"
+    assert 1 <= len(messages) <= 2
+    streamed = "".join(messages)
+    assert "".join(f"line {i}\n" for i in range(1, 20)) in streamed.replace("[stderr] warn\n", "")
+    assert "[stderr] warn\n" in streamed
+
+
 @pytest.mark.asyncio
 async def test_mcp_authorize_accepts_jwt(async_session, monkeypatch):
     user = User(email="jwt@example.com", username="jwt", hashed_password="x")
@@ -1,6 +1,6 @@
 import asyncio
-import json
 import importlib.util
+import json
 import sys
 from pathlib import Path
 from types import ModuleType
@@ -143,9 +143,12 @@ def load_command_whitelist():
 
 
 def test_load_skill_metadata_scopes_by_user_id(tmp_path, monkeypatch):
+    from mcp_agentskills.core.utils import skill_metadata_index
+
     user_context = load_user_context()
     command_whitelist = load_command_whitelist()
     install_mcp_package_stubs(monkeypatch, user_context, command_whitelist)
+    monkeypatch.setitem(sys.modules, "mcp_agentskills.core.utils.skill_metadata_index", skill_metadata_index)
     install_flowllm_stubs(tmp_path, monkeypatch)
 
     write_skill(tmp_path, "global_skill", "global", "global body")
@@ -281,3 +284,46 @@ def test_run_shell_command_uses_user_scoped_workdir(tmp_path, monkeypatch):
     asyncio.run(op.async_execute())
     expected_dir = str(tmp_path / "user-4" / "skill_cmd")
     assert f"cd {expected_dir}" in captured["command"]
+
+
+def test_run_shell_command_falls_back_to_pipreqs_without_dependency_env(tmp_path, monkeypatch):
+    from mcp_agentskills.config.settings import settings
+
+    user_context = load_user_context()
+    command_whitelist = load_command_whitelist()
+    install_mcp_package_stubs(monkeypatch, user_context, command_whitelist)
+    install_flowllm_stubs(tmp_path, monkeypatch)
+    monkeypatch.setattr(settings, "ENABLE_DEPENDENCY_ENVS", True)
+
+    write_skill(tmp_path / "user-5", "skill_deps", "user", "user body")
+
+    module_path = Path(__file__).resolve().parents[1] / "mcp_agentskills" / "core" / "tools" / "run_shell_command_op.py"
+    module = load_module("mcp_agentskills.core.tools.run_shell_command_op", module_path)
+
+    commands = []
+
+    async def fake_create_subprocess_shell(cmd, **_kwargs):
+        commands.append(cmd)
+
+        class Proc:
+            returncode = 0
+
+            async def communicate(self):
+                return b"ok", b""
+
+        return Proc()
+
+    async def no_dependency_env(_skill_name, _user_id):
+        return None
+
+    monkeypatch.setattr(module.asyncio, "create_subprocess_shell", fake_create_subprocess_shell)
+    monkeypatch.setattr(module.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(module, "_resolve_dependency_env", no_dependency_env)
+
+    user_context.set_current_user_id("user-5")
+    op = module.RunShellCommandOp(auto_install_deps=True)
+    op.input_dict = {"skill_name": "skill_deps", "command": "python main.py"}
+    asyncio.run(op.async_execute())
+    assert len(commands) == 2
+    assert "pipreqs . --force" in commands[0]
+    assert commands[1].endswith("python main.py")
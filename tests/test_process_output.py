@@ -0,0 +1,70 @@
+import asyncio
+import sys
+
+import pytest
+
+from mcp_agentskills.core.utils.process_output import (
+    BoundedOutput,
+    capture_process_output,
+)
+
+
+async def _spawn(code: str) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        code,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+
+def test_bounded_output_keeps_head_and_tail_windows():
+    sink = BoundedOutput(8)
+    for chunk in (b"abc", b"defgh", b"ijklmnop", b"qr"):
+        sink.feed(chunk)
+    assert sink.total == 18
+    assert sink.dropped == 10
+    assert sink.getvalue() == b"abcd\n... [10 bytes truncated] ...\nopqr"
+
+
+def test_bounded_output_keeps_everything_under_the_cap():
+    sink = BoundedOutput(16)
+    sink.feed(b"hello ")
+    sink.feed(b"world")
+    assert sink.getvalue() == b"hello world"
+
+
+@pytest.mark.asyncio
+async def test_capture_drains_large_output_within_window():
+    proc = await _spawn(
+        "import sys\n"
+        "sys.stdout.write('START' + 'x' * 2000000 + 'END')\n"
+        "sys.stderr.write('err')\n"
+    )
+    captured = await capture_process_output(proc, timeout_seconds=30, max_bytes=64)
+    assert proc.returncode == 0
+    assert captured.stdout.startswith(b"START")
+    assert captured.stdout.endswith(b"END")
+    assert len(captured.stdout) < 200
+    assert captured.stderr == b"err"
+    assert captured.total_bytes == 2000011
+    assert captured.truncated
+    assert not captured.output_limited
+
+
+@pytest.mark.asyncio
+async def test_capture_kills_producer_past_hard_cap():
+    proc = await _spawn("import sys\nwhile True:\n    sys.stdout.write('y' * 65536)\n")
+    captured = await capture_process_output(proc, timeout_seconds=30, max_bytes=32, hard_cap_bytes=1000000)
+    assert captured.output_limited
+    assert not captured.timed_out
+    assert proc.returncode is not None and proc.returncode != 0
+
+
+@pytest.mark.asyncio
+async def test_capture_kills_process_on_timeout():
+    proc = await _spawn("import sys, time\nsys.stdout.write('partial')\nsys.stdout.flush()\ntime.sleep(30)\n")
+    captured = await capture_process_output(proc, timeout_seconds=0.5, max_bytes=1024)
+    assert captured.timed_out
+    assert captured.stdout == b"partial"
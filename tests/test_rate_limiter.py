@@ -0,0 +1,91 @@
+import httpx
+import pytest
+from starlette.requests import Request
+
+from mcp_agentskills.api_app import create_application
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.middleware.rate_limit import resolve_rate_limit_key
+from mcp_agentskills.core.security.jwt_utils import create_access_token
+from mcp_agentskills.core.security.token import hash_token
+from mcp_agentskills.core.utils.principal_cache import (
+    cache_principal,
+    reset_principal_cache,
+)
+from mcp_agentskills.core.utils.rate_limiter import TokenBucketLimiter
+
+
+def _request(authorization: str | None = None, host: str = "10.0.0.1") -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "headers": headers, "client": (host, 1234)})
+
+
+def test_token_bucket_allows_burst_then_refills():
+    limiter = TokenBucketLimiter("test-refill", capacity=2, window_seconds=10, max_keys=10)
+    assert limiter.hit("a", now=0.0).allowed
+    assert limiter.hit("a", now=0.0).allowed
+    blocked = limiter.hit("a", now=0.0)
+    assert not blocked.allowed
+    assert blocked.retry_after == pytest.approx(5.0)
+    assert not limiter.hit("a", now=4.0).allowed
+    assert limiter.hit("a", now=5.0).allowed
+    assert limiter.hit("b", now=5.0).allowed
+    assert limiter.stats()["limited"] == 2
+
+
+def test_token_bucket_evicts_least_recently_used_keys():
+    limiter = TokenBucketLimiter("test-evict", capacity=1, window_seconds=60, max_keys=2, shards=1)
+    limiter.hit("a", now=0.0)
+    limiter.hit("b", now=0.0)
+    limiter.hit("a", now=0.0)
+    limiter.hit("c", now=0.0)
+    assert len(limiter) == 2
+    assert limiter.stats()["evictions"] == 1
+    assert not limiter.hit("a", now=0.0).allowed
+    assert limiter.hit("b", now=0.0).allowed
+
+
+def test_rate_limit_key_strategies():
+    jwt = create_access_token("user-1")
+    assert resolve_rate_limit_key(_request(f"Bearer {jwt}"), "ip") == "ip:10.0.0.1"
+    assert resolve_rate_limit_key(_request(f"Bearer {jwt}"), "token") == f"token:{hash_token(jwt)}"
+    assert resolve_rate_limit_key(_request(f"Bearer {jwt}"), "user") == "user:user-1"
+    assert resolve_rate_limit_key(_request("Bearer ask_live_x"), "user") == "ip:10.0.0.1"
+    assert resolve_rate_limit_key(_request("Bearer ask_live_x"), "token") == "ip:10.0.0.1"
+    assert resolve_rate_limit_key(_request(), "user") == "ip:10.0.0.1"
+
+
+def test_rate_limit_key_uses_cached_api_token_principal():
+    reset_principal_cache()
+    try:
+        cache_principal(hash_token("ask_live_x"), "token-1", "user-2", True, None)
+        assert resolve_rate_limit_key(_request("Bearer ask_live_x"), "user") == "user:user-2"
+        assert resolve_rate_limit_key(_request("Bearer ask_live_x"), "token") == f"token:{hash_token('ask_live_x')}"
+        cache_principal(hash_token("ask_live_y"), "token-2", "user-3", False, None)
+        assert resolve_rate_limit_key(_request("Bearer ask_live_y"), "token") == "ip:10.0.0.1"
+    finally:
+        reset_principal_cache()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_by_token_isolates_clients():
+    original = (settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW, settings.RATE_LIMIT_KEY)
+    settings.RATE_LIMIT_REQUESTS = 1
+    settings.RATE_LIMIT_WINDOW = 60
+    settings.RATE_LIMIT_KEY = "token"
+    one = create_access_token("user-1")
+    two = create_access_token("user-2")
+    try:
+        app = create_application()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as session:
+            first = await session.get("/health", headers={"Authorization": f"Bearer {one}"})
+            second = await session.get("/health", headers={"Authorization": f"Bearer {two}"})
+            third = await session.get("/health", headers={"Authorization": f"Bearer {one}"})
+            forged = await session.get("/health", headers={"Authorization": "Bearer forged"})
+    finally:
+        settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW, settings.RATE_LIMIT_KEY = original
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert third.status_code == 429
+    assert forged.status_code == 200
+    assert int(third.headers["retry-after"]) >= 1
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from mcp_agentskills.core.utils.shared_counters import (
+    MemoryCounterBackend,
+    SqlCounterBackend,
+)
+
+
+@pytest.fixture
+def sql_backend(async_engine, monkeypatch):
+    from mcp_agentskills.db import session as db_session
+
+    session_maker = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    monkeypatch.setattr(db_session, "async_session_maker", session_maker)
+    return SqlCounterBackend()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_leases_are_all_or_nothing():
+    backend = MemoryCounterBackend()
+    first = await backend.acquire_lease([("user:a", 1), ("team:t", 2)], 60)
+    assert first is not None
+    assert await backend.acquire_lease([("user:a", 1), ("team:t", 2)], 60) is None
+    second = await backend.acquire_lease([("user:b", 1), ("team:t", 2)], 60)
+    assert second is not None
+    assert await backend.acquire_lease([("user:c", 1), ("team:t", 2)], 60) is None
+    await backend.release_lease(first)
+    assert await backend.acquire_lease([("user:c", 1), ("team:t", 2)], 60) is not None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expired_leases_free_slots():
+    backend = MemoryCounterBackend()
+    assert await backend.acquire_lease([("user:a", 1)], 0.01) is not None
+    await asyncio.sleep(0.02)
+    assert await backend.acquire_lease([("user:a", 1)], 60) is not None
+    assert await backend.prune() == 0
+
+
+@pytest.mark.asyncio
+async def test_sql_backend_shares_rate_limit_between_instances(sql_backend):
+    other = SqlCounterBackend()
+    assert (await sql_backend.consume("test", "k-shared", 2, 60)).allowed
+    assert (await other.consume("test", "k-shared", 2, 60)).allowed
+    blocked = await sql_backend.consume("test", "k-shared", 2, 60)
+    assert not blocked.allowed
+    assert blocked.retry_after > 0
+    assert (await other.consume("test", "k-other", 2, 60)).allowed
+
+
+@pytest.mark.asyncio
+async def test_sql_backend_enforces_slots_and_lease_expiry(sql_backend):
+    first = await sql_backend.acquire_lease([("user:sql-a", 1), ("team:sql-t", 5)], 60)
+    assert first is not None
+    assert await SqlCounterBackend().acquire_lease([("user:sql-a", 1)], 60) is None
+    await sql_backend.release_lease(first)
+    expiring = await sql_backend.acquire_lease([("user:sql-a", 1)], 0.01)
+    assert expiring is not None
+    await asyncio.sleep(0.02)
+    assert await sql_backend.acquire_lease([("user:sql-a", 1)], 60) is not None
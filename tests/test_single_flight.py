@@ -0,0 +1,83 @@
+import asyncio
+import io
+
+import pytest
+
+from mcp_agentskills.core.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight("test-coalesce")
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    tasks = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert flight.in_flight("key")
+    release.set()
+    assert await asyncio.gather(*tasks) == [1, 1, 1, 1, 1]
+    assert calls == 1
+    assert not flight.in_flight("key")
+    assert flight.stats()["coalesced"] == 4
+    assert await flight.do("key", work) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_survives_leader_cancel():
+    flight = SingleFlight("test-errors")
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise ValueError("boom")
+
+    tasks = [asyncio.create_task(flight.do("key", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "done"
+
+    leader = asyncio.create_task(flight.do("cancel", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("cancel", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_concurrent_archive_loads_hit_backend_once(tmp_path, monkeypatch):
+    import time
+
+    from mcp_agentskills.config.settings import settings
+    from mcp_agentskills.core.utils import skill_archive
+
+    monkeypatch.setattr(settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "SKILL_ARCHIVE_BACKEND", "s3")
+    gets = []
+
+    class SlowClient:
+        def get_object(self, Bucket, Key, **kwargs):
+            gets.append(Key)
+            time.sleep(0.05)
+            return {"Body": io.BytesIO(b"archive")}
+
+    monkeypatch.setattr(skill_archive, "_get_s3_client", lambda: SlowClient())
+    results = await asyncio.gather(*(skill_archive.load_archive("u", "s", "1.0.0") for _ in range(6)))
+    assert results == [b"archive"] * 6
+    assert gets == ["u/s/1.0.0.zip"]
@@ -32,12 +32,12 @@ async def test_s3_archive_roundtrip(monkeypatch):
     stored = io.BytesIO()
 
     class FakeClient:
-        def put_object(self, Bucket, Key, Body):
+        def put_object(self, Bucket, Key, Body, **kwargs):
             stored.seek(0)
             stored.truncate(0)
             stored.write(Body)
 
-        def get_object(self, Bucket, Key):
+        def get_object(self, Bucket, Key, **kwargs):
             stored.seek(0)
             return {"Body": io.BytesIO(stored.read())}
 
@@ -85,10 +85,10 @@ async def test_s3_archive_falls_back_to_local_cache_when_offline(tmp_path, monke
     monkeypatch.setattr(settings_module.settings, "SKILL_CACHE_TTL_SECONDS", 3600)
 
     class FlakyClient:
-        def put_object(self, Bucket, Key, Body):
+        def put_object(self, Bucket, Key, Body, **kwargs):
             return None
 
-        def get_object(self, Bucket, Key):
+        def get_object(self, Bucket, Key, **kwargs):
             raise RuntimeError("network unavailable")
 
     monkeypatch.setattr(skill_archive, "_get_s3_client", lambda: FlakyClient())
@@ -97,3 +97,143 @@ async def test_s3_archive_falls_back_to_local_cache_when_offline(tmp_path, monke
     await skill_archive.save_archive("user-4", "skill-4", "4.0.0", payload)
     loaded = await skill_archive.load_archive("user-4", "skill-4", "4.0.0")
     assert loaded == payload
+
+
+@pytest.mark.asyncio
+async def test_io_executor_runs_blocking_calls_and_tracks_stats():
+    import threading
+
+    from mcp_agentskills.core.utils.io_executor import get_io_executor_stats, run_io
+
+    before = get_io_executor_stats()
+    caller_thread = threading.get_ident()
+    worker_thread = await run_io(threading.get_ident)
+    assert worker_thread != caller_thread
+
+    with pytest.raises(ValueError):
+        await run_io(int, "not-a-number")
+
+    after = get_io_executor_stats()
+    assert after["submitted"] == before["submitted"] + 2
+    assert after["completed"] == before["completed"] + 2
+    assert after["failed"] == before["failed"] + 1
+    assert after["queued"] == 0
+    assert after["active"] == 0
+    assert after["wait_seconds_max"] >= 0
+
+
+class _MemoryS3Client:
+    def __init__(self):
+        import threading
+
+        self.objects = {}
+        self.uploads = {}
+        self.calls = []
+        self._lock = threading.Lock()
+        self.active_parts = 0
+        self.max_active_parts = 0
+
+    def put_object(self, Bucket, Key, Body, Metadata=None):
+        self.calls.append("put_object")
+        self.objects[Key] = (bytes(Body), dict(Metadata or {}))
+
+    def create_multipart_upload(self, Bucket, Key, Metadata=None):
+        self.calls.append("create_multipart_upload")
+        self.uploads["u1"] = {"key": Key, "parts": {}, "metadata": dict(Metadata or {})}
+        return {"UploadId": "u1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        import time
+
+        with self._lock:
+            self.active_parts += 1
+            self.max_active_parts = max(self.max_active_parts, self.active_parts)
+        time.sleep(0.02)
+        self.uploads[UploadId]["parts"][PartNumber] = bytes(Body)
+        with self._lock:
+            self.active_parts -= 1
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(upload["parts"])
+        self.objects[Key] = (b"".join(upload["parts"][number] for number in numbers), upload["metadata"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+    def head_object(self, Bucket, Key):
+        body, metadata = self.objects[Key]
+        return {"ContentLength": len(body), "Metadata": metadata}
+
+    def get_object(self, Bucket, Key, Range=None):
+        body, _ = self.objects[Key]
+        if Range:
+            self.calls.append(f"range:{Range}")
+            first, last = Range.removeprefix("bytes=").split("-")
+            body = body[int(first) : int(last) + 1]
+        return {"Body": io.BytesIO(body)}
+
+
+@pytest.mark.asyncio
+async def test_s3_backend_multipart_upload_and_ranged_source(tmp_path, monkeypatch):
+    import hashlib
+
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_archive
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "SKILL_ARCHIVE_BACKEND", "s3")
+    monkeypatch.setattr(settings_module.settings, "SKILL_ARCHIVE_S3_BUCKET", "bucket")
+    monkeypatch.setattr(settings_module.settings, "SKILL_ARCHIVE_S3_MULTIPART_THRESHOLD_BYTES", 1000)
+    monkeypatch.setattr(settings_module.settings, "SKILL_ARCHIVE_S3_MULTIPART_PART_BYTES", 1000)
+    monkeypatch.setattr(settings_module.settings, "SKILL_ARCHIVE_S3_MULTIPART_CONCURRENCY", 3)
+    client = _MemoryS3Client()
+    monkeypatch.setattr(skill_archive, "_get_s3_client", lambda: client)
+
+    payload = os.urandom(4500)
+    await skill_archive.save_archive("user-5", "skill-5", "5.0.0", io.BytesIO(payload))
+    assert "create_multipart_upload" in client.calls
+    assert 1 < client.max_active_parts <= 3
+    stored, metadata = client.objects["user-5/skill-5/5.0.0.zip"]
+    assert stored == payload
+    assert metadata["sha256"] == hashlib.sha256(payload).hexdigest()
+
+    source = await skill_archive.open_archive_source("user-5", "skill-5", "5.0.0")
+    assert source.size == len(payload)
+    assert source.checksum == f"sha256:{metadata['sha256']}"
+    chunks = [chunk async for chunk in skill_archive.iter_archive_range(source, 100, 2099)]
+    assert b"".join(chunks) == payload[100:2100]
+    assert any(call.startswith("range:bytes=100-") for call in client.calls)
+
+    await skill_archive.save_archive("user-5", "skill-5", "5.0.1", b"small")
+    assert client.calls.count("put_object") == 1
+
+
+def test_s3_client_is_pooled_per_configuration(monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_archive
+
+    created = []
+    monkeypatch.setattr(skill_archive, "_create_s3_client", lambda options: created.append(options) or object())
+    skill_archive.reset_s3_client()
+    first = skill_archive._get_s3_client()
+    assert skill_archive._get_s3_client() is first
+    monkeypatch.setattr(settings_module.settings, "SKILL_ARCHIVE_S3_ENDPOINT", "https://other.test")
+    assert skill_archive._get_s3_client() is not first
+    assert len(created) == 2
+    skill_archive.reset_s3_client()
+
+
+def test_archive_source_read_range_handles_each_backing(tmp_path):
+    from mcp_agentskills.core.utils.skill_archive import ArchiveSource
+
+    payload = b"0123456789"
+    path = tmp_path / "archive.zip"
+    path.write_bytes(payload)
+    assert ArchiveSource(size=10, checksum="", data=payload).read_range(2, 3) == b"234"
+    assert ArchiveSource(size=10, checksum="", path=path).read_range(7, 10) == b"789"
+    fetched = ArchiveSource(size=10, checksum="", fetch=lambda offset, length: payload[offset : offset + length])
+    assert fetched.read_range(0, 2) == b"01"
+    assert ArchiveSource(size=0, checksum="").read_range(0, 5) == b""
@@ -0,0 +1,81 @@
+import hashlib
+import os
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def test_intern_version_dirs_share_identical_blobs(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_blobs
+    from mcp_agentskills.core.utils.skill_storage import get_skill_versions_dir
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "ENABLE_SKILL_BLOB_STORE", True)
+    versions_dir = get_skill_versions_dir("user-1", "alpha")
+    shared = b"print('shared')\n"
+    _write(versions_dir / "1.0.0" / "SKILL.md", b"v1")
+    _write(versions_dir / "1.0.0" / "scripts" / "run.py", shared)
+    _write(versions_dir / "1.1.0" / "SKILL.md", b"v2")
+    _write(versions_dir / "1.1.0" / "scripts" / "run.py", shared)
+
+    first = skill_blobs.intern_version_dir(versions_dir / "1.0.0")
+    second = skill_blobs.intern_version_dir(versions_dir / "1.1.0")
+
+    digest = hashlib.sha256(shared).hexdigest()
+    assert first["files"]["scripts/run.py"] == {"size": len(shared), "sha256": digest}
+    assert second["files"]["SKILL.md"]["sha256"] == hashlib.sha256(b"v2").hexdigest()
+    assert os.path.samefile(versions_dir / "1.0.0" / "scripts" / "run.py", versions_dir / "1.1.0" / "scripts" / "run.py")
+    assert os.path.samefile(versions_dir / "1.0.0" / "scripts" / "run.py", skill_blobs.get_blob_path(digest))
+    assert skill_blobs.load_manifest(versions_dir / "1.1.0") == second
+
+
+def test_delete_skill_tree_releases_unreferenced_blobs(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_blobs
+    from mcp_agentskills.core.utils.skill_storage import get_skill_versions_dir
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "ENABLE_SKILL_BLOB_STORE", True)
+    shared = b"shared between skills"
+    _write(get_skill_versions_dir("user-1", "alpha") / "1.0.0" / "common.txt", shared)
+    _write(get_skill_versions_dir("user-1", "alpha") / "1.0.0" / "only_alpha.txt", b"alpha")
+    _write(get_skill_versions_dir("user-1", "beta") / "1.0.0" / "common.txt", shared)
+    skill_blobs.intern_version_dir(get_skill_versions_dir("user-1", "alpha") / "1.0.0")
+    skill_blobs.intern_version_dir(get_skill_versions_dir("user-1", "beta") / "1.0.0")
+
+    skill_blobs.delete_skill_tree("user-1", "alpha")
+
+    assert not skill_blobs.get_blob_path(hashlib.sha256(b"alpha").hexdigest()).exists()
+    shared_blob = skill_blobs.get_blob_path(hashlib.sha256(shared).hexdigest())
+    assert shared_blob.read_bytes() == shared
+    assert (get_skill_versions_dir("user-1", "beta") / "1.0.0" / "common.txt").read_bytes() == shared
+
+
+def test_interned_blobs_are_read_only_and_executions_share_a_private_tree(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_blobs
+    from mcp_agentskills.core.utils.skill_storage import get_skill_versions_dir
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "ENABLE_SKILL_BLOB_STORE", True)
+    version_dir = get_skill_versions_dir("user-1", "alpha") / "1.0.0"
+    _write(version_dir / "scripts" / "run.py", b"shared")
+    manifest = skill_blobs.intern_version_dir(version_dir)
+    blob = skill_blobs.get_blob_path(manifest["files"]["scripts/run.py"]["sha256"])
+    assert blob.stat().st_mode & 0o777 == 0o444
+
+    run_dir = skill_blobs.ensure_execution_tree(version_dir)
+    copied = run_dir / "scripts" / "run.py"
+    assert not os.path.samefile(copied, blob)
+    with copied.open("r+b") as handle:
+        handle.write(b"SHARED")
+    assert blob.read_bytes() == b"shared"
+    assert skill_blobs.ensure_execution_tree(version_dir) == run_dir
+    assert copied.read_bytes() == b"SHARED"
+    assert sorted(path.name for path in skill_blobs.get_executions_dir().iterdir()) == [run_dir.name]
+    skill_blobs.delete_skill_tree("user-1", "alpha")
+    assert not run_dir.exists()
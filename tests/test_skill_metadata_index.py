@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+
+def _write_skill(base, name, description):
+    skill_dir = base / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    path = skill_dir / "SKILL.md"
+    path.write_text(f"---\nname: {name}\ndescription: {description}\n---\nbody\n", encoding="utf-8")
+    return path
+
+
+def _counting_parser(calls):
+    async def parser(content, path):
+        calls.append(path)
+        lines = dict(
+            line.split(":", 1) for line in content.split("---")[1].strip().splitlines() if ":" in line
+        )
+        return {"name": lines["name"].strip(), "description": lines["description"].strip()}
+
+    return parser
+
+
+@pytest.mark.asyncio
+async def test_metadata_index_reparses_only_changed_files(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_metadata_index
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_METADATA_INDEX_TTL_SECONDS", 0)
+    skill_metadata_index.reset_skill_metadata_index()
+    first = _write_skill(tmp_path, "alpha", "first")
+    _write_skill(tmp_path, "beta", "second")
+    calls: list[str] = []
+    parser = _counting_parser(calls)
+
+    entries = await skill_metadata_index.load_skill_metadata_entries(tmp_path, parser)
+    assert [metadata["name"] for _, metadata in entries] == ["alpha", "beta"]
+    assert len(calls) == 2
+
+    await skill_metadata_index.load_skill_metadata_entries(tmp_path, parser)
+    assert len(calls) == 2
+
+    first.write_text("---\nname: alpha\ndescription: updated text\n---\nbody\n", encoding="utf-8")
+    stat = first.stat()
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    entries = await skill_metadata_index.load_skill_metadata_entries(tmp_path, parser)
+    assert calls[2:] == [str(first)]
+    assert {metadata["name"]: metadata["description"] for _, metadata in entries}["alpha"] == "updated text"
+
+
+@pytest.mark.asyncio
+async def test_metadata_index_invalidation_picks_up_new_and_removed_skills(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_metadata_index
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "SKILL_METADATA_INDEX_TTL_SECONDS", 3600)
+    skill_metadata_index.reset_skill_metadata_index()
+    user_dir = (tmp_path / "user-1").resolve()
+    _write_skill(user_dir, "alpha", "first")
+    calls: list[str] = []
+    parser = _counting_parser(calls)
+
+    entries = await skill_metadata_index.load_skill_metadata_entries(user_dir, parser)
+    assert [metadata["name"] for _, metadata in entries] == ["alpha"]
+
+    _write_skill(user_dir, "gamma", "third")
+    entries = await skill_metadata_index.load_skill_metadata_entries(user_dir, parser)
+    assert [metadata["name"] for _, metadata in entries] == ["alpha"]
+
+    skill_metadata_index.invalidate_skill_metadata("user-1")
+    entries = await skill_metadata_index.load_skill_metadata_entries(user_dir, parser)
+    assert [metadata["name"] for _, metadata in entries] == ["alpha", "gamma"]
+    assert len(calls) == 2
+
+    (user_dir / "alpha" / "SKILL.md").unlink()
+    skill_metadata_index.invalidate_skill_metadata("user-1")
+    entries = await skill_metadata_index.load_skill_metadata_entries(user_dir, parser)
+    assert [metadata["name"] for _, metadata in entries] == ["gamma"]
+
+
+def test_discover_skill_files_skips_storage_internals(tmp_path):
+    from mcp_agentskills.core.utils.skill_storage import discover_skill_files
+
+    current = _write_skill(tmp_path / "user-1", "alpha", "current")
+    _write_skill(tmp_path / "user-1" / "alpha" / "_versions", "1.0.0", "snapshot")
+    _write_skill(tmp_path / "user-1" / "alpha" / "_versions", "1.1.0", "snapshot")
+    _write_skill(tmp_path / "_archives" / "user-1", "alpha", "archived")
+    _write_skill(tmp_path / "_local_cache" / "user-1", "alpha", "cached")
+    global_skill = _write_skill(tmp_path, "shared", "global")
+    _write_skill(tmp_path / "a" / "b" / "c", "deep", "too deep")
+
+    skill_files, scanned_dirs = discover_skill_files(tmp_path, max_depth=3)
+
+    assert skill_files == sorted([current, global_skill])
+    assert all("_versions" not in str(path) for path in scanned_dirs)
+    assert tmp_path / "user-1" in scanned_dirs
@@ -0,0 +1,119 @@
+import os
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_publish_hardlinks_and_removes_stale_files(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_storage
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "SKILL_PUBLISH_MODE", "hardlink")
+    monkeypatch.setattr(skill_storage, "_reflink_file", lambda _source, _target: False)
+    versions_dir = skill_storage.get_skill_versions_dir("user-1", "alpha")
+    _write(versions_dir / "1.0.0" / "SKILL.md", "v1")
+    _write(versions_dir / "1.0.0" / "old" / "legacy.py", "legacy")
+    _write(versions_dir / "2.0.0" / "SKILL.md", "v2")
+    _write(versions_dir / "2.0.0" / "scripts" / "run.py", "run")
+
+    root_dir = skill_storage.get_user_skill_dir("user-1", "alpha")
+    first = skill_storage.publish_version_files("user-1", "alpha", versions_dir / "1.0.0")
+    assert first["hardlink"] == 2
+    assert (root_dir / "old" / "legacy.py").read_text() == "legacy"
+
+    counts = skill_storage.publish_version_files("user-1", "alpha", versions_dir / "2.0.0")
+    assert counts["hardlink"] == 2
+    assert (root_dir / "SKILL.md").read_text() == "v2"
+    assert os.path.samefile(root_dir / "SKILL.md", versions_dir / "2.0.0" / "SKILL.md")
+    assert not (root_dir / "old").exists()
+    assert (versions_dir / "1.0.0" / "old" / "legacy.py").exists()
+    assert not [path for path in root_dir.iterdir() if path.name.startswith(".publish-")]
+
+    again = skill_storage.publish_version_files("user-1", "alpha", versions_dir / "2.0.0")
+    assert again["unchanged"] == 2
+
+    skill_storage.write_file_bytes(root_dir / "SKILL.md", b"edited")
+    assert (versions_dir / "2.0.0" / "SKILL.md").read_text() == "v2"
+
+
+def test_publish_copies_when_links_unavailable(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_storage
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "SKILL_PUBLISH_MODE", "auto")
+    monkeypatch.setattr(skill_storage, "_reflink_file", lambda _source, _target: False)
+    version_dir = skill_storage.get_skill_versions_dir("user-2", "beta") / "1.0.0"
+    _write(version_dir / "SKILL.md", "body")
+
+    counts = skill_storage.publish_version_files("user-2", "beta", version_dir)
+
+    published = skill_storage.get_user_skill_dir("user-2", "beta") / "SKILL.md"
+    assert counts["copy"] == 1
+    assert published.read_text() == "body"
+    assert not os.path.samefile(published, version_dir / "SKILL.md")
+
+
+def test_publish_detects_changes_with_matching_size_and_mtime(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_storage
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "SKILL_PUBLISH_MODE", "copy")
+    versions_dir = skill_storage.get_skill_versions_dir("user-3", "gamma")
+    first = _write(versions_dir / "1.0.0" / "SKILL.md", "aaaa")
+    second = _write(versions_dir / "2.0.0" / "SKILL.md", "bbbb")
+    stat = first.stat()
+    os.utime(second, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    skill_storage.publish_version_files("user-3", "gamma", versions_dir / "1.0.0")
+    published = skill_storage.get_user_skill_dir("user-3", "gamma") / "SKILL.md"
+    os.utime(published, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    digest = skill_storage.hash_file(second)[0]
+    counts = skill_storage.publish_version_files("user-3", "gamma", versions_dir / "2.0.0", {"SKILL.md": digest})
+
+    assert counts["copy"] == 1
+    assert published.read_text() == "bbbb"
+    again = skill_storage.publish_version_files("user-3", "gamma", versions_dir / "2.0.0", {"SKILL.md": digest})
+    assert again["unchanged"] == 1
+
+
+def test_publish_swaps_the_whole_tree_and_keeps_versions(tmp_path, monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_storage
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings_module.settings, "SKILL_PUBLISH_MODE", "copy")
+    versions_dir = skill_storage.get_skill_versions_dir("user-4", "delta")
+    _write(versions_dir / "1.0.0" / "SKILL.md", "v1")
+    _write(versions_dir / "1.0.0" / "a.py", "a")
+    _write(versions_dir / "2.0.0" / "SKILL.md", "v2")
+    root_dir = skill_storage.get_user_skill_dir("user-4", "delta")
+    skill_storage.publish_version_files("user-4", "delta", versions_dir / "1.0.0")
+    before = root_dir.stat().st_ino
+
+    swaps = []
+    original = skill_storage._swap_dirs
+
+    def record_swap(staging_dir, target_dir):
+        swaps.append(sorted(path.relative_to(staging_dir).as_posix() for path in staging_dir.rglob("*")))
+        original(staging_dir, target_dir)
+
+    monkeypatch.setattr(skill_storage, "_swap_dirs", record_swap)
+    skill_storage.publish_version_files("user-4", "delta", versions_dir / "2.0.0")
+
+    assert swaps == [["SKILL.md", "_versions"]]
+    assert root_dir.stat().st_ino != before
+    assert (root_dir / "SKILL.md").read_text() == "v2"
+    assert not (root_dir / "a.py").exists()
+    assert (root_dir / "_versions").is_symlink()
+    assert (versions_dir / "1.0.0" / "a.py").read_text() == "a"
+    siblings = [path.name for path in tmp_path.joinpath("user-4").iterdir()]
+    assert sorted(name for name in siblings if not name.startswith(".versions-")) == ["delta"]
+
+    skill_storage.delete_skill_dir("user-4", "delta")
+    assert not list(tmp_path.joinpath("user-4").iterdir())
@@ -81,3 +81,41 @@ async def test_delete_skill_cascades_to_versions(async_session, tmp_path, monkey
 
     all_versions_after = await version_repo.list_by_skill(skill.id)
     assert len(all_versions_after) == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_zip_streams_from_file_object(async_session, tmp_path, monkeypatch):
+    import io
+    import json
+    import tempfile
+    import zipfile
+
+    from mcp_agentskills.config.settings import settings
+    from mcp_agentskills.core.utils.skill_archive import load_archive
+    from mcp_agentskills.repositories.skill_version import SkillVersionRepository
+
+    monkeypatch.setattr(settings, "SKILL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "SKILL_ARCHIVE_BACKEND", "local")
+    monkeypatch.setattr(settings, "SKILL_UPLOAD_CHUNK_BYTES", 7)
+    user_repo = UserRepository(async_session)
+    service = SkillService(SkillRepository(async_session), SkillVersionRepository(async_session))
+    user = await user_repo.create(email="stream@example.com", username="streamer", password="pass1234")
+    skill = await service.create_skill(user, name="streamed", description="desc")
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("SKILL.md", "---\nname: streamed\ndescription: streamed skill\nversion: 1.0.0\n---\nbody\n")
+        archive.writestr("scripts/run.py", "print('x')\n" * 100)
+    with tempfile.TemporaryFile() as spooled:
+        spooled.write(buffer.getvalue())
+        spooled.seek(0)
+        result = await service.upload_zip(user, skill.id, "streamed.zip", spooled)
+
+    assert result["version"] == "1.0.0"
+    skill_dir = tmp_path / user.id / "streamed"
+    assert (skill_dir / "scripts" / "run.py").read_text() == "print('x')\n" * 100
+    assert (skill_dir / "_versions" / "1.0.0" / "SKILL.md").exists()
+    assert await load_archive(user.id, "streamed", "1.0.0") == buffer.getvalue()
+    manifest = json.loads((skill_dir / "_versions" / ".manifests" / "1.0.0.json").read_text())
+    assert sorted(manifest["files"]) == ["SKILL.md", "scripts/run.py"]
+    assert manifest["files"]["scripts/run.py"]["size"] == len("print('x')\n" * 100)
@@ -0,0 +1,82 @@
+import sys
+from types import ModuleType
+
+import pytest
+
+
+def _install_repo_stub(monkeypatch, status_map, calls):
+    db_session = ModuleType("mcp_agentskills.db.session")
+    repositories_skill = ModuleType("mcp_agentskills.repositories.skill")
+
+    class SkillRecord:
+        def __init__(self, is_active: bool):
+            self.is_active = is_active
+
+    class SkillRepository:
+        def __init__(self, _session):
+            self._session = _session
+
+        async def get_by_name(self, user_id: str, name: str):
+            calls.append((user_id, name))
+            active = status_map.get((user_id, name))
+            if active is None:
+                return None
+            return SkillRecord(is_active=active)
+
+    async def get_async_session():
+        yield object()
+
+    db_session.get_async_session = get_async_session
+    repositories_skill.SkillRepository = SkillRepository
+    monkeypatch.setitem(sys.modules, "mcp_agentskills.db.session", db_session)
+    monkeypatch.setitem(sys.modules, "mcp_agentskills.repositories.skill", repositories_skill)
+
+
+@pytest.mark.asyncio
+async def test_skill_status_cache_serves_repeat_lookups(monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_status_cache
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STATUS_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(settings_module.settings, "SKILL_STATUS_NEGATIVE_CACHE_TTL_SECONDS", 60)
+    skill_status_cache.reset_skill_status_cache()
+    status_map = {("user-1", "alpha"): True}
+    calls: list[tuple[str, str]] = []
+    _install_repo_stub(monkeypatch, status_map, calls)
+
+    assert await skill_status_cache.is_skill_active("alpha", "user-1") is True
+    assert await skill_status_cache.is_skill_active("alpha", "user-1") is True
+    assert await skill_status_cache.is_skill_active("missing", "user-1") is True
+    assert await skill_status_cache.is_skill_active("missing", "user-1") is True
+    assert calls == [("user-1", "alpha"), ("user-1", "missing")]
+
+    status_map[("user-1", "alpha")] = False
+    assert await skill_status_cache.is_skill_active("alpha", "user-1") is True
+    skill_status_cache.invalidate_skill_status("user-1", "alpha")
+    assert await skill_status_cache.is_skill_active("alpha", "user-1") is False
+    assert await skill_status_cache.is_skill_active("alpha", None) is True
+    skill_status_cache.reset_skill_status_cache()
+
+
+@pytest.mark.asyncio
+async def test_skill_status_cache_expires_and_stays_bounded(monkeypatch):
+    from mcp_agentskills.config import settings as settings_module
+    from mcp_agentskills.core.utils import skill_status_cache
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STATUS_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr(settings_module.settings, "SKILL_STATUS_CACHE_MAX_ENTRIES", 2)
+    skill_status_cache.reset_skill_status_cache()
+    calls: list[tuple[str, str]] = []
+    _install_repo_stub(monkeypatch, {("user-1", "alpha"): True}, calls)
+
+    await skill_status_cache.is_skill_active("alpha", "user-1")
+    await skill_status_cache.is_skill_active("alpha", "user-1")
+    assert len(calls) == 2
+
+    monkeypatch.setattr(settings_module.settings, "SKILL_STATUS_CACHE_TTL_SECONDS", 60)
+    for name in ["a", "b", "c"]:
+        skill_status_cache.set_cached_skill_status("user-2", name, True)
+    assert skill_status_cache.get_cached_skill_status("user-2", "a") == (False, None)
+    assert skill_status_cache.get_cached_skill_status("user-2", "c") == (True, True)
+    skill_status_cache.invalidate_skill_status("user-2")
+    assert skill_status_cache.get_cached_skill_status("user-2", "c") == (False, None)
@@ -18,3 +18,32 @@ async def test_create_list_revoke_token(async_session):
     assert revoked is True
     tokens_after = await token_service.list_tokens(user)
     assert tokens_after[0].is_active is False
+
+
+@pytest.mark.asyncio
+async def test_validate_token_buffers_last_used_until_flush(async_session):
+    from mcp_agentskills.core.metrics import token_usage
+
+    user_repo = UserRepository(async_session)
+    token_repo = TokenRepository(async_session)
+    token_service = TokenService(token_repo, user_repo)
+    user = await user_repo.create(email="buffered@example.com", username="buffered", password="pass1234")
+    token, token_value = await token_service.create_token_with_value(user, name="buffered")
+
+    await token_service.validate_token(token_value)
+    await token_service.validate_token(token_value)
+    await async_session.refresh(token)
+    assert token.last_used_at is None
+    assert token.id in token_usage.pending_token_usage()
+
+    async def session_provider():
+        yield async_session
+
+    token_usage.set_session_provider(session_provider)
+    try:
+        assert await token_usage.flush_token_usage() >= 1
+    finally:
+        token_usage.reset_session_provider()
+    await async_session.refresh(token)
+    assert token.last_used_at is not None
+    assert token.id not in token_usage.pending_token_usage()
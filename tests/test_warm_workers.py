@@ -0,0 +1,214 @@
+import json
+import os
+
+import pytest
+
+from mcp_agentskills.config.settings import settings
+from mcp_agentskills.core.utils import warm_workers
+from mcp_agentskills.core.utils.warm_workers import (
+    close_warm_workers,
+    expire_idle_warm_workers,
+    get_warm_worker_stats,
+    reset_warm_workers,
+    run_warm_entrypoint,
+)
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="warm workers require fork")
+
+ENTRY = """import json
+import os
+import sys
+
+params = json.loads(os.environ.get("SKILL_PARAMS") or "{}")
+if params.get("fail"):
+    print("boom", file=sys.stderr)
+    sys.exit(3)
+if params.get("raise"):
+    raise RuntimeError("kaboom")
+if params.get("sleep"):
+    import time
+    time.sleep(params["sleep"])
+if params.get("spam"):
+    sys.stdout.write("x" * params["spam"])
+if params.get("fd_output"):
+    sys.stdout.flush()
+    os.system("echo from-shell; echo shell-err 1>&2")
+    sys.__stdout__.write("from-dunder\\n")
+    sys.__stdout__.flush()
+print(json.dumps({"pid": os.getpid(), "ppid": os.getppid(), "cwd": os.getcwd(), "params": params}))
+"""
+
+
+@pytest.fixture
+def warm_settings(monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_WARM_WORKERS", True)
+    monkeypatch.setattr(settings, "SKILL_WARM_WORKERS_MAX", 4)
+    monkeypatch.setattr(settings, "SKILL_WARM_WORKER_MAX_RUNS", 100)
+    reset_warm_workers()
+    yield
+    reset_warm_workers()
+
+
+def _skill_dir(tmp_path, name="v1"):
+    version_dir = tmp_path / name
+    version_dir.mkdir()
+    (version_dir / "main.py").write_text(ENTRY, encoding="utf-8")
+    return version_dir
+
+
+async def _run(version_dir, params, version="1.0.0", timeout=10, dependency_env=""):
+    return await run_warm_entrypoint(
+        "skill-1",
+        version,
+        version_dir,
+        "main.py",
+        json.dumps(params),
+        dict(os.environ),
+        timeout,
+        dependency_env,
+    )
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_reuses_interpreter_across_calls(tmp_path, warm_settings):
+    version_dir = _skill_dir(tmp_path)
+    first = await _run(version_dir, {"n": 1})
+    second = await _run(version_dir, {"n": 2})
+    assert first.returncode == 0 and second.returncode == 0
+    one = json.loads(first.stdout)
+    two = json.loads(second.stdout)
+    assert one["params"] == {"n": 1}
+    assert two["params"] == {"n": 2}
+    assert one["ppid"] == two["ppid"]
+    assert one["pid"] != two["pid"]
+    stats = get_warm_worker_stats()
+    assert stats["spawned"] == 1
+    assert stats["reused"] == 1
+    assert stats["idle"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_reports_exit_code_and_stderr(tmp_path, warm_settings):
+    version_dir = _skill_dir(tmp_path)
+    result = await _run(version_dir, {"fail": True})
+    assert result.returncode == 3
+    assert b"boom" in result.stderr
+    assert get_warm_worker_stats()["idle"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_reports_uncaught_exceptions(tmp_path, warm_settings):
+    version_dir = _skill_dir(tmp_path)
+    result = await _run(version_dir, {"raise": True})
+    assert result.returncode == 1
+    assert b"RuntimeError: kaboom" in result.stderr
+    assert get_warm_worker_stats()["idle"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_workers_are_keyed_by_dependency_env(tmp_path, warm_settings):
+    version_dir = _skill_dir(tmp_path)
+    bare = json.loads((await _run(version_dir, {})).stdout)
+    with_env = json.loads((await _run(version_dir, {}, dependency_env=str(tmp_path / "env-a"))).stdout)
+    assert with_env["ppid"] != bare["ppid"]
+    again = json.loads((await _run(version_dir, {}, dependency_env=str(tmp_path / "env-a"))).stdout)
+    assert again["ppid"] == with_env["ppid"]
+    assert get_warm_worker_stats()["spawned"] == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_recycles_after_max_runs(tmp_path, warm_settings, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_WARM_WORKER_MAX_RUNS", 2)
+    version_dir = _skill_dir(tmp_path)
+    for index in range(3):
+        assert (await _run(version_dir, {"n": index})).returncode == 0
+    stats = get_warm_worker_stats()
+    assert stats["spawned"] == 2
+    assert stats["recycled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_timeout_kills_worker(tmp_path, warm_settings):
+    version_dir = _skill_dir(tmp_path)
+    result = await _run(version_dir, {"sleep": 5}, timeout=0.5)
+    assert result.timed_out
+    stats = get_warm_worker_stats()
+    assert stats["timeouts"] == 1
+    assert stats["idle"] == 0
+    assert (await _run(version_dir, {"n": 1})).returncode == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_truncates_and_caps_output(tmp_path, warm_settings, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_MAX_OUTPUT_BYTES", 100)
+    monkeypatch.setattr(settings, "SKILL_OUTPUT_HARD_CAP_BYTES", 0)
+    version_dir = _skill_dir(tmp_path)
+    result = await _run(version_dir, {"spam": 5000})
+    assert b"bytes truncated" in result.stdout
+    assert len(result.stdout) < 200
+    monkeypatch.setattr(settings, "SKILL_OUTPUT_HARD_CAP_BYTES", 1000)
+    limited = await _run(version_dir, {"spam": 5000})
+    assert limited.output_limited
+
+
+@pytest.mark.asyncio
+async def test_close_and_expire_warm_workers(tmp_path, warm_settings):
+    version_dir = _skill_dir(tmp_path)
+    await _run(version_dir, {})
+    await _run(_skill_dir(tmp_path, "v2"), {}, version="2.0.0")
+    assert get_warm_worker_stats()["idle"] == 2
+    assert close_warm_workers("skill-1") == 2
+    assert get_warm_worker_stats()["idle"] == 0
+    await _run(version_dir, {})
+    assert expire_idle_warm_workers(0) == 1
+    assert get_warm_worker_stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_workers_disabled_or_missing_entry_fall_back(tmp_path, warm_settings, monkeypatch):
+    version_dir = _skill_dir(tmp_path)
+    missing = await run_warm_entrypoint("skill-1", "1.0.0", version_dir, "../main.py", "{}", {}, 5)
+    assert missing is None
+    monkeypatch.setattr(settings, "ENABLE_WARM_WORKERS", False)
+    assert await _run(version_dir, {}) is None
+    assert not warm_workers._idle
+
+
+@pytest.mark.asyncio
+async def test_warm_workers_share_the_private_execution_tree_with_blob_store(tmp_path, warm_settings, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_STORAGE_PATH", str(tmp_path / "storage"))
+    monkeypatch.setattr(settings, "ENABLE_SKILL_BLOB_STORE", True)
+    version_dir = _skill_dir(tmp_path)
+    result = await _run(version_dir, {})
+    cwd = json.loads(result.stdout)["cwd"]
+    assert os.path.realpath(cwd) != os.path.realpath(version_dir)
+    assert os.path.isdir(cwd)
+    close_warm_workers("skill-1")
+    assert os.path.isdir(cwd)
+    result = await _run(version_dir, {})
+    assert json.loads(result.stdout)["cwd"] == cwd
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_captures_fd_level_output(tmp_path, warm_settings):
+    version_dir = _skill_dir(tmp_path)
+    result = await _run(version_dir, {"fd_output": True})
+    assert result.returncode == 0
+    assert b"from-shell" in result.stdout
+    assert b"from-dunder" in result.stdout
+    assert b"shell-err" in result.stderr
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_imports_local_modules_per_call(tmp_path, warm_settings):
+    version_dir = tmp_path / "local"
+    version_dir.mkdir()
+    (version_dir / "helper.py").write_text(
+        "import os\nPARAMS = os.environ.get('SKILL_PARAMS')\n", encoding="utf-8"
+    )
+    (version_dir / "main.py").write_text("import helper\nprint(helper.PARAMS)\n", encoding="utf-8")
+    first = await _run(version_dir, {"n": 1})
+    second = await _run(version_dir, {"n": 2})
+    assert json.loads(first.stdout) == {"n": 1}
+    assert json.loads(second.stdout) == {"n": 2}
+    assert get_warm_worker_stats()["reused"] == 1
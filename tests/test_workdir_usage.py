@@ -0,0 +1,105 @@
+import pytest
+
+from mcp_agentskills.core.utils import workdir_usage
+from mcp_agentskills.core.utils.skill_storage import write_file_bytes
+from mcp_agentskills.core.utils.workdir_usage import (
+    get_workdir_usage,
+    get_workdir_usage_stats,
+    invalidate_workdir_usage,
+    reconcile_workdir_usage,
+    refresh_workdir_usage,
+    reset_workdir_usage,
+    schedule_workdir_refresh,
+)
+
+
+def test_workdir_usage_is_cached_after_first_scan(tmp_path, monkeypatch):
+    reset_workdir_usage()
+    (tmp_path / "a.txt").write_bytes(b"x" * 10)
+    (tmp_path / "deep").mkdir()
+    (tmp_path / "deep" / "b.txt").write_bytes(b"x" * 5)
+    assert get_workdir_usage(tmp_path) == 15
+
+    def fail_scan(path):
+        raise AssertionError("unexpected scan")
+
+    monkeypatch.setattr(workdir_usage, "_scan_dir", fail_scan)
+    assert get_workdir_usage(tmp_path) == 15
+    assert get_workdir_usage_stats()["hits"] == 1
+
+
+def test_known_writes_update_usage_without_scanning(tmp_path):
+    reset_workdir_usage()
+    (tmp_path / "a.txt").write_bytes(b"x" * 10)
+    assert get_workdir_usage(tmp_path) == 10
+    write_file_bytes(tmp_path / "nested" / "b.txt", b"y" * 7)
+    write_file_bytes(tmp_path / "a.txt", b"x" * 4)
+    assert get_workdir_usage(tmp_path) == 11
+    assert get_workdir_usage_stats()["full_scans"] == 1
+
+
+def test_delta_scan_only_rescans_changed_directories(tmp_path):
+    reset_workdir_usage()
+    for name in ("one", "two", "three"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "f.bin").write_bytes(b"x" * 3)
+    assert get_workdir_usage(tmp_path) == 9
+    (tmp_path / "two" / "g.bin").write_bytes(b"x" * 8)
+    before = get_workdir_usage_stats()["dirs_rescanned"]
+    assert refresh_workdir_usage(tmp_path) == 17
+    assert get_workdir_usage_stats()["dirs_rescanned"] - before == 1
+
+
+def test_invalidate_and_reconcile_correct_drift(tmp_path):
+    reset_workdir_usage()
+    target = tmp_path / "f.bin"
+    target.write_bytes(b"x" * 4)
+    assert get_workdir_usage(tmp_path) == 4
+    with target.open("ab") as handle:
+        handle.write(b"x" * 6)
+    assert get_workdir_usage(tmp_path) == 4
+    assert reconcile_workdir_usage() == 1
+    assert get_workdir_usage(tmp_path) == 10
+    assert get_workdir_usage_stats()["drift_bytes"] == 6
+    (tmp_path / "g.bin").write_bytes(b"x" * 2)
+    invalidate_workdir_usage(tmp_path)
+    assert get_workdir_usage(tmp_path) == 12
+
+
+def test_delta_scan_trusts_directory_mtime_and_reconcile_sees_appends(tmp_path):
+    reset_workdir_usage()
+    (tmp_path / "deep").mkdir()
+    target = tmp_path / "deep" / "log.txt"
+    target.write_bytes(b"x" * 4)
+    assert get_workdir_usage(tmp_path) == 4
+    with target.open("ab") as handle:
+        handle.write(b"x" * 96)
+    before = get_workdir_usage_stats()["dirs_rescanned"]
+    assert refresh_workdir_usage(tmp_path) == 4
+    assert get_workdir_usage_stats()["dirs_rescanned"] == before
+    assert reconcile_workdir_usage() == 1
+    assert get_workdir_usage(tmp_path) == 100
+
+
+@pytest.mark.asyncio
+async def test_scheduled_refreshes_run_off_the_caller_and_coalesce(tmp_path, monkeypatch):
+    reset_workdir_usage()
+    (tmp_path / "a.txt").write_bytes(b"x" * 3)
+    assert get_workdir_usage(tmp_path) == 3
+    calls = []
+    real_refresh = workdir_usage.refresh_workdir_usage
+
+    def counting_refresh(path):
+        calls.append(path)
+        return real_refresh(path)
+
+    monkeypatch.setattr(workdir_usage, "refresh_workdir_usage", counting_refresh)
+    (tmp_path / "b.txt").write_bytes(b"x" * 5)
+    for _ in range(5):
+        schedule_workdir_refresh(tmp_path)
+    assert calls == []
+    task = workdir_usage._refreshes[str(tmp_path)]
+    await task
+    assert 1 <= len(calls) <= 2
+    assert str(tmp_path) not in workdir_usage._refreshes
+    assert get_workdir_usage(tmp_path) == 8